@@ -209,10 +209,9 @@ class RenameInput(Input):
             env = NodeEnvironment.get_instance()
             nodes_to_update = []
             
-            for path, node in env.nodes.items():
-                if path == old_path or path.startswith(f"{old_path}/"):
-                    nodes_to_update.append(node)
-                    logger.info(f"Will update node: {path}")
+            for path in env.nodes.subtree(old_path):
+                nodes_to_update.append(env.nodes[path])
+                logger.info(f"Will update node: {path}")
             
             for node in nodes_to_update:
                 old_node_path = node.path()
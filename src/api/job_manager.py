@@ -0,0 +1,257 @@
+"""
+Background execution jobs for the TextLoom API.
+
+POST /nodes/{session_id}/execute cooks inside the request, so a long LLM cook
+holds the HTTP connection until it finishes. A Job runs the same eval() on the
+JobManager's own thread pool instead: submitting returns at once with a job id,
+and the request threads stay free for the rest of the API while it cooks.
+
+A Job is the cook scheduler's CookMonitor for its cook, so it hears about every
+node that starts and finishes (loop iterations included) and receives the text
+of streaming nodes as it is generated. Everything it hears is kept as numbered
+events that clients can poll or follow over server-sent events. Cancelling a
+job stops it at the next node, loop iteration or streamed chunk; nodes that
+were cooking when it stopped are left uncooked.
+
+Jobs run one at a time by default, because they all cook the same node graph.
+Finished jobs are kept for polling until MAX_FINISHED_JOBS newer ones finish.
+
+Example:
+    >>> job = job_manager.submit(node)
+    >>> job.wait(timeout=60)
+    >>> job.status, job.output
+"""
+
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import copy_context
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
+
+from core.cook_scheduler import CookCancelled, CookMonitor, cook_scheduler
+from core.enums import NodeState
+from core.stream_events import StreamChunk, listen
+
+if TYPE_CHECKING:
+    from core.node import Node
+
+DEFAULT_MAX_WORKERS = 1
+MAX_FINISHED_JOBS = 100
+
+
+class JobStatus(Enum):
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    COMPLETED = 'completed'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+
+
+FINISHED_STATUSES = (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+
+class Job(CookMonitor):
+    """One background eval() of a node, with the events its cook produced."""
+
+    def __init__(self, node: 'Node', force: bool = False):
+        super().__init__()
+        self.job_id = uuid.uuid4().hex
+        self.node = node
+        self.force = force
+        self.status = JobStatus.QUEUED
+        self.created_at = datetime.now()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.output: Any = None
+        self.error: Optional[BaseException] = None
+        upstream_nodes = cook_scheduler.topological_order(node)
+        self.order: List[str] = [upstream.path() for upstream in upstream_nodes]
+        # What this job has to cook: the target always cooks, the rest only if forced or dirty now
+        self.to_cook: List[str] = [upstream.path() for upstream in upstream_nodes
+                                   if force or upstream is node or upstream.needs_to_cook()]
+        self.cook_counts: Dict[str, int] = {}
+        self.partial_text: Dict[str, str] = {}
+        self._cooking: Dict[str, 'Node'] = {}
+        self._events: List[Dict[str, Any]] = []
+        self._condition = threading.Condition()
+        self._future: Optional[Future] = None
+
+    def is_finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def progress(self) -> float:
+        """Share of the nodes that were dirty at submission which this job has cooked, 1.0 once it completes."""
+        if self.status == JobStatus.COMPLETED:
+            return 1.0
+        if not self.to_cook:
+            return 0.0
+        with self._condition:
+            done = sum(1 for path in self.to_cook if path in self.cook_counts)
+        return done / len(self.to_cook)
+
+    def execution_time(self) -> float:
+        """Milliseconds spent cooking so far."""
+        if self.started_at is None:
+            return 0.0
+        end = self.finished_at or datetime.now()
+        return (end - self.started_at).total_seconds() * 1000
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until the job finishes; returns False if timeout ran out first."""
+        with self._condition:
+            return self._condition.wait_for(self.is_finished, timeout)
+
+    def events_since(self, seq: int, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Events numbered above seq, waiting up to timeout for one to arrive."""
+        with self._condition:
+            self._condition.wait_for(lambda: len(self._events) > seq or self.is_finished(), timeout)
+            return self._events[seq:]
+
+    def cancel(self) -> None:
+        super().cancel()
+        if self._future is not None and self._future.cancel():
+            self._finish(JobStatus.CANCELLED)
+
+    # CookMonitor
+
+    def node_started(self, node: 'Node') -> None:
+        with self._condition:
+            self._cooking[node.path()] = node
+            self._append_event("node_started", node_path=node.path())
+
+    def node_finished(self, node: 'Node') -> None:
+        path = node.path()
+        with self._condition:
+            self._cooking.pop(path, None)
+            self.cook_counts[path] = self.cook_counts.get(path, 0) + 1
+            self._append_event("node_finished", node_path=path, state=node.state().value,
+                               errors=list(node.errors()))
+
+    def _on_chunk(self, chunk: StreamChunk) -> None:
+        if self.cancelled():
+            raise CookCancelled()
+        with self._condition:
+            self.partial_text[chunk.node_path] = self.partial_text.get(chunk.node_path, "") + chunk.text
+            self._append_event("chunk", node_path=chunk.node_path, item_index=chunk.item_index,
+                               text=chunk.text)
+
+    def _run(self) -> None:
+        with self._condition:
+            self.started_at = datetime.now()
+            self.status = JobStatus.RUNNING
+            self._append_event("started", node_path=self.node.path())
+        try:
+            with cook_scheduler.monitor(self), listen(self._on_chunk):
+                self.output = self.node.eval(force=self.force)
+        except CookCancelled:
+            for node in self._cooking.values():
+                node.set_state(NodeState.UNCOOKED)
+            self._cooking.clear()
+            self._finish(JobStatus.CANCELLED)
+        except BaseException as e:
+            self.error = e
+            self._finish(JobStatus.FAILED)
+        else:
+            self._finish(JobStatus.COMPLETED)
+
+    def _finish(self, status: JobStatus) -> None:
+        with self._condition:
+            if self.is_finished():
+                return
+            self.finished_at = datetime.now()
+            self.status = status
+            self._append_event("done", status=status.value)
+
+    def _append_event(self, event_type: str, **data: Any) -> None:
+        """Records an event; callers hold the condition."""
+        self._events.append({"seq": len(self._events) + 1, "type": event_type, "time": time.time(), **data})
+        self._condition.notify_all()
+
+
+class JobManager:
+    """
+    Singleton that runs execution jobs on a thread pool.
+
+    Methods:
+    submit(node, force=False): Queues an eval() of node and returns its Job
+        Example: job = job_manager.submit(node)
+
+    get(job_id): The job with that id, or None
+        Example: job = job_manager.get(job_id)
+
+    list(): Every job still held, oldest first
+        Example: jobs = job_manager.list()
+
+    cancel(job_id): Cancels a queued or running job; returns it, or None if unknown
+        Example: job_manager.cancel(job_id)
+
+    set_max_workers(count): Number of jobs that may cook at once
+        Example: job_manager.set_max_workers(2)
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(JobManager, cls).__new__(cls)
+            cls._instance._jobs: Dict[str, Job] = {}
+            cls._instance._max_workers: int = DEFAULT_MAX_WORKERS
+            cls._instance._executor: Optional[ThreadPoolExecutor] = None
+            cls._instance._lock = threading.Lock()
+        return cls._instance
+
+    def submit(self, node: 'Node', force: bool = False) -> Job:
+        job = Job(node, force)
+        # The job cooks in the caller's context, so it sees the same workspace
+        context = copy_context()
+        with self._lock:
+            self._prune()
+            self._jobs[job.job_id] = job
+            job._future = self._get_executor().submit(context.run, job._run)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def list(self) -> List[Job]:
+        return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        job = self._jobs.get(job_id)
+        if job is not None and not job.is_finished():
+            job.cancel()
+        return job
+
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    def set_max_workers(self, count: int) -> None:
+        if count < 1:
+            raise ValueError(f"max_workers must be at least 1, got {count}")
+        with self._lock:
+            if count == self._max_workers:
+                return
+            self._max_workers = count
+            if self._executor is not None:
+                # Jobs already queued keep their place on the old pool
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers,
+                thread_name_prefix="tloom-job",
+            )
+        return self._executor
+
+    def _prune(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.is_finished()]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[job_id]
+
+
+job_manager = JobManager()
@@ -10,7 +10,7 @@ Usage:
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from api.routers import nodes, workspace, connections, files, tokens
+from api.routers import nodes, workspace, connections, files, tokens, jobs
 from api.routers import globals as globals_router
 import logging
 
@@ -49,6 +49,12 @@ app.include_router(
     tags=["nodes"]
 )
 
+app.include_router(
+    jobs.router,
+    prefix="/api/v1",
+    tags=["jobs"]
+)
+
 app.include_router(
     workspace.router,
     prefix="/api/v1",
@@ -123,6 +129,13 @@ def api_info():
                 "delete": "DELETE /api/v1/nodes/{session_id}",
                 "execute": "POST /api/v1/nodes/{session_id}/execute"
             },
+            "jobs": {
+                "submit": "POST /api/v1/nodes/{session_id}/jobs",
+                "list": "/api/v1/jobs",
+                "get": "/api/v1/jobs/{job_id}",
+                "events": "/api/v1/jobs/{job_id}/events",
+                "cancel": "POST /api/v1/jobs/{job_id}/cancel"
+            },
             "connections": {
                 "create": "POST /api/v1/connections",
                 "delete": "DELETE /api/v1/connections"
@@ -15,6 +15,7 @@ Design Decisions:
 from typing import Any, Dict, List, Optional, Union
 from pydantic import BaseModel, Field
 from enum import Enum
+from datetime import datetime
 
 import logging
 from typing import Any
@@ -178,6 +179,7 @@ class NodeResponse(BaseModel):
     is_time_dependent: bool = Field(default=False, description="Whether node recooks on every eval")
     cook_count: int = Field(default=0, description="Number of times node has cooked")
     last_cook_time: float = Field(default=0.0, description="Last cook duration in milliseconds")
+    memo_stats: Optional[Dict[str, Any]] = Field(default=None, description="Per-item memo hits, misses and hit ratio (item-wise nodes only)")
 
 
 class NodeTypeInfo(BaseModel):
@@ -325,6 +327,68 @@ class ExecutionResponse(BaseModel):
     warnings: List[str] = Field(default_factory=list, description="Warning messages from execution")
 
 
+# ============================================================================
+# Job Models
+# ============================================================================
+
+class JobStatusEnum(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class JobNodeProgress(BaseModel):
+    """
+    State of one node touched by a background execution job.
+
+    Example:
+        {
+            "node_path": "/query1",
+            "state": "cooking",
+            "cook_count": 0,
+            "partial_text": "The first paragraph of the answ",
+            "output_data": null
+        }
+    """
+    node_path: str = Field(..., description="Node path")
+    state: NodeStateEnum = Field(..., description="Current node state")
+    cook_count: int = Field(0, description="Times the node cooked during this job")
+    partial_text: Optional[str] = Field(None, description="Text streamed so far by a streaming node")
+    output_data: Optional[List[List[str]]] = Field(None, description="Output of a node that finished cooking (only with include_outputs)")
+
+
+class JobResponse(BaseModel):
+    """
+    Status of a background execution job.
+
+    Example:
+        {
+            "job_id": "9f1c2e0a4b6d4f7e8a3b5c1d2e4f6a8b",
+            "session_id": "123456789",
+            "node_path": "/fileout1",
+            "status": "running",
+            "progress": 0.5,
+            "created_at": "2025-01-15T10:30:00",
+            "started_at": "2025-01-15T10:30:00",
+            "finished_at": null,
+            "nodes": [...],
+            "result": null
+        }
+    """
+    job_id: str = Field(..., description="Job identifier")
+    session_id: str = Field(..., description="Session ID of the node being executed")
+    node_path: str = Field(..., description="Path of the node being executed")
+    status: JobStatusEnum = Field(..., description="Job status")
+    progress: float = Field(..., description="Share of the nodes dirty at submission that have cooked, 0.0 to 1.0")
+    created_at: datetime = Field(..., description="When the job was submitted")
+    started_at: Optional[datetime] = Field(None, description="When the job started cooking")
+    finished_at: Optional[datetime] = Field(None, description="When the job finished")
+    nodes: List[JobNodeProgress] = Field(default_factory=list, description="Upstream nodes in cook order, then nodes cooked inside them")
+    result: Optional[ExecutionResponse] = Field(None, description="Execution results once the job has finished")
+
+
 # ============================================================================
 # Workspace Models
 # ============================================================================
@@ -404,7 +468,7 @@ def _convert_parameters(node: 'Node', full_state) -> Dict[str, 'ParameterInfo']:
     parameters = {}
     for parm_name, parm_state in full_state.parms.items():
         # Determine if parameter is read_only (output parameters)
-        is_read_only = parm_name in ['response', 'file_text', 'out_data', 'in_data', 'staging_data']
+        is_read_only = parm_name in ['response', 'file_text', 'out_data', 'in_data', 'staging_data', 'stopped_at']
 
         # Get default value safely
         default_value = parm_state.value
@@ -536,7 +600,8 @@ def node_to_response(node: 'Node') -> 'NodeResponse':
             color=list(node._color) if hasattr(node, '_color') else [1.0, 1.0, 1.0],
             is_time_dependent=full_state.is_time_dependent if full_state.is_time_dependent is not None else False,
             cook_count=full_state.cook_count,
-            last_cook_time=full_state.last_cook_time
+            last_cook_time=full_state.last_cook_time,
+            memo_stats=node.memo_stats()
         )
 
         return response
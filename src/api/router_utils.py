@@ -19,10 +19,9 @@ def raise_http_error(status_code: int, error_type: str, message: str, **kwargs):
 
 
 def find_node_by_session_id(session_id: str) -> Node:
-    for path in NodeEnvironment.list_nodes():
-        node = NodeEnvironment.node_from_name(path)
-        if node and node.session_id() == session_id:
-            return node
+    node = NodeEnvironment.node_from_session_id(session_id)
+    if node:
+        return node
     raise_http_error(404, "node_not_found", f"Node with session_id {session_id} does not exist")
 
 
@@ -7,6 +7,7 @@ This package contains all API route handlers organized by functionality.
 from . import nodes
 from . import workspace
 from . import connections
+from . import jobs
 from . import globals as globals_router
 
-__all__ = ['nodes', 'workspace', 'connections', 'globals_router']
\ No newline at end of file
+__all__ = ['nodes', 'workspace', 'connections', 'jobs', 'globals_router']
\ No newline at end of file
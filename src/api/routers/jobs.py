@@ -0,0 +1,207 @@
+"""
+TextLoom API - Job Endpoints
+
+Runs node execution in the background (see api.job_manager):
+- Submit a node for execution and get a job id back immediately
+- Poll a job for status, progress, per-node states and partial output
+- Follow a job's events as server-sent events
+- Cancel a job
+- List jobs
+"""
+
+import json
+import logging
+from typing import Iterator, List
+from fastapi import APIRouter, Path, Query, Request, status
+from fastapi.responses import StreamingResponse
+from api.models import ExecutionResponse, JobNodeProgress, JobResponse
+from api.router_utils import find_node_by_session_id, raise_http_error
+from api.routers.nodes import (
+    build_execution_response,
+    build_failed_execution_response,
+    prepare_execution_output,
+)
+from api.job_manager import Job, JobStatus, job_manager
+from core.base_classes import NodeEnvironment, NodeState
+
+logger = logging.getLogger("api.routers.jobs")
+router = APIRouter()
+
+# Seconds between keep-alive comments on an idle event stream
+KEEPALIVE_INTERVAL = 15.0
+
+
+def find_job(job_id: str) -> Job:
+    job = job_manager.get(job_id)
+    if job is None:
+        raise_http_error(404, "job_not_found", f"Job {job_id} does not exist")
+    return job
+
+
+def build_job_result(job: Job) -> ExecutionResponse | None:
+    if job.status == JobStatus.COMPLETED:
+        return build_execution_response(job.node, job.output, job.execution_time())
+    if job.status == JobStatus.FAILED:
+        return build_failed_execution_response(job.error)
+    if job.status == JobStatus.CANCELLED:
+        return ExecutionResponse(
+            success=False,
+            message="Execution cancelled",
+            output_data=None,
+            execution_time=job.execution_time(),
+            node_state=NodeState(job.node._state),
+            errors=list(job.node._errors),
+            warnings=list(job.node._warnings)
+        )
+    return None
+
+
+def collect_job_nodes(job: Job, include_outputs: bool) -> List[JobNodeProgress]:
+    paths = list(job.order)
+    known = set(paths)
+    for path in list(job.cook_counts) + list(job.partial_text):
+        if path not in known:
+            known.add(path)
+            paths.append(path)
+
+    nodes = []
+    for path in paths:
+        node = NodeEnvironment.nodes.get(path)
+        if node is None:
+            continue
+        cook_count = job.cook_counts.get(path, 0)
+        output_data = None
+        if include_outputs and cook_count and node.state() == NodeState.UNCHANGED:
+            output_data = prepare_execution_output(node.get_output())
+        nodes.append(JobNodeProgress(
+            node_path=path,
+            state=node.state(),
+            cook_count=cook_count,
+            partial_text=job.partial_text.get(path),
+            output_data=output_data
+        ))
+    return nodes
+
+
+def job_to_response(job: Job, include_outputs: bool = False) -> JobResponse:
+    return JobResponse(
+        job_id=job.job_id,
+        session_id=str(job.node.session_id()),
+        node_path=job.node.path(),
+        status=job.status.value,
+        progress=job.progress(),
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        nodes=collect_job_nodes(job, include_outputs),
+        result=build_job_result(job)
+    )
+
+
+def stream_job_events(job: Job, after: int = 0) -> Iterator[str]:
+    """
+    Yields server-sent events for a job: started, node_started, node_finished and chunk
+    events as they happen, then a done event whose data is the final JobResponse.
+    Each event's id is its sequence number, so a client can reconnect with ?after=<id>.
+    """
+    cursor = after
+    while True:
+        events = job.events_since(cursor, timeout=KEEPALIVE_INTERVAL)
+        if not events:
+            if job.is_finished():
+                return
+            yield ": keep-alive\n\n"
+            continue
+        for event in events:
+            cursor = event["seq"]
+            data = event
+            if event["type"] == "done":
+                data = {**event, **job_to_response(job).model_dump(mode="json")}
+            yield f"id: {cursor}\nevent: {event['type']}\ndata: {json.dumps(data)}\n\n"
+            if event["type"] == "done":
+                return
+
+
+@router.post(
+    "/nodes/{session_id}/jobs",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Execute a node in the background",
+    description=(
+        "Queues a node for execution and returns the job immediately. The node and its dependencies "
+        "cook on the job pool; poll GET /jobs/{job_id} or follow GET /jobs/{job_id}/events for progress."
+    ),
+)
+def submit_job(
+    session_id: str = Path(..., description="Node session ID"),
+    force: bool = Query(False, description="Cook the node even if it is up to date"),
+) -> JobResponse:
+    target_node = find_node_by_session_id(session_id)
+    job = job_manager.submit(target_node, force=force)
+    logger.info(f"Submitted job {job.job_id} for {target_node.path()}")
+    return job_to_response(job)
+
+
+@router.get(
+    "/jobs",
+    response_model=List[JobResponse],
+    summary="List jobs",
+    description="Returns every job still held, oldest first.",
+)
+def list_jobs() -> List[JobResponse]:
+    return [job_to_response(job) for job in job_manager.list()]
+
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=JobResponse,
+    summary="Get job status",
+    description=(
+        "Returns a job's status, progress, the state of each node it touches and any text streamed so far. "
+        "With include_outputs=true, nodes that finished cooking also carry their output."
+    ),
+)
+def get_job(
+    job_id: str = Path(..., description="Job ID"),
+    include_outputs: bool = Query(False, description="Include the output of every finished node"),
+) -> JobResponse:
+    return job_to_response(find_job(job_id), include_outputs)
+
+
+@router.get(
+    "/jobs/{job_id}/events",
+    summary="Follow job events",
+    description=(
+        "Server-sent event stream of a job: node_started, node_finished and chunk events while it cooks, "
+        "then a done event carrying the final job status. Pass after=<event id> to resume a stream."
+    ),
+)
+def job_events(
+    request: Request,
+    job_id: str = Path(..., description="Job ID"),
+    after: int = Query(0, description="Only send events with an id above this one"),
+):
+    job = find_job(job_id)
+    last_event_id = request.headers.get("last-event-id")
+    if last_event_id and last_event_id.isdigit():
+        after = max(after, int(last_event_id))
+    return StreamingResponse(
+        stream_job_events(job, after),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
+@router.post(
+    "/jobs/{job_id}/cancel",
+    response_model=JobResponse,
+    summary="Cancel a job",
+    description=(
+        "Cancels a queued job, or stops a running one at its next node, loop iteration or streamed chunk. "
+        "Nodes that were cooking are left uncooked."
+    ),
+)
+def cancel_job(job_id: str = Path(..., description="Job ID")) -> JobResponse:
+    job = find_job(job_id)
+    job_manager.cancel(job_id)
+    return job_to_response(job)
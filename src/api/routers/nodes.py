@@ -7,13 +7,15 @@ Handles node-related API operations:
 - Create new nodes
 - Update existing nodes
 - Delete nodes
-- Execute nodes
+- Execute nodes (optionally streaming partial LLM output as NDJSON)
 """
 
+import json
 import logging
 import time
-from typing import List
-from fastapi import APIRouter, HTTPException, Path, Body, status
+from typing import Iterator, List
+from fastapi import APIRouter, HTTPException, Path, Body, Query, status
+from fastapi.responses import StreamingResponse
 from api.models import (
     NodeResponse,
     NodeCreateRequest,
@@ -29,6 +31,7 @@ from core.base_classes import Node, NodeType, NodeEnvironment, NodeState
 from core.enums import generate_node_types
 from core.undo_manager import UndoManager
 from core.internal_path import InternalPath
+from core.stream_events import StreamChunk, StreamDone, stream_eval
 from utils.node_loader import discover_node_types
 from config.ui_constants import LOOPER_OUTPUT_NODE_OFFSET_X
 
@@ -58,13 +61,7 @@ def collect_node_responses(paths: List[str]) -> List[NodeResponse]:
 
 
 def find_child_nodes(parent_path: str) -> List[Node]:
-    children = []
-    for path in NodeEnvironment.list_nodes():
-        if path.startswith(parent_path + '/'):
-            child_node = NodeEnvironment.node_from_name(path)
-            if child_node:
-                children.append(child_node)
-    return children
+    return NodeEnvironment.nodes.descendant_nodes(parent_path)
 
 
 def validate_child_path_updates(target_node: Node, sanitized_name: str) -> List[tuple]:
@@ -72,11 +69,7 @@ def validate_child_path_updates(target_node: Node, sanitized_name: str) -> List[
     current_path_parent = str(target_node._path.parent())
     hypothetical_new_path = f"{current_path_parent.rstrip('/')}/{sanitized_name}"
 
-    children = [
-        NodeEnvironment.node_from_name(p)
-        for p in NodeEnvironment.list_nodes()
-        if p.startswith(old_path + '/')
-    ]
+    children = NodeEnvironment.nodes.descendant_nodes(old_path)
 
     child_updates = []
     for child in children:
@@ -202,19 +195,20 @@ def create_node(request: NodeCreateRequest) -> List[NodeResponse]:
 
     try:
         node_type = getattr(NodeType, node_type_str)
-        node = Node.create_node(
-            node_type=node_type,
-            node_name=request.name,
-            parent_path=request.parent_path
-        )
+        with UndoManager().transaction(f"Create node: {request.type}"):
+            node = Node.create_node(
+                node_type=node_type,
+                node_name=request.name,
+                parent_path=request.parent_path
+            )
 
-        if request.position:
-            node._position = tuple(request.position)
+            if request.position:
+                node._position = tuple(request.position)
 
-        if node_type == NodeType.LOOPER and node._internal_nodes_created:
-            parent_pos = node._position
-            node._input_node._position = [parent_pos[0], parent_pos[1]]
-            node._output_node._position = [parent_pos[0] + LOOPER_OUTPUT_NODE_OFFSET_X, parent_pos[1]]
+            if node_type == NodeType.LOOPER and node._internal_nodes_created:
+                parent_pos = node._position
+                node._input_node._position = [parent_pos[0], parent_pos[1]]
+                node._output_node._position = [parent_pos[0] + LOOPER_OUTPUT_NODE_OFFSET_X, parent_pos[1]]
 
         created_nodes = [node]
         if node_type == NodeType.LOOPER:
@@ -261,34 +255,34 @@ def update_node(session_id: str, request: NodeUpdateRequest = Body(...)) -> List
         undo_parts.append("color")
 
     undo_description = f"Update {target_node.name()} ({', '.join(undo_parts)})"
-    UndoManager().push_state(undo_description)
-    UndoManager().disable()
-
     try:
-        affected_nodes = [target_node]
+        with UndoManager().transaction(undo_description):
+            affected_nodes = [target_node]
 
-        if request.name is not None:
-            sanitized_name = Node.sanitize_node_name(request.name)
-            if not sanitized_name:
-                raise ValueError(f"Invalid node name: '{request.name}'")
+            if request.name is not None:
+                sanitized_name = Node.sanitize_node_name(request.name)
+                if not sanitized_name:
+                    raise ValueError(f"Invalid node name: '{request.name}'")
 
-            child_updates = validate_child_path_updates(target_node, sanitized_name)
+                child_updates = validate_child_path_updates(target_node, sanitized_name)
 
-            if not target_node.rename(sanitized_name):
-                raise ValueError(f"Name '{sanitized_name}' is already in use")
+                if not target_node.rename(sanitized_name):
+                    raise ValueError(f"Name '{sanitized_name}' is already in use")
 
-            affected_nodes.extend(apply_child_path_updates(target_node.path(), child_updates))
+                affected_nodes.extend(apply_child_path_updates(target_node.path(), child_updates))
 
-        if request.parameters:
-            update_node_parameters(target_node, request.parameters)
+            if request.parameters:
+                update_node_parameters(target_node, request.parameters)
 
-        if request.position is not None:
-            target_node._position = tuple(request.position)
+            if request.position is not None:
+                UndoManager().record_attribute(target_node, '_position')
+                target_node._position = tuple(request.position)
 
-        if request.color is not None:
-            target_node._color = tuple(request.color)
+            if request.color is not None:
+                UndoManager().record_attribute(target_node, '_color')
+                target_node._color = tuple(request.color)
 
-        return [node_to_response(node) for node in affected_nodes]
+            return [node_to_response(node) for node in affected_nodes]
 
     except ValueError as e:
         logger.error(f"ValueError updating node: {e}")
@@ -296,8 +290,6 @@ def update_node(session_id: str, request: NodeUpdateRequest = Body(...)) -> List
     except Exception as e:
         logger.error(f"Exception updating node: {type(e).__name__}: {e}")
         raise_http_error(500, "internal_error", f"Failed to update node: {str(e)}")
-    finally:
-        UndoManager().enable()
 
 
 @router.delete(
@@ -328,41 +320,79 @@ def delete_node(session_id: str = Path(..., description="Node session ID")) -> S
         raise_http_error(500, "internal_error", f"Failed to delete node: {str(e)}")
 
 
+def build_execution_response(node: Node, output_data, execution_time: float) -> ExecutionResponse:
+    success = determine_execution_success(node)
+    message = "Execution completed successfully" if success else "Execution completed with errors"
+    return ExecutionResponse(
+        success=success,
+        message=message,
+        output_data=prepare_execution_output(output_data),
+        execution_time=execution_time,
+        node_state=NodeState(node._state),
+        errors=list(node._errors),
+        warnings=list(node._warnings)
+    )
+
+
+def build_failed_execution_response(error: BaseException) -> ExecutionResponse:
+    return ExecutionResponse(
+        success=False,
+        message=f"Execution failed with exception: {str(error)}",
+        output_data=None,
+        execution_time=0.0,
+        node_state=NodeState.UNCOOKED,
+        errors=[str(error)],
+        warnings=[]
+    )
+
+
+def stream_execution_events(node: Node) -> Iterator[str]:
+    """
+    Yields NDJSON lines while the node cooks: one {"type": "chunk"} line per piece of
+    streamed LLM text, then a single {"type": "result"} line holding the ExecutionResponse.
+    """
+    start_time = time.time()
+    for event in stream_eval(node):
+        if isinstance(event, StreamChunk):
+            yield json.dumps({
+                "type": "chunk",
+                "node_path": event.node_path,
+                "item_index": event.item_index,
+                "text": event.text,
+            }) + "\n"
+        elif isinstance(event, StreamDone):
+            if event.error is not None:
+                result = build_failed_execution_response(event.error)
+            else:
+                result = build_execution_response(node, event.output, (time.time() - start_time) * 1000)
+            yield json.dumps({"type": "result", **result.model_dump(mode="json")}) + "\n"
+
+
 @router.post(
     "/nodes/{session_id}/execute",
     response_model=ExecutionResponse,
     summary="Execute/cook a node",
-    description="Executes a node, cooking it and all its dependencies. Returns execution results and updated state.",
+    description=(
+        "Executes a node, cooking it and all its dependencies. Returns execution results and updated state. "
+        "With stream=true the response is NDJSON: chunk events carry partial LLM text as it is generated, "
+        "and a final result event carries the execution results. "
+        "For cooks that may outlast the HTTP request, use POST /nodes/{session_id}/jobs instead."
+    ),
 )
-def execute_node(session_id: str = Path(..., description="Node session ID")) -> ExecutionResponse:
+def execute_node(
+    session_id: str = Path(..., description="Node session ID"),
+    stream: bool = Query(False, description="Stream partial output as NDJSON while the node cooks"),
+):
     target_node = find_node_by_session_id(session_id)
 
+    if stream:
+        return StreamingResponse(stream_execution_events(target_node), media_type="application/x-ndjson")
+
     try:
         start_time = time.time()
         output_data = target_node.eval()
         execution_time = (time.time() - start_time) * 1000
-
-        success = determine_execution_success(target_node)
-        output_list = prepare_execution_output(output_data)
-        message = "Execution completed successfully" if success else "Execution completed with errors"
-
-        return ExecutionResponse(
-            success=success,
-            message=message,
-            output_data=output_list,
-            execution_time=execution_time,
-            node_state=NodeState(target_node._state),
-            errors=list(target_node._errors),
-            warnings=list(target_node._warnings)
-        )
+        return build_execution_response(target_node, output_data, execution_time)
 
     except Exception as e:
-        return ExecutionResponse(
-            success=False,
-            message=f"Execution failed with exception: {str(e)}",
-            output_data=None,
-            execution_time=0.0,
-            node_state=NodeState.UNCOOKED,
-            errors=[str(e)],
-            warnings=[]
-        )
+        return build_failed_execution_response(e)
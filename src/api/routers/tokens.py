@@ -42,7 +42,8 @@ class TokenHistoryEntry(BaseModel):
             "node_name": "query_node_1",
             "input_tokens": 25,
             "output_tokens": 75,
-            "total_tokens": 100
+            "total_tokens": 100,
+            "cached": false
         }
     """
     timestamp: str = Field(..., description="ISO 8601 timestamp of the query")
@@ -50,6 +51,7 @@ class TokenHistoryEntry(BaseModel):
     input_tokens: int = Field(..., description="Input tokens for this query")
     output_tokens: int = Field(..., description="Output tokens for this query")
     total_tokens: int = Field(..., description="Total tokens for this query")
+    cached: bool = Field(False, description="Answered from the LLM response cache; the counts are the original query's")
 
 
 class TokenHistoryResponse(BaseModel):
@@ -6,19 +6,21 @@ Handles workspace-related API operations:
 - Export workspace to flowstate format
 - Import workspace from flowstate format
 - Clear workspace
+- Report live node objects versus registered nodes
 """
 
+import gc
 import logging
 import tempfile
 import json
 import os
 from typing import Dict, Any
-from fastapi import APIRouter, HTTPException, Body
+from fastapi import APIRouter, HTTPException, Body, Query
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from api.models import WorkspaceState, NodeResponse, ConnectionResponse, SuccessResponse, node_to_response, connection_to_response
 from api.router_utils import raise_http_error
-from core.base_classes import Node, NodeEnvironment, NodeType
+from core.base_classes import Node, NodeEnvironment, NodeType, MobileItem
 from core.global_store import GlobalStore
 from core.flowstate_manager import save_flowstate, load_flowstate, NODE_ATTRIBUTES
 from core.undo_manager import UndoManager
@@ -40,6 +42,14 @@ class UndoRedoResponse(BaseModel):
     message: str
 
 
+class MemoryDiagnosticsResponse(BaseModel):
+    live_nodes: int
+    registered_nodes: int
+    unregistered_nodes: int
+    undo_entries: int
+    undo_bytes: int
+
+
 def prepare_nodes_for_save():
     skip_attrs = {'name', 'path', 'session_id', 'node_type'}
 
@@ -265,8 +275,10 @@ def import_workspace(flowstate_data: Dict[str, Any] = Body(...)) -> SuccessRespo
 )
 def clear_workspace() -> SuccessResponse:
     try:
-        NodeEnvironment.nodes.clear()
-        clear_all_globals()
+        with UndoManager().transaction("Clear workspace"):
+            UndoManager().record_clear_nodes()
+            NodeEnvironment.nodes.clear()
+            clear_all_globals()
         return SuccessResponse(success=True, message="Workspace cleared successfully")
     except Exception as e:
         raise_http_error(500, "clear_failed", f"Error clearing workspace: {str(e)}")
@@ -285,8 +297,8 @@ def get_undo_status() -> UndoStatusResponse:
         can_undo = len(undo_mgr.undo_stack) > 0
         can_redo = len(undo_mgr.redo_stack) > 0
 
-        undo_desc = undo_mgr.undo_stack[-1][0] if can_undo else ""
-        redo_desc = undo_mgr.redo_stack[-1][0] if can_redo else ""
+        undo_desc = undo_mgr.undo_stack[-1].operation if can_undo else ""
+        redo_desc = undo_mgr.redo_stack[-1].operation if can_redo else ""
 
         return UndoStatusResponse(
             can_undo=can_undo,
@@ -365,3 +377,30 @@ def enable_undo() -> SuccessResponse:
         return SuccessResponse(success=True, message="Undo tracking enabled")
     except Exception as e:
         raise_http_error(500, "enable_failed", f"Error enabling undo: {str(e)}")
+
+
+@router.get(
+    "/workspace/diagnostics",
+    response_model=MemoryDiagnosticsResponse,
+    summary="Report live versus registered nodes",
+    description="Counts node objects still alive in memory against nodes registered in the workspace. "
+                "Unregistered nodes are normally held by undo history; a count that keeps growing "
+                "while the undo history stays bounded points to a leak.",
+)
+def get_memory_diagnostics(collect: bool = Query(False, description="Run the garbage collector before counting")) -> MemoryDiagnosticsResponse:
+    try:
+        if collect:
+            gc.collect()
+        registered = {id(node) for node in NodeEnvironment.nodes.values()}
+        live = MobileItem.live_items()
+        undo_mgr = UndoManager()
+        return MemoryDiagnosticsResponse(
+            live_nodes=len(live),
+            registered_nodes=len(registered),
+            unregistered_nodes=sum(1 for item in live if id(item) not in registered),
+            undo_entries=len(undo_mgr.undo_stack) + len(undo_mgr.redo_stack),
+            undo_bytes=undo_mgr.memory_usage()
+        )
+
+    except Exception as e:
+        raise_http_error(500, "internal_error", f"Error collecting diagnostics: {str(e)}")
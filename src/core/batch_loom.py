@@ -1,10 +1,15 @@
 import argparse
+import json
 import logging
+import os
 import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
 from pathlib import Path
-from typing import List, Set, Optional, Union, TextIO, Any
-from core.base_classes import NodeEnvironment, Node
+from typing import Dict, List, Set, Optional, Union, TextIO, Any
+from core.base_classes import NodeEnvironment, Node, NodeState
 from core.flowstate_manager import load_flowstate
+from core.global_store import GlobalStore
 
 
 """Batch processor for Text Loom flowstate files that evaluates and outputs node results.
@@ -19,9 +24,32 @@ Args:
     -p/--plain-text: Format output as plain text, adding spacing between list items
     -l/--log-file: Path to log file for detailed processing information
 
+    -m/--manifest: Run every job in a JSON manifest instead of a single flowstate
+    -r/--results-file: JSONL file that manifest results are appended to
+    -w/--workers: Number of worker processes for manifest jobs
+
+Manifest format:
+    {
+        "flowstate": "default.json",            # used by jobs that name none
+        "jobs": [
+            {"id": "a", "globals": {"TOPIC": ["cats"]}},
+            {"id": "b", "parms": {"/file_in1": {"file_name": "in_b.txt"}}},
+            {"id": "c", "flowstate": "other.json", "nodes": ["/merge1"]}
+        ]
+    }
+    Paths are relative to the manifest. A job without an id is named after
+    its position. Parm and global overrides are applied before the job cooks
+    and undone after it, so each worker keeps its loaded flowstate between
+    jobs and only reloads when a job names a different one.
+
+    One JSON line is appended to the results file as each job finishes. A
+    rerun with the same results file skips the jobs already recorded as ok,
+    so a crashed batch resumes where it stopped.
+
 Example usage:
     python batch_loom.py flowstate.json output.txt
     python batch_loom.py -f flowstate.json -o output.txt -p -l process.log
+    python -m core.batch_loom -m nightly.json -r nightly.jsonl -w 8
 
 Raises:
     FileNotFoundError: If the specified flowstate file doesn't exist
@@ -106,6 +134,159 @@ def process_nodes(nodes: List[Node], output_file: Optional[Union[str, TextIO]] =
         else:
             output_file.write(final_output)
 
+def load_manifest(manifest_path: Union[str, Path]) -> List[Dict[str, Any]]:
+    manifest_path = Path(manifest_path)
+    with open(manifest_path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    if isinstance(manifest, list):
+        manifest = {"jobs": manifest}
+
+    base_dir = manifest_path.parent
+    default_flowstate = manifest.get("flowstate")
+    jobs = []
+    for index, job in enumerate(manifest.get("jobs", [])):
+        flowstate = job.get("flowstate", default_flowstate)
+        if not flowstate:
+            raise ValueError(f"Job {index} has no flowstate and the manifest sets no default")
+        jobs.append({
+            "id": str(job.get("id", index)),
+            "flowstate": str(base_dir / flowstate),
+            "globals": job.get("globals", {}),
+            "parms": job.get("parms", {}),
+            "nodes": job.get("nodes"),
+        })
+    return jobs
+
+def completed_job_ids(results_path: Union[str, Path]) -> Set[str]:
+    completed: Set[str] = set()
+    if not os.path.exists(results_path):
+        return completed
+    with open(results_path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # the line a crash cut short
+            if record.get("status") == "ok":
+                completed.add(record["id"])
+    return completed
+
+_loaded_flowstate: Optional[str] = None
+_MISSING = object()
+
+def _init_worker() -> None:
+    from core.undo_manager import UndoManager
+    UndoManager().disable()
+
+def _mark_all_dirty() -> None:
+    # Global values reach nodes through parm expressions, which do not mark anything dirty
+    for node in NodeEnvironment.nodes.values():
+        node.set_state(NodeState.UNCOOKED)
+
+def run_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Cooks one manifest job in this process's environment and returns its result record."""
+    global _loaded_flowstate
+    start_time = time.time()
+    record: Dict[str, Any] = {"id": job["id"], "flowstate": job["flowstate"]}
+    restore_parms = []
+    restore_globals = {}
+    try:
+        if _loaded_flowstate != job["flowstate"]:
+            _loaded_flowstate = None
+            if not load_flowstate(job["flowstate"]):
+                raise RuntimeError(f"Failed to load flowstate {job['flowstate']}")
+            _loaded_flowstate = job["flowstate"]
+
+        for key, value in job["globals"].items():
+            restore_globals[key] = GlobalStore.get(key) if GlobalStore.has(key) else _MISSING
+            GlobalStore.set(key, value)
+        if restore_globals:
+            _mark_all_dirty()
+        for node_path, parms in job["parms"].items():
+            node = NodeEnvironment.nodes.get(node_path)
+            if node is None:
+                raise KeyError(f"Node {node_path} not found")
+            for parm_name, value in parms.items():
+                parm = node._parms[parm_name]
+                restore_parms.append((parm, parm.raw_value()))
+                parm.set(value)
+
+        if job["nodes"]:
+            nodes = [NodeEnvironment.nodes[path] for path in job["nodes"]]
+        else:
+            nodes = find_bottom_nodes(NodeEnvironment.get_instance())
+        record["outputs"] = {node.path(): node.eval() for node in nodes}
+        record["status"] = "ok"
+    except Exception as e:
+        record["status"] = "error"
+        record["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        for parm, value in reversed(restore_parms):
+            parm.set(value)
+        for key, value in restore_globals.items():
+            if value is _MISSING:
+                GlobalStore.cut(key)
+            else:
+                GlobalStore.set(key, value)
+        if restore_globals:
+            _mark_all_dirty()
+    record["elapsed_ms"] = (time.time() - start_time) * 1000
+    return record
+
+def run_manifest(manifest_path: Union[str, Path], results_path: Union[str, Path], workers: int = 1) -> Dict[str, int]:
+    """Runs every job of the manifest not yet recorded as ok in results_path.
+
+    Jobs are spread over a pool of worker processes, each keeping its loaded
+    flowstate between jobs, and each result is appended to results_path as
+    soon as it arrives. Returns counts of ok, error and skipped jobs.
+    """
+    jobs = load_manifest(manifest_path)
+    done = completed_job_ids(results_path)
+    pending = [job for job in jobs if job["id"] not in done]
+    counts = {"ok": 0, "error": 0, "skipped": len(jobs) - len(pending)}
+    logging.info(f"{len(pending)} of {len(jobs)} jobs to run on {workers} workers")
+
+    with open(results_path, 'a+', encoding='utf-8') as results:
+        if results.tell() > 0:
+            results.seek(results.tell() - 1)
+            if results.read(1) != '\n':
+                results.write('\n')
+
+        def write(record: Dict[str, Any]) -> None:
+            results.write(json.dumps(record, default=str) + '\n')
+            results.flush()
+            counts[record["status"]] += 1
+            if record["status"] == "ok":
+                logging.info(f"Job {record['id']} finished in {record['elapsed_ms']:.0f} ms")
+            else:
+                logging.error(f"Job {record['id']} failed: {record['error']}")
+
+        if workers <= 1:
+            from core.undo_manager import UndoManager
+            _init_worker()
+            try:
+                for job in pending:
+                    write(run_job(job))
+            finally:
+                UndoManager().enable()
+            return counts
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            jobs_left = iter(pending)
+            running: Set[Future] = set()
+            while True:
+                # Keep a few jobs queued per worker rather than pickling the whole manifest up front
+                for job in jobs_left:
+                    running.add(executor.submit(run_job, job))
+                    if len(running) >= workers * 4:
+                        break
+                if not running:
+                    break
+                finished, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    write(future.result())
+    return counts
+
 def main():
     parser = argparse.ArgumentParser(description="Process TextLoom flowstate files")
     parser.add_argument("flowstate", nargs="?", help="Path to flowstate JSON file")
@@ -114,9 +295,19 @@ def main():
     parser.add_argument("-o", "--output-file", help="Path to output file")
     parser.add_argument("-p", "--plain-text", action="store_true", help="Format output as plain text")
     parser.add_argument("-l", "--log-file", help="Path to log file")
+    parser.add_argument("-m", "--manifest", help="Path to a JSON manifest of batch jobs")
+    parser.add_argument("-r", "--results-file", help="JSONL file for manifest results")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1, help="Worker processes for manifest jobs")
     
     args = parser.parse_args()
     
+    if args.manifest:
+        setup_logging(args.log_file)
+        results_path = args.results_file or str(Path(args.manifest).with_suffix('.results.jsonl'))
+        counts = run_manifest(args.manifest, results_path, args.workers)
+        logging.info(f"Batch finished: {counts['ok']} ok, {counts['error']} failed, {counts['skipped']} already done")
+        return
+    
     flowstate_path = args.flowstate_file or args.flowstate
     output_path = args.output_file or args.output
     
@@ -5,6 +5,7 @@ from typing import List, Dict
 from core.base_classes import Node, NodeType, NodeState
 from core.parm import Parm, ParameterType
 from core.enums import FunctionalGroup
+from core.item_memo import ItemMemo
 
 class ChunkNode(Node):
     """A node that splits text into chunks using various strategies.
@@ -80,6 +81,7 @@ class ChunkNode(Node):
         self._is_time_dependent = False
         self._input_hash = None
         self._param_hash = None
+        self._item_memo = ItemMemo()
 
         self._parms.update({
             "chunk_mode": Parm("chunk_mode", ParameterType.MENU, self),
@@ -174,19 +176,23 @@ class ChunkNode(Node):
         if not p('enabled') or not input_data:
             self._output = input_data
         else:
-            chunks = []
-            for item in input_data:
-                item_chunks = self._chunk_text(item, p('chunk_mode'), p('chunk_size'),
-                                               p('overlap_size'), p('respect_boundaries'),
-                                               p('min_chunk_size'))
-                if p('add_metadata'):
+            mode, size, overlap = p('chunk_mode'), p('chunk_size'), p('overlap_size')
+            respect, min_size, add_metadata = p('respect_boundaries'), p('min_chunk_size'), p('add_metadata')
+
+            def chunk_item(item: str) -> List[str]:
+                item_chunks = self._chunk_text(item, mode, size, overlap, respect, min_size)
+                if add_metadata:
                     total = len(item_chunks)
                     item_chunks = [f"Chunk {i+1}/{total}: {c}" for i, c in enumerate(item_chunks)]
+                return item_chunks
+
+            chunks = []
+            for item_chunks in self._item_memo.map(input_data, self._compute_param_hash(), chunk_item):
                 chunks.extend(item_chunks)
             self._output = chunks
 
         self._param_hash = self._compute_param_hash()
-        self._input_hash = hashlib.md5(str(input_data).encode()).hexdigest()
+        self._input_hash = self.input_fingerprint()
         self.set_state(NodeState.UNCHANGED)
         self._last_cook_time = (time.time() - start_time) * 1000
 
@@ -195,7 +201,7 @@ class ChunkNode(Node):
             return True
         try:
             return (self._compute_param_hash('raw_value') != self._param_hash or
-                    hashlib.md5(str(self._get_input_data()).encode()).hexdigest() != self._input_hash)
+                    self.input_fingerprint() != self._input_hash)
         except Exception:
             return True
 
@@ -0,0 +1,350 @@
+import threading
+import time
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextvars import ContextVar, copy_context
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Sequence, Set, TYPE_CHECKING
+
+from core.enums import NodeState, NodeType
+
+if TYPE_CHECKING:
+    from core.node import Node
+
+
+"""
+Graph-level cook scheduling for Text Loom node networks.
+
+A cook request for a node is handled as a single pass: the upstream closure of
+the requested node is put in topological order once, each node in that order
+is cooked at most once, and any node evaluated again during the same request
+returns its cached output instead of cooking a second time. Several nodes can
+be requested together; they share one pass over the union of their upstream
+closures, so a node feeding more than one of them still cooks once.
+
+Dirty flags are pushed downstream through output connections whenever a parm
+or connection changes (see mark_dirty), and from a node inside a LooperNode up
+to that looper, so a node only has to look at its own state to know that it
+must cook. Every cooked node also publishes a fingerprint
+of its output (see core.fingerprint), which downstream nodes compare against
+the one they last cooked with instead of re-hashing their input data.
+
+Passes nest: a cook requested while another one is running (a LooperNode
+iteration, for instance) opens a child pass that can see everything its
+ancestors already cooked, so upstream work is never repeated inside a loop.
+
+Parallel cooking is opt-in (see set_max_workers). With more than one worker,
+a top-level request submits every node whose inputs have finished to a thread
+pool, so independent branches feeding a MergeNode cook side by side and the
+wall-clock time follows the longest branch. Nested passes always run serially
+inside the worker that opened them.
+
+A CookMonitor can be attached to a request (see monitor). It is told when
+each node starts and finishes cooking, nested passes included, and cancelling
+it makes the next node the request reaches raise CookCancelled instead of
+cooking. Long-running nodes such as LooperNode call check_cancelled between
+steps so they stop too.
+
+Example:
+    >>> cook_scheduler.cook(merge_node)
+    >>> cook_scheduler.last_stats().cook_counts
+    {'/text1': 1, '/text2': 1, '/merge1': 1}
+"""
+
+
+@dataclass
+class CookStats:
+    """Counters for one top-level cook request, nested passes included.
+
+    target is the requested node's path, comma-separated when several were requested together.
+    """
+    target: str
+    order: List[str] = field(default_factory=list)
+    cook_counts: Dict[str, int] = field(default_factory=dict)
+    passes: int = 0
+    elapsed_ms: float = 0.0
+
+    def total_cooks(self) -> int:
+        return sum(self.cook_counts.values())
+
+    def cooked_more_than_once(self) -> List[str]:
+        return [path for path, count in self.cook_counts.items() if count > 1]
+
+
+class CookPass:
+    """Tracks which nodes have cooked during one cook request."""
+
+    def __init__(self, targets: Sequence['Node'], parent: Optional['CookPass'] = None):
+        self.targets: Set['Node'] = set(targets)
+        self.parent = parent
+        self.stats: CookStats = parent.stats if parent else CookStats(
+            target=", ".join(target.path() for target in targets))
+        self._lock: threading.Lock = parent._lock if parent else threading.Lock()
+        self._cooked: Set['Node'] = set()
+        self.stats.passes += 1
+
+    def cooked_here(self, node: 'Node') -> bool:
+        return node in self._cooked
+
+    def has_cooked(self, node: 'Node') -> bool:
+        cook_pass: Optional[CookPass] = self
+        while cook_pass is not None:
+            if node in cook_pass._cooked:
+                return True
+            cook_pass = cook_pass.parent
+        return False
+
+    def record_cook(self, node: 'Node') -> None:
+        with self._lock:
+            self._cooked.add(node)
+            path = node.path()
+            self.stats.cook_counts[path] = self.stats.cook_counts.get(path, 0) + 1
+
+
+class CookCancelled(BaseException):
+    """Raised inside a cook whose monitor was cancelled.
+
+    Derives from BaseException, like KeyboardInterrupt, so that nodes which
+    turn their own exceptions into node errors let it through.
+    """
+
+
+class CookMonitor:
+    """Observes the cooks of one request and can cancel it; subclass to receive node events."""
+
+    def __init__(self):
+        self._cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def node_started(self, node: 'Node') -> None:
+        pass
+
+    def node_finished(self, node: 'Node') -> None:
+        pass
+
+
+_active_cook_pass: ContextVar[Optional[CookPass]] = ContextVar('active_cook_pass', default=None)
+_active_monitor: ContextVar[Optional[CookMonitor]] = ContextVar('active_cook_monitor', default=None)
+
+
+class CookScheduler:
+    """
+    Singleton that cooks nodes in dependency order, once per request.
+
+    Methods:
+    cook(*targets): Cooks the targets and every dirty node upstream of them in one pass
+        Example: cook_scheduler.cook(node) or cook_scheduler.cook(sink_a, sink_b)
+
+    topological_order(*targets): Upstream closure of the targets, inputs first
+        Example: order = cook_scheduler.topological_order(node)
+
+    mark_dirty(node): Flags a node, everything downstream and any looper it sits in as uncooked
+        Example: cook_scheduler.mark_dirty(node)
+
+    has_cooked(node): True if the node already cooked in the active request
+        Example: if cook_scheduler.has_cooked(node): ...
+
+    last_stats(): CookStats of the most recent top-level request
+        Example: counts = cook_scheduler.last_stats().cook_counts
+
+    set_max_workers(count): Cooks independent branches on a pool of count
+        threads; 1 (the default) keeps cooking serial
+        Example: cook_scheduler.set_max_workers(4)
+
+    monitor(cook_monitor): Reports and allows cancelling the cooks made inside the block
+        Example: with cook_scheduler.monitor(job_monitor): node.eval()
+
+    check_cancelled(): Raises CookCancelled if the active monitor was cancelled
+        Example: cook_scheduler.check_cancelled()
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(CookScheduler, cls).__new__(cls)
+            cls._instance._last_stats: Optional[CookStats] = None
+            cls._instance._max_workers: int = 1
+            cls._instance._executor: Optional[ThreadPoolExecutor] = None
+            cls._instance._executor_lock = threading.Lock()
+        return cls._instance
+
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    def set_max_workers(self, count: int) -> None:
+        if count < 1:
+            raise ValueError(f"max_workers must be at least 1, got {count}")
+        with self._executor_lock:
+            if count == self._max_workers:
+                return
+            self._max_workers = count
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+    def active_pass(self) -> Optional[CookPass]:
+        return _active_cook_pass.get()
+
+    def has_cooked(self, node: 'Node') -> bool:
+        cook_pass = _active_cook_pass.get()
+        return cook_pass is not None and cook_pass.has_cooked(node)
+
+    def last_stats(self) -> Optional[CookStats]:
+        return self._last_stats
+
+    @contextmanager
+    def monitor(self, cook_monitor: CookMonitor) -> Iterator[CookMonitor]:
+        token = _active_monitor.set(cook_monitor)
+        try:
+            yield cook_monitor
+        finally:
+            _active_monitor.reset(token)
+
+    def check_cancelled(self) -> None:
+        cook_monitor = _active_monitor.get()
+        if cook_monitor is not None and cook_monitor.cancelled():
+            raise CookCancelled()
+
+    def topological_order(self, *targets: 'Node') -> List['Node']:
+        order: List['Node'] = []
+        visited: Set['Node'] = set()
+        pending = [(target, False) for target in reversed(targets)]
+        while pending:
+            node, inputs_done = pending.pop()
+            if inputs_done:
+                order.append(node)
+                continue
+            if node in visited:
+                continue
+            visited.add(node)
+            pending.append((node, True))
+            for input_node in reversed(node.input_nodes()):
+                if input_node not in visited:
+                    pending.append((input_node, False))
+        return order
+
+    def mark_dirty(self, node: 'Node') -> None:
+        if node._state == NodeState.UNCOOKED and not any(node._outputs.values()):
+            return
+        pending = [node]
+        seen: Set['Node'] = set()
+        while pending:
+            current = pending.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            with current._state_lock:
+                if current.state() != NodeState.COOKING:
+                    current.set_state(NodeState.UNCOOKED)
+            pending.extend(current.outputs())
+            looper = self._owning_looper(current)
+            # A looper that is cooking is making these changes itself
+            if looper is not None and looper.state() != NodeState.COOKING:
+                pending.append(looper)
+
+    @staticmethod
+    def _owning_looper(node: 'Node') -> Optional['Node']:
+        from core.node_environment import NodeEnvironment
+        parent_path = node.path().rsplit('/', 1)[0]
+        if not parent_path:
+            return None
+        parent = NodeEnvironment.nodes.get(parent_path)
+        if parent is not None and parent.type() == NodeType.LOOPER:
+            return parent
+        return None
+
+    def cook(self, *targets: 'Node') -> CookStats:
+        if not targets:
+            raise ValueError("cook() needs at least one target")
+        parent = _active_cook_pass.get()
+        cook_pass = CookPass(targets, parent)
+        token = _active_cook_pass.set(cook_pass)
+        start_time = time.time()
+        try:
+            order = self.topological_order(*targets)
+            if parent is None:
+                cook_pass.stats.order = [node.path() for node in order]
+            if parent is None and self._max_workers > 1 and len(order) > 2:
+                self._cook_parallel(order, cook_pass)
+            else:
+                for node in order:
+                    self._cook_node(node, cook_pass)
+        finally:
+            _active_cook_pass.reset(token)
+            if parent is None:
+                cook_pass.stats.elapsed_ms = (time.time() - start_time) * 1000
+                self._last_stats = cook_pass.stats
+        return cook_pass.stats
+
+    def _cook_node(self, node: 'Node', cook_pass: CookPass) -> None:
+        if node in cook_pass.targets or self._is_dirty(node, cook_pass):
+            cook_monitor = _active_monitor.get()
+            if cook_monitor is not None:
+                self.check_cancelled()
+                cook_monitor.node_started(node)
+            node._run_cook()
+            node._publish_output_fingerprint()
+            cook_pass.record_cook(node)
+            if cook_monitor is not None:
+                cook_monitor.node_finished(node)
+
+    def _cook_parallel(self, order: List['Node'], cook_pass: CookPass) -> None:
+        in_order = set(order)
+        waiting: Dict['Node', int] = {}
+        dependents: Dict['Node', List['Node']] = {node: [] for node in order}
+        for node in order:
+            inputs = {input_node for input_node in node.input_nodes() if input_node in in_order}
+            waiting[node] = len(inputs)
+            for input_node in inputs:
+                dependents[input_node].append(node)
+
+        executor = self._get_executor()
+        running: Dict[Future, 'Node'] = {}
+
+        def submit(node: 'Node') -> None:
+            context = copy_context()
+            running[executor.submit(context.run, self._cook_node, node, cook_pass)] = node
+
+        for node in order:
+            if waiting[node] == 0:
+                submit(node)
+        try:
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node = running.pop(future)
+                    future.result()
+                    for dependent in dependents[node]:
+                        waiting[dependent] -= 1
+                        if waiting[dependent] == 0:
+                            submit(dependent)
+        except BaseException:
+            for future in running:
+                future.cancel()
+            wait(running)
+            raise
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers,
+                    thread_name_prefix="tloom-cook",
+                )
+            return self._executor
+
+    def _is_dirty(self, node: 'Node', cook_pass: CookPass) -> bool:
+        if cook_pass.has_cooked(node):
+            return False
+        if any(cook_pass.cooked_here(input_node) for input_node in node.input_nodes()):
+            return True
+        return node.needs_to_cook()
+
+
+cook_scheduler = CookScheduler()
@@ -173,7 +173,7 @@ class CountNode(Node):
             self._output = result
 
         self._param_hash = self._compute_param_hash()
-        self._input_hash = hashlib.md5(str(input_data).encode()).hexdigest()
+        self._input_hash = self.input_fingerprint()
         self.set_state(NodeState.UNCHANGED)
         self._last_cook_time = (time.time() - start_time) * 1000
 
@@ -182,7 +182,7 @@ class CountNode(Node):
             return True
         try:
             return (self._compute_param_hash('raw_value') != self._param_hash or
-                    hashlib.md5(str(self._get_input_data()).encode()).hexdigest() != self._input_hash)
+                    self.input_fingerprint() != self._input_hash)
         except Exception:
             return True
 
@@ -1,44 +1,19 @@
-import configparser
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import requests
 import os 
+from core.llm_config import get_llm_config
+from core.http_pool import get_session
 
 
 def load_config(file_path=None):
-    if file_path is None:
-        # Get the directory of the current script (findLLM.py)
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        # Construct the path to settings.cfg relative to the script
-        file_path = os.path.join(script_dir, 'settings.cfg')
+    return get_llm_config().config(file_path)
 
-    config = configparser.ConfigParser()
-    
-    #print(f"Attempting to read config from: {os.path.abspath(file_path)}")
-    
-    if not os.path.exists(file_path):
-        print(f"Error: Config file not found at {file_path}")
-        return {}
-
-    try:
-        with open(file_path, 'r') as f:
-            config.read_file(f)
-    except Exception as e:
-        print(f"Error reading config file: {e}")
-        return {}
-
-    sections = config.sections()
-    #print(f"Sections found in config: {sections}")
-
-    if not sections:
-        print("Warning: No sections found in the config file.")
-    
-    return config
-
-def check_llm(name, url, endpoint):
+def check_llm(name, url, endpoint, settings=None):
     try:
         full_url = f"{url}{endpoint}"
         print(f"Checking {name} at {full_url}")
-        response = requests.get(full_url, timeout=2)
+        # Same settings as query_llm, so the check reuses the backend's keep-alive session
+        response = get_session(name, settings).get(full_url, timeout=2)
         if response.status_code == 200:
             print(f"{name} is available")
             return name
@@ -50,18 +25,8 @@ def check_llm(name, url, endpoint):
 
 
 def get_active_llm_from_config(file_path='settings.cfg'):
-
     script_dir = os.path.dirname(os.path.abspath(__file__))
-    config_path = os.path.join(script_dir, file_path)
-    config = configparser.ConfigParser()
-    config.read(config_path)
-
-    try:
-        active_llm = config['DEFAULT']['active_llm']
-        return active_llm
-    except KeyError:
-        print("No active_llm found in the DEFAULT section of the config file.")
-        return None
+    return get_llm_config().active_llm(os.path.join(script_dir, file_path))
 
 
 def find_local_LLM(choose=False):
@@ -73,7 +38,7 @@ def find_local_LLM(choose=False):
         url = config[section].get('url')
         endpoint = config[section].get('models_endpoint', '')
         if url:
-            llms.append((section, url, endpoint))
+            llms.append((section, url, endpoint, {**config["DEFAULT"], **config[section]}))
 
     print(f"Found {len(llms)} potential LLMs in config")
 
@@ -84,7 +49,8 @@ def find_local_LLM(choose=False):
     active_llms = []
 
     with ThreadPoolExecutor(max_workers=len(llms)) as executor:
-        future_to_llm = {executor.submit(check_llm, name, url, endpoint): name for name, url, endpoint in llms}
+        future_to_llm = {executor.submit(check_llm, name, url, endpoint, settings): name
+                         for name, url, endpoint, settings in llms}
         for future in as_completed(future_to_llm):
             result = future.result()
             if result:
@@ -0,0 +1,34 @@
+"""Cheap structural fingerprints for node outputs.
+
+Every node publishes a fingerprint of its output when it cooks (see
+Node.output_fingerprint). Downstream nodes remember the fingerprint of the
+input they last cooked with, so needs_to_cook() becomes a single integer
+comparison instead of building str(input_data) and hashing it with md5.
+
+Fingerprints use Python's built-in hash. Strings cache their own hash, so
+fingerprinting a List[str] is one pass over the list with no copying of the
+text itself. Values are only stable within one process, which is all change
+detection needs; never persist them.
+
+Example:
+    >>> fingerprint(["a", "b"]) == fingerprint(["a", "b"])
+    True
+    >>> fingerprint([["a"], ["b"]]) == fingerprint([["a"], ["c"]])
+    False
+"""
+
+from typing import Any
+
+
+def fingerprint(value: Any) -> int:
+    if isinstance(value, (list, tuple)):
+        try:
+            return hash((len(value), tuple(value)))
+        except TypeError:
+            return hash((len(value), tuple(fingerprint(item) for item in value)))
+    if isinstance(value, dict):
+        return hash(tuple((fingerprint(key), fingerprint(item)) for key, item in value.items()))
+    try:
+        return hash(value)
+    except TypeError:
+        return hash(repr(value))
@@ -0,0 +1,151 @@
+"""Compact zipped container for flowstates, with lazily loaded parm payloads.
+
+A .json flowstate inlines every parm value, so a network holding large
+STRINGLIST parms (the staging_data and out_data of looper nodes, cached query
+responses) produces files of hundreds of MB that must be parsed in full before
+the first node is created. The archive format splits a flowstate into:
+
+    flowstate.json      graph structure, node attributes, small parms, globals
+    payloads/<n>.json   one member per large STRINGLIST parm value
+
+Both are deflate-compressed and written without indentation. On load the
+archive is memory-mapped, flowstate.json is parsed eagerly, and each large parm
+receives a LazyPayload in place of its value, so the member is only
+decompressed and parsed the first time the node reads that parm. Payloads that
+are never read are never decoded, and saving a parm whose payload is still
+pending copies its bytes without decoding them.
+
+Files are told apart by content, not suffix: load_flowstate accepts either
+format from any path, and save_flowstate writes an archive when the path ends
+in ARCHIVE_SUFFIX.
+
+Example:
+    >>> save_flowstate("big_network.tlz")
+    >>> load_flowstate("big_network.tlz")   # payloads stay on disk until read
+"""
+
+import json
+import mmap
+import os
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, Iterator, Union
+
+ARCHIVE_SUFFIX = ".tlz"
+MANIFEST = "flowstate.json"
+PAYLOAD_DIR = "payloads/"
+LAZY_PAYLOAD_BYTES = 16 * 1024
+
+
+class LazyPayload:
+    """A parm value that stays in the archive until it is first read."""
+    __slots__ = ('_archive', 'member')
+
+    def __init__(self, archive: 'FlowstateArchive', member: str):
+        self._archive = archive
+        self.member = member
+
+    def load(self) -> Any:
+        return json.loads(self.raw())
+
+    def raw(self) -> bytes:
+        return self._archive.read(self.member)
+
+    def __repr__(self) -> str:
+        return f"LazyPayload({self.member!r})"
+
+
+class _MappedFile:
+    """Read-only file object over an mmap, which zipfile can read members from in place."""
+
+    def __init__(self, mapped: mmap.mmap):
+        self._map = mapped
+
+    def read(self, size: int = -1) -> bytes:
+        return self._map.read(size)
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        self._map.seek(offset, whence)
+        return self._map.tell()
+
+    def tell(self) -> int:
+        return self._map.tell()
+
+    def seekable(self) -> bool:
+        return True
+
+
+class FlowstateArchive:
+    """Read side of an archive; the file stays mapped while any LazyPayload refers to it."""
+
+    def __init__(self, filepath: Union[str, Path]):
+        with open(filepath, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._zip = zipfile.ZipFile(_MappedFile(self._map))
+
+    def read(self, member: str) -> bytes:
+        return self._zip.read(member)
+
+    def save_data(self) -> Dict[str, Any]:
+        """The flowstate dict with every payload reference replaced by a LazyPayload."""
+        save_data = json.loads(self.read(MANIFEST))
+        for parm_data in _iter_parm_data(save_data):
+            member = parm_data.pop("_payload", None)
+            if member is not None:
+                parm_data["_value"] = LazyPayload(self, member)
+        return save_data
+
+
+def is_archive(filepath: Union[str, Path]) -> bool:
+    return zipfile.is_zipfile(filepath)
+
+
+def wants_archive(filepath: Union[str, Path]) -> bool:
+    return Path(filepath).suffix.lower() == ARCHIVE_SUFFIX
+
+
+def read_archive(filepath: Union[str, Path]) -> Dict[str, Any]:
+    return FlowstateArchive(filepath).save_data()
+
+
+def write_archive(filepath: Union[str, Path], save_data: Dict[str, Any], default=None) -> None:
+    """Writes save_data, moving large STRINGLIST parm values into their own members.
+
+    The archive is written to a temporary file and moved into place, so a file
+    that is still mapped by an earlier load is never truncated underneath it.
+    save_data is modified in place.
+    """
+    filepath = Path(filepath)
+    fd, tmp_path = tempfile.mkstemp(dir=filepath.parent, prefix=f".{filepath.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f, zipfile.ZipFile(f, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for index, parm_data in enumerate(_iter_parm_data(save_data)):
+                payload = _payload_bytes(parm_data.get("_value"))
+                if payload is None:
+                    continue
+                member = f"{PAYLOAD_DIR}{index}.json"
+                archive.writestr(member, payload)
+                del parm_data["_value"]
+                parm_data["_payload"] = member
+            archive.writestr(MANIFEST, json.dumps(save_data, default=default, separators=(',', ':')))
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def _payload_bytes(value: Any) -> Union[bytes, None]:
+    if isinstance(value, LazyPayload):
+        return value.raw()
+    if isinstance(value, list) and sum(len(item) for item in value if isinstance(item, str)) >= LAZY_PAYLOAD_BYTES:
+        return json.dumps(value, separators=(',', ':')).encode('utf-8')
+    return None
+
+
+def _iter_parm_data(save_data: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    for node_data in save_data.get("nodes", {}).values():
+        for parm_data in node_data.get("_parms", {}).values():
+            if isinstance(parm_data, dict):
+                yield parm_data
@@ -1,10 +1,14 @@
 from typing import Any, Dict, List, Optional, Set
 from pathlib import Path, PurePosixPath
 from datetime import datetime
+import gc
+import importlib
 import json
+from contextlib import contextmanager, nullcontext
 from core.base_classes import NodeEnvironment, Node, NodeConnection, NodeType
 from core.global_store import GlobalStore
 from core.parm import Parm, ParameterType
+from core.flowstate_archive import LazyPayload, is_archive, read_archive, wants_archive, write_archive
 import traceback
 import inspect
 
@@ -19,8 +23,9 @@ format and back.
 
 Key components:
 - NodeEncoder: Custom JSON encoder for Node objects and related types
-- save_flowstate(): Saves the current node environment to a JSON file
-- load_flowstate(): Restores a node environment from a JSON file
+- save_flowstate(): Saves the current node environment to a JSON file, or to a
+  compact archive when the path ends in .tlz (see core.flowstate_archive)
+- load_flowstate(): Restores a node environment from either format
 - Helper functions for serializing/deserializing individual nodes, parameters, and connections
 
 The module ensures data integrity through careful error handling and maintains
@@ -56,15 +61,14 @@ class NodeEncoder(json.JSONEncoder):
             return str(obj)
         if isinstance(obj, NodeType):
             return obj.value
+        if isinstance(obj, LazyPayload):
+            return obj.load()
         if _is_method_or_callable(obj):
             return None
         return super().default(obj)
 
 def _is_method_or_callable(obj: Any) -> bool:
-    return (inspect.ismethod(obj) or 
-        inspect.isfunction(obj) or 
-        callable(obj) or 
-        isinstance(obj, (type, property)))
+    return callable(obj) or isinstance(obj, property)
 
 def _clean_for_json(obj: Any) -> Any:
     if isinstance(obj, dict):
@@ -75,6 +79,9 @@ def _clean_for_json(obj: Any) -> Any:
                 if not _is_method_or_callable(item)]
     elif isinstance(obj, (str, int, float, bool, type(None))):
         return obj
+    elif isinstance(obj, tuple):
+        return [_clean_for_json(item) for item in obj
+                if not _is_method_or_callable(item)]
     elif _is_method_or_callable(obj):
         return None
     else:
@@ -114,7 +121,7 @@ def _serialize_parm(parm: Parm) -> dict:
             "_type": parm._type.value,
             "_node": str(parm._node.path()) if parm._node else None,
             "_script_callback": parm._script_callback,
-            "_value": parm._value
+            "_value": parm._payload if parm._payload is not None else parm._value
         }
     except Exception as e:
         print(f"Error in _serialize_parm")
@@ -254,6 +261,11 @@ def _restore_connections(node: Node, connections_data: List[dict]) -> None:
 
 
 def save_flowstate(filepath: str) -> bool:
+    with _gc_paused():
+        return _save_flowstate(filepath)
+
+
+def _save_flowstate(filepath: str) -> bool:
     try:
         env = NodeEnvironment.get_instance()
         save_data = {
@@ -281,8 +293,11 @@ def save_flowstate(filepath: str) -> bool:
             print(f"Error saving state {e}")
             traceback.print_exc()
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(save_data, f, cls=NodeEncoder, indent=2)
+        if wants_archive(filepath):
+            write_archive(filepath, save_data, default=NodeEncoder().default)
+        else:
+            with open(filepath, 'w', encoding='utf-8') as f:
+                json.dump(save_data, f, cls=NodeEncoder, indent=2)
         
         print("💾 Flowstate saved 💾 ")
         return True
@@ -292,66 +307,230 @@ def save_flowstate(filepath: str) -> bool:
         traceback.print_exc()
         return False
     
-def load_flowstate(filepath: str) -> bool:
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            save_data = json.load(f)
-        
-        env = NodeEnvironment.get_instance()
-        NodeEnvironment.nodes.clear()
-        
-        sorted_nodes = sorted(save_data["nodes"].items(), key=lambda x: len(x[0].split('/')))
-        for node_path, node_data in sorted_nodes:
-            if node_data.get("_is_internal", False):
+def _load_nodes(save_data: dict, env: NodeEnvironment) -> None:
+    sorted_nodes = sorted(save_data["nodes"].items(), key=lambda x: len(x[0].split('/')))
+    for node_path, node_data in sorted_nodes:
+        if node_data.get("_is_internal", False):
+            continue
+
+        try:
+            node = _deserialize_node(node_data, env)
+            if not node:
+                print(f"Failed to create node {node_path}")
                 continue
-                
-            try:
-                node = _deserialize_node(node_data, env)
-                if not node:
-                    print(f"Failed to create node {node_path}")
-                    continue
-                
-                if node.type() == NodeType.LOOPER and node._internal_nodes_created:
-                    input_path = str(node._input_node.path())
-                    output_path = str(node._output_node.path())
-
-                    if input_path in save_data["nodes"]:
-                        _apply_node_data(node._input_node, save_data["nodes"][input_path])
-                    if output_path in save_data["nodes"]:
-                        _apply_node_data(node._output_node, save_data["nodes"][output_path])
-                    
-            except Exception as e:
-                print(f"Error creating node {node_path}")
-                traceback.print_exc()
+
+            if node.type() == NodeType.LOOPER and node._internal_nodes_created:
+                input_path = str(node._input_node.path())
+                output_path = str(node._output_node.path())
+
+                if input_path in save_data["nodes"]:
+                    _apply_node_data(node._input_node, save_data["nodes"][input_path])
+                if output_path in save_data["nodes"]:
+                    _apply_node_data(node._output_node, save_data["nodes"][output_path])
+
+        except Exception as e:
+            print(f"Error creating node {node_path}")
+            traceback.print_exc()
+            continue
+
+    for node_path, node_data in save_data["nodes"].items():
+        try:
+            if '_connections' not in node_data:
                 continue
-        
-        for node_path, node_data in save_data["nodes"].items():
+
+            current_node = NodeEnvironment.node_from_name(node_path)
+            if current_node:
+                _restore_connections(current_node, node_data['_connections'])
+        except Exception as e:
+            print(f"Error restoring connections for node {node_path}")
+            traceback.print_exc()
+            continue
+
+
+@contextmanager
+def _gc_paused():
+    """Suspends the cyclic garbage collector, which otherwise rescans every node
+    built so far over and over while thousands of them are allocated."""
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+def _bulk_load_nodes(save_data: dict) -> None:
+    from core.undo_manager import UndoManager
+    undo = UndoManager()
+
+    _bulk_create_nodes(save_data, undo)
+    _bulk_restore_connections(save_data, undo)
+
+
+def _bulk_create_nodes(save_data: dict, undo) -> None:
+    sorted_nodes = sorted(save_data["nodes"].items(), key=lambda x: x[0].count('/'))
+    for node_path, node_data in sorted_nodes:
+        if node_data.get("_is_internal", False):
+            continue
+
+        try:
+            node = _bulk_create_node(node_path, node_data, undo)
+            _bulk_apply_node_data(node, node_data)
+
+            if node.type() == NodeType.LOOPER and node._internal_nodes_created:
+                for internal_node in (node._input_node, node._output_node):
+                    internal_data = save_data["nodes"].get(str(internal_node.path()))
+                    if internal_data is not None:
+                        _bulk_apply_node_data(internal_node, internal_data)
+
+        except Exception as e:
+            print(f"Error creating node {node_path}")
+            traceback.print_exc()
+            continue
+
+
+def _bulk_restore_connections(save_data: dict, undo) -> None:
+    nodes = NodeEnvironment.nodes
+    for node_path, node_data in save_data["nodes"].items():
+        input_node = nodes.get(node_path)
+        if input_node is None:
+            continue
+        for conn_data in node_data.get('_connections', ()):
             try:
-                if '_connections' not in node_data:
+                output_node = nodes.get(conn_data["output_node_path"])
+                if output_node is None:
                     continue
-                    
-                current_node = NodeEnvironment.node_from_name(node_path)
-                if current_node:
-                    _restore_connections(current_node, node_data['_connections'])
+                output_idx = int(conn_data["output_index"])
+                if output_idx >= len(output_node.output_names()):
+                    raise ValueError(f"output_index {output_idx} out of range for {output_node.name()}")
+                connection = NodeConnection(output_node, input_node, output_idx, int(conn_data["input_index"]))
+                input_node._inputs[connection.input_index()] = connection
+                output_node._outputs.setdefault(output_idx, []).append(connection)
+                undo.record_connection(connection, connected=True)
             except Exception as e:
-                print(f"Error restoring connections for node {node_path}")
+                print(f"Error restoring connection for node {node_path}: {e}")
                 traceback.print_exc()
+
+
+def _bulk_apply_node_data(node: Node, node_data: dict) -> None:
+    """_apply_node_data for a freshly constructed node.
+
+    Which NODE_ATTRIBUTES are plain attributes is looked up once per node
+    class, and saved values are written into the parms the constructor already
+    made instead of replacing them with new Parm objects.
+    """
+    for attr in _plain_attributes(node):
+        if attr in node_data:
+            value = node_data[attr]
+            if attr in ('_position', '_color') and isinstance(value, list):
+                value = tuple(value)
+            setattr(node, attr, value)
+
+    parms = node._parms
+    for parm_name, parm_data in node_data.get('_parms', {}).items():
+        try:
+            parm = parms.get(parm_name)
+            if parm is None or parm._type.value != parm_data["_type"]:
+                parms[parm_name] = _deserialize_parm(parm_data, node)
                 continue
-        
+            parm._script_callback = parm_data["_script_callback"]
+            parm._value = parm_data["_value"]
+            parm._is_default = parm.is_loaded() and parm._value == parm._default_value
+        except Exception as e:
+            print(f"Error deserializing parm {parm_name}")
+            traceback.print_exc()
+
+
+_PLAIN_ATTRIBUTES: Dict[type, List[str]] = {}
+
+
+def _plain_attributes(node: Node) -> List[str]:
+    attributes = _PLAIN_ATTRIBUTES.get(type(node))
+    if attributes is None:
+        attributes = _PLAIN_ATTRIBUTES[type(node)] = [
+            attr for attr in NODE_ATTRIBUTES if not inspect.ismethod(getattr(node, attr, None))]
+    return attributes
+
+
+def _bulk_create_node(node_path: str, node_data: dict, undo) -> Node:
+    """Constructs and registers a node straight from its saved path.
+
+    Paths in a flowstate are unique and parents are created before their
+    children, so the name uniqueness loop, module lookup and per-node undo
+    entry of Node.create_node are skipped; the creation is still recorded in
+    the load's undo transaction.
+    """
+    node_type = getattr(NodeType, node_data["_node_type"].split('.')[-1].upper())
+    parent_path, _, node_name = node_path.rpartition('/')
+    parent_path = parent_path or '/'
+    if parent_path != '/' and parent_path not in NodeEnvironment.nodes:
+        raise ValueError(f"Parent path '{parent_path}' does not exist.")
+
+    node = _node_class(node_type)(node_name, node_path, node_type)
+    undo.record_create(node)
+    NodeEnvironment.nodes[node_path] = node
+    if hasattr(node.__class__, 'post_registration_init'):
+        node.__class__.post_registration_init(node)
+    return node
+
+
+_NODE_CLASSES: Dict[NodeType, type] = {}
+
+
+def _node_class(node_type: NodeType) -> type:
+    node_class = _NODE_CLASSES.get(node_type)
+    if node_class is None:
+        module = importlib.import_module(f'core.{node_type.value}_node')
+        class_name = ''.join(word.capitalize() for word in node_type.value.split('_'))
+        node_class = _NODE_CLASSES[node_type] = getattr(module, f'{class_name}Node')
+    return node_class
+
+
+def _load_flowstate(filepath: str, bulk: bool) -> None:
+    from core.undo_manager import UndoManager
+
+    if is_archive(filepath):
+        save_data = read_archive(filepath)
+    else:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            save_data = json.load(f)
+
+    env = NodeEnvironment.get_instance()
+    with UndoManager().transaction(f"Load flowstate: {Path(filepath).name}"):
+        UndoManager().record_clear_nodes()
+        NodeEnvironment.nodes.clear()
+
+        if bulk:
+            _bulk_load_nodes(save_data)
+        else:
+            _load_nodes(save_data, env)
+
         try:
             if "globals" in save_data:
                 global_store = GlobalStore()
                 for key, value in save_data["globals"].items():
                     global_store.set(key, value)
-            
+
         except Exception as e:
             print(f"Error restoring state {e}")
             traceback.print_exc()
-        
+
+
+def load_flowstate(filepath: str, bulk: bool = True) -> bool:
+    """Replaces the current network with the one saved at filepath, as a single undo step.
+
+    bulk=False goes through Node.create_node and set_input for every node and
+    connection instead of constructing them directly; it is slower and kept
+    for comparison.
+    """
+    try:
+        with _gc_paused() if bulk else nullcontext():
+            _load_flowstate(filepath, bulk)
         print("💾 Flowstate Loaded 💾 ")
         return True
         
     except Exception as e:
         print(f"Error loading flowstate {e}")
         traceback.print_exc()
-        return False
\ No newline at end of file
+        return False
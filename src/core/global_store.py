@@ -1,5 +1,6 @@
 from typing import Any, Dict
 import warnings
+from core.workspace import current_workspace
 
 
 """
@@ -37,11 +38,20 @@ Methods:
        Example: GlobalStore.flush_all_globals()
 
 All modification methods (set, cut, flush_all_globals) automatically integrate
-with the undo system by pushing the previous state before making changes.
+with the undo system by pushing an undo entry and recording the change.
+
+The stored values belong to the current core.workspace.Workspace.
 """
 
-class GlobalStore:
-    _instance: Dict[str, Any] = {}
+class _GlobalStoreType(type):
+    """Resolves GlobalStore._instance to the globals of the current workspace."""
+
+    @property
+    def _instance(cls) -> Dict[str, Any]:
+        return current_workspace().globals
+
+
+class GlobalStore(metaclass=_GlobalStoreType):
     
     @classmethod
     def _validate_key(cls, key: str) -> None:        
@@ -72,9 +82,11 @@ class GlobalStore:
         # Push state before modifying
         if exists:
             UndoManager().push_state(f"Update global: {key}:{value}")
+            UndoManager().record_global(key, old_value=cls._instance[key], new_value=value)
         else:
             UndoManager().push_state(f"Add global: {key}:{value}")
-            
+            UndoManager().record_global(key, new_value=value)
+
         # Modify after pushing state
         cls._instance[key] = value
 
@@ -86,7 +98,7 @@ class GlobalStore:
         if key in cls._instance:
             # Push state before modifying
             UndoManager().push_state(f"Cut global: {key}")
-            cls._instance.pop(key)
+            UndoManager().record_global(key, old_value=cls._instance.pop(key))
 
     @classmethod
     def flush_all_globals(cls) -> None:
@@ -94,6 +106,8 @@ class GlobalStore:
         
         if cls._instance:
             UndoManager().push_state("Flush all globals")
+            for key, value in cls._instance.items():
+                UndoManager().record_global(key, old_value=value)
             cls._instance.clear()
             
 
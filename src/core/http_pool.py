@@ -0,0 +1,139 @@
+"""Shared, pooled HTTP sessions for talking to LLM backends.
+
+Every backend gets one requests.Session whose adapter keeps connections alive
+between prompts, so a batch of queries pays the TCP handshake once instead of
+once per prompt. Pool size, timeouts and retry/backoff come from the backend's
+section in settings.cfg (falling back to [DEFAULT], then to the values below):
+
+    pool_size = 10          connections kept open per backend host
+    connect_timeout = 5     seconds to establish a connection
+    request_timeout = 300   seconds to wait for a response
+    retries = 2             retries on connection errors and 429/502/503/504
+    retry_backoff = 0.5     backoff factor between retries
+
+Sessions are keyed by backend name and pool settings together, so callers
+that pass different settings for the same backend each get their own session
+and never close one another's mid-request. Sessions are only closed by
+close() and close_all().
+
+Example:
+    >>> session = get_session("Ollama", settings)
+    >>> session.post(url, json=payload, timeout=request_timeout(settings))
+"""
+
+from dataclasses import dataclass
+from threading import Lock
+from typing import Dict, Mapping, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+RETRY_STATUSES = (429, 502, 503, 504)
+
+
+@dataclass(frozen=True)
+class PoolSettings:
+    pool_size: int = 10
+    connect_timeout: float = 5.0
+    request_timeout: float = 300.0
+    retries: int = 2
+    retry_backoff: float = 0.5
+
+    @classmethod
+    def from_settings(cls, settings: Optional[Mapping[str, str]] = None) -> 'PoolSettings':
+        settings = settings or {}
+        defaults = cls()
+
+        def read(name: str, cast):
+            try:
+                return cast(settings.get(name, getattr(defaults, name)))
+            except (TypeError, ValueError):
+                print(f"Warning: Invalid {name} {settings.get(name)!r}, using {getattr(defaults, name)}")
+                return getattr(defaults, name)
+
+        return cls(
+            pool_size=max(1, read("pool_size", int)),
+            connect_timeout=read("connect_timeout", float),
+            request_timeout=read("request_timeout", float),
+            retries=max(0, read("retries", int)),
+            retry_backoff=read("retry_backoff", float),
+        )
+
+    def timeout(self) -> Tuple[float, float]:
+        return self.connect_timeout, self.request_timeout
+
+
+class HTTPSessionPool:
+    _instance = None
+    _lock = Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super(HTTPSessionPool, cls).__new__(cls)
+                    cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self._sessions: Dict[Tuple[str, PoolSettings], requests.Session] = {}
+        self._data_lock = Lock()
+        self._initialized = True
+
+    def session(self, name: str, pool_settings: Optional[PoolSettings] = None) -> requests.Session:
+        key = (name, pool_settings or PoolSettings())
+        with self._data_lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = self._create_session(key[1])
+                self._sessions[key] = session
+            return session
+
+    def close(self, name: str) -> None:
+        """Closes every session of the named backend; only call it once no request is using them."""
+        with self._data_lock:
+            keys = [key for key in self._sessions if key[0] == name]
+            sessions = [self._sessions.pop(key) for key in keys]
+        for session in sessions:
+            session.close()
+
+    def close_all(self) -> None:
+        with self._data_lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+    def _create_session(self, pool_settings: PoolSettings) -> requests.Session:
+        retry = Retry(
+            total=pool_settings.retries,
+            connect=pool_settings.retries,
+            read=0,
+            status=pool_settings.retries,
+            backoff_factor=pool_settings.retry_backoff,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset({"GET", "POST"}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_settings.pool_size,
+            pool_maxsize=pool_settings.pool_size,
+            max_retries=retry,
+        )
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+
+def get_session(name: str, settings: Optional[Mapping[str, str]] = None) -> requests.Session:
+    return HTTPSessionPool().session(name, PoolSettings.from_settings(settings))
+
+
+def request_timeout(settings: Optional[Mapping[str, str]] = None) -> Tuple[float, float]:
+    return PoolSettings.from_settings(settings).timeout()
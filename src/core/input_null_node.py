@@ -1,4 +1,3 @@
-import hashlib
 import time
 import os
 from typing import List, Dict, Any, Optional
@@ -14,7 +13,7 @@ class InputNullNode(Node):
     It retrieves the input value of another node specified by the in_node parameter.
 
     Attributes:
-        _input_hash (str): Hash of the last processed input.
+        _input_hash (int): Fingerprint of the last processed input.
         _last_input_size (int): Size of the last processed input.
     Parameters:
         in_node (STRING) : path to the node
@@ -85,11 +84,13 @@ class InputNullNode(Node):
                 if(self._parms["feedback_mode"].eval() is True and loopnumber > 1):
                     parent_looper_name = os.path.dirname(self.path())
                     parent_looper = NodeEnvironment.node_from_name(parent_looper_name)
-                    input_data = parent_looper._output_node._parms["out_data"].eval()
+                    input_data = parent_looper._output_node.accumulated_data()
 
                 self._parms["in_data"].set(input_data)
                 self._output = input_data
 
+            self._input_hash = in_node.input_fingerprint()
+
             self.set_state(NodeState.COOKED)
 
         except Exception as e:
@@ -104,6 +105,9 @@ class InputNullNode(Node):
         if super().needs_to_cook():
             return True
 
+        if self._parms["feedback_mode"].eval():
+            return True
+
         try:
             in_node_path = self._parms["in_node"].eval()
             in_node = NodeEnvironment.nodes.get(in_node_path)
@@ -111,27 +115,15 @@ class InputNullNode(Node):
             if not in_node or not in_node.inputs():
                 return True
 
-            current_input = in_node.inputs()[0].output_node().eval()
-            current_size = sum(len(s.encode('utf-8')) for s in current_input)
-
-            if current_size != self._last_input_size:
+            source_node = in_node.inputs()[0].output_node()
+            if source_node.needs_to_cook():
                 return True
 
-            if current_size < 10 * 1024 * 1024:  # 10MB
-                return True
-
-            current_hash = self._calculate_hash(str(current_input))
-            if current_hash != self._input_hash:
-                return True
-
-            return False
+            return in_node.input_fingerprint() != self._input_hash
 
         except Exception:
             return True
 
-    def _calculate_hash(self, content: str) -> str:
-        return hashlib.md5(content.encode()).hexdigest()
-
     def input_names(self) -> Dict[int, str]:
         return {}  # This node has no inputs
 
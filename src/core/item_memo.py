@@ -0,0 +1,76 @@
+"""Per-item memoization for nodes that map a function over a List[str].
+
+Item-wise nodes (StringTransformNode, SearchNode, ChunkNode) produce each
+output from one input item and the node's parameters alone. ItemMemo
+remembers those per-item results, keyed by the node's parameter hash and the
+item's content, so a cook only reprocesses items that are new or changed;
+everything else is served from a bounded least-recently-used store.
+
+Example:
+    >>> memo = ItemMemo(max_entries=1000)
+    >>> memo.map(["a", "b"], param_hash, str.upper)
+    ['A', 'B']
+    >>> memo.map(["a", "c"], param_hash, str.upper)
+    ['A', 'C']
+    >>> memo.stats()["last_hits"]
+    1
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Sequence, Tuple
+
+
+DEFAULT_MAX_ENTRIES = 10000
+
+
+class ItemMemo:
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[Hashable, str], Any]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._last_hits = 0
+        self._last_misses = 0
+
+    def map(self, items: Sequence[str], param_hash: Hashable, fn: Callable[[str], Any]) -> List[Any]:
+        """Returns [fn(item) for item in items], reusing results remembered for param_hash."""
+        results: List[Any] = []
+        hits = misses = 0
+        entries = self._entries
+        for item in items:
+            key = (param_hash, item)
+            if key in entries:
+                entries.move_to_end(key)
+                results.append(entries[key])
+                hits += 1
+                continue
+            value = fn(item)
+            entries[key] = value
+            results.append(value)
+            misses += 1
+            if len(entries) > self._max_entries:
+                entries.popitem(last=False)
+
+        self._last_hits, self._last_misses = hits, misses
+        self._hits += hits
+        self._misses += misses
+        return results
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._hits = self._misses = 0
+        self._last_hits = self._last_misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        total = self._hits + self._misses
+        last_total = self._last_hits + self._last_misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self._max_entries,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_ratio": self._hits / total if total else 0.0,
+            "last_hits": self._last_hits,
+            "last_misses": self._last_misses,
+            "last_hit_ratio": self._last_hits / last_total if last_total else 0.0,
+        }
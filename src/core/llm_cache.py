@@ -0,0 +1,230 @@
+"""Persistent, content-addressed cache for LLM responses.
+
+Responses are stored in a SQLite database under the user cache directory
+(``$XDG_CACHE_HOME/textloom`` or ``~/.cache/textloom``; override with the
+``TLOOM_LLM_CACHE_DIR`` environment variable). Entries are keyed by a hash of
+the backend name, the request settings that shape the answer and the prompt,
+expire after a TTL, and are evicted least-recently-used once the cache grows
+past its size budget.
+
+Each thread keeps its own connection to the database, and the table is created
+once per database file, so concurrent queries read and write the cache without
+waiting on each other; SQLite's own locking keeps their writes consistent. A
+failing cache only prints a warning: reads become misses and writes are dropped.
+
+Cache modes, as chosen per QueryNode:
+    cache_first: Return a stored response when there is one, otherwise query and store
+    refresh: Always query, then overwrite the stored response
+    bypass: Neither read nor write the cache
+
+Example:
+    >>> cache = get_llm_cache()
+    >>> key = cache.make_key("generate", "Ollama", settings, "Hello")
+    >>> cache.put(key, {"response": "Hi"})
+    >>> cache.get(key)
+    {'response': 'Hi'}
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import threading
+from contextlib import contextmanager
+from threading import Lock
+from typing import Any, Dict, Iterator, Optional, Set
+
+
+CACHE_FIRST = "cache_first"
+REFRESH = "refresh"
+BYPASS = "bypass"
+CACHE_MODES = (CACHE_FIRST, REFRESH, BYPASS)
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+KEY_SETTINGS = (
+    "url", "endpoint", "model", "provider", "temperature",
+    "max_tokens", "stream", "system_message", "payload_structure",
+)
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS responses ("
+    "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+    "created REAL NOT NULL, accessed REAL NOT NULL)"
+)
+
+
+def default_cache_dir() -> str:
+    override = os.environ.get("TLOOM_LLM_CACHE_DIR")
+    if override:
+        return override
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "textloom")
+
+
+class LLMResponseCache:
+    _instance = None
+    _lock = Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super(LLMResponseCache, cls).__new__(cls)
+                    cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self._state_lock = Lock()
+        self._local = threading.local()
+        self._schema_paths: Set[str] = set()
+        self._path: Optional[str] = None
+        self._ttl_seconds = DEFAULT_TTL_SECONDS
+        self._max_bytes = DEFAULT_MAX_BYTES
+        self._hits = 0
+        self._misses = 0
+        self._initialized = True
+
+    def configure(self, cache_dir: Optional[str] = None, ttl_seconds: Optional[float] = None,
+                  max_bytes: Optional[int] = None) -> None:
+        with self._state_lock:
+            if cache_dir is not None:
+                self._path = os.path.join(cache_dir, "llm_responses.sqlite3")
+            if ttl_seconds is not None:
+                self._ttl_seconds = ttl_seconds
+            if max_bytes is not None:
+                self._max_bytes = max_bytes
+
+    def path(self) -> str:
+        if self._path is None:
+            self._path = os.path.join(default_cache_dir(), "llm_responses.sqlite3")
+        return self._path
+
+    def make_key(self, kind: str, active_llm: str, settings: Dict[str, Any], prompt: str) -> str:
+        relevant = {name: str(settings.get(name, "")) for name in KEY_SETTINGS}
+        material = json.dumps(
+            {"kind": kind, "llm": active_llm, "settings": relevant,
+             "prompt": hashlib.sha256(prompt.encode("utf-8")).hexdigest()},
+            sort_keys=True,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        try:
+            with self._transaction() as conn:
+                row = conn.execute(
+                    "SELECT value, created FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and now - row[1] > self._ttl_seconds:
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    row = None
+                elif row is not None:
+                    conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        except sqlite3.Error as e:
+            print(f"Warning: LLM cache read failed: {e}")
+            row = None
+        with self._state_lock:
+            if row is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, value: Any) -> None:
+        data = json.dumps(value)
+        now = time.time()
+        try:
+            with self._transaction() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, size, created, accessed) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, data, len(data.encode("utf-8")), now, now),
+                )
+                self._evict(conn, now)
+        except sqlite3.Error as e:
+            print(f"Warning: LLM cache write failed: {e}")
+
+    def clear(self) -> None:
+        try:
+            with self._transaction() as conn:
+                conn.execute("DELETE FROM responses")
+        except sqlite3.Error as e:
+            print(f"Warning: LLM cache clear failed: {e}")
+        with self._state_lock:
+            self._hits = 0
+            self._misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        try:
+            with self._transaction() as conn:
+                entries, size = conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"Warning: LLM cache stats failed: {e}")
+            entries, size = 0, 0
+        with self._state_lock:
+            return {
+                "path": self.path(),
+                "entries": entries,
+                "bytes": size,
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """This thread's connection, committing on success and rolling back on error."""
+        conn = self._connection()
+        with conn:
+            yield conn
+
+    def _connection(self) -> sqlite3.Connection:
+        """This thread's connection to the current database, opened on first use."""
+        path = self.path()
+        local = self._local
+        if getattr(local, "path", None) == path:
+            return local.conn
+        if getattr(local, "conn", None) is not None:
+            local.conn.close()
+            local.conn = local.path = None
+
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        except OSError as e:
+            raise sqlite3.OperationalError(f"cannot create {os.path.dirname(path)}: {e}") from e
+        conn = sqlite3.connect(path, timeout=5)
+        try:
+            with self._state_lock:
+                if path not in self._schema_paths:
+                    with conn:
+                        conn.execute(SCHEMA)
+                    self._schema_paths.add(path)
+        except sqlite3.Error:
+            conn.close()
+            raise
+        local.conn, local.path = conn, path
+        return conn
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        conn.execute("DELETE FROM responses WHERE created < ?", (now - self._ttl_seconds,))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self._max_bytes:
+            return
+        for key, size in conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed ASC"
+        ).fetchall():
+            if total <= self._max_bytes:
+                break
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+
+
+def get_llm_cache() -> LLMResponseCache:
+    return LLMResponseCache()
@@ -0,0 +1,205 @@
+"""Cached, parsed LLM configuration for Text Loom.
+
+settings.cfg is parsed once and kept in memory until the file's modification
+time or size changes, so per-prompt code paths no longer re-open and re-parse
+the file. Each backend section is turned into an LLMBackend descriptor with
+its merged settings, request URL, response key and a precompiled payload
+template, ready to be handed to the query functions in core.llm_utils.
+
+Example:
+    >>> service = get_llm_config()
+    >>> backend = service.backend()          # the active_llm from [DEFAULT]
+    >>> backend.full_url
+    'http://localhost:11434/api/generate'
+    >>> backend.build_payload("Hello")
+    {'model': 'llama3:latest', 'prompt': 'Hello', 'stream': 'False'}
+"""
+
+import ast
+import configparser
+import os
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any, Dict, Optional, Tuple
+
+
+DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'settings.cfg')
+
+_PROMPT = object()
+
+# Setting names a payload_structure may refer to; one a backend leaves unset is sent as ""
+PAYLOAD_PLACEHOLDERS = frozenset({
+    "model", "stream", "system_message", "max_tokens", "temperature", "top_p", "stop",
+})
+
+
+def compile_payload_template(payload_structure: str, settings: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Parses a payload_structure string once and resolves every setting reference in it.
+    Placeholders from PAYLOAD_PLACEHOLDERS that settings leaves unset become "".
+    Any other string that names no setting (such as a chat role) is kept as a literal.
+    Only the prompt slots are left open; fill them with render_payload_template().
+    """
+    try:
+        structure = ast.literal_eval(payload_structure or "{}")
+    except (ValueError, SyntaxError) as e:
+        print(f"Warning: Invalid payload_structure {payload_structure!r}: {e}")
+        return {}
+    if not isinstance(structure, dict):
+        return {}
+
+    def resolve(value: str) -> Any:
+        if value == "prompt":
+            return _PROMPT
+        if value in settings:
+            return settings[value]
+        return "" if value in PAYLOAD_PLACEHOLDERS else value
+
+    template: Dict[str, Any] = {}
+    for key, value in structure.items():
+        if isinstance(value, str):
+            template[key] = resolve(value)
+        elif isinstance(value, list):
+            template[key] = [
+                {sub_key: resolve(sub_value) for sub_key, sub_value in item.items()}
+                for item in value
+                if isinstance(item, dict)
+            ]
+    return template
+
+
+def render_payload_template(template: Dict[str, Any], prompt: str) -> Dict[str, Any]:
+    payload: Dict[str, Any] = {}
+    for key, value in template.items():
+        if isinstance(value, list):
+            payload[key] = [
+                {sub_key: prompt if sub_value is _PROMPT else sub_value
+                 for sub_key, sub_value in item.items()}
+                for item in value
+            ]
+        else:
+            payload[key] = prompt if value is _PROMPT else value
+    return payload
+
+
+@dataclass(frozen=True)
+class LLMBackend:
+    """Everything needed to query one configured LLM backend."""
+    name: str
+    settings: Dict[str, str]
+    config: Any = field(repr=False, compare=False)
+    full_url: str = ""
+    response_key: str = ""
+    payload_template: Dict[str, Any] = field(default_factory=dict, repr=False)
+
+    def build_payload(self, prompt: str) -> Dict[str, Any]:
+        return render_payload_template(self.payload_template, prompt)
+
+
+class LLMConfigService:
+    _instance = None
+    _lock = Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super(LLMConfigService, cls).__new__(cls)
+                    cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self._data_lock = Lock()
+        self._configs: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+        self._backends: Dict[Tuple[str, str], LLMBackend] = {}
+        self._templates: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], Dict[str, Any]] = {}
+        self._initialized = True
+
+    def config(self, file_path: Optional[str] = None) -> Any:
+        """Returns the parsed ConfigParser for file_path, or {} if it cannot be read."""
+        path = os.path.abspath(file_path or DEFAULT_CONFIG_PATH)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            print(f"Error: Config file not found at {path}")
+            return {}
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        with self._data_lock:
+            cached = self._configs.get(path)
+            if cached is not None and cached[0] == signature:
+                return cached[1]
+
+            config = configparser.ConfigParser()
+            print(f"Reading config from: {path}")
+            try:
+                with open(path, 'r') as f:
+                    config.read_file(f)
+            except Exception as e:
+                print(f"Error reading config file: {e}")
+                return {}
+            if not config.sections():
+                print("Warning: No sections found in the config file.")
+
+            self._configs[path] = (signature, config)
+            self._backends = {key: backend for key, backend in self._backends.items() if key[0] != path}
+            return config
+
+    def active_llm(self, file_path: Optional[str] = None) -> Optional[str]:
+        config = self.config(file_path)
+        try:
+            return config['DEFAULT']['active_llm']
+        except KeyError:
+            print("No active_llm found in the DEFAULT section of the config file.")
+            return None
+
+    def backend(self, name: Optional[str] = None, file_path: Optional[str] = None) -> Optional[LLMBackend]:
+        """Returns the descriptor for the named backend, or for active_llm when name is None."""
+        config = self.config(file_path)
+        name = name or self.active_llm(file_path)
+        if not name or name not in config:
+            return None
+
+        key = (os.path.abspath(file_path or DEFAULT_CONFIG_PATH), name)
+        with self._data_lock:
+            backend = self._backends.get(key)
+            if backend is not None and backend.config is config:
+                return backend
+
+        settings = {**config["DEFAULT"], **config[name]}
+        backend = LLMBackend(
+            name=name,
+            settings=settings,
+            config=config,
+            full_url=f"{settings.get('url', '')}{settings.get('endpoint', '')}",
+            response_key=settings.get("response_key", ""),
+            payload_template=self.payload_template(settings),
+        )
+        with self._data_lock:
+            self._backends[key] = backend
+        return backend
+
+    def payload_template(self, settings: Dict[str, str]) -> Dict[str, Any]:
+        """Compiled payload template for settings, memoized on the settings it depends on."""
+        structure = settings.get("payload_structure", "{}")
+        key = (structure, tuple(sorted(settings.items())))
+        with self._data_lock:
+            template = self._templates.get(key)
+        if template is None:
+            template = compile_payload_template(structure, settings)
+            with self._data_lock:
+                self._templates[key] = template
+        return template
+
+    def invalidate(self) -> None:
+        with self._data_lock:
+            self._configs.clear()
+            self._backends.clear()
+            self._templates.clear()
+
+
+def get_llm_config() -> LLMConfigService:
+    return LLMConfigService()
@@ -1,12 +1,17 @@
-import configparser
-from typing import Optional, Tuple
+import json
+from typing import Callable, Iterator, Optional, Tuple
 
 import requests
-import os
 
 from core.text_utils import parse_list
 from core.findLLM import get_active_llm_from_config
 from core.models import TokenUsage, LLMResponse
+from core.llm_cache import get_llm_cache, BYPASS, REFRESH
+from core.llm_config import get_llm_config, render_payload_template, LLMBackend
+from core.http_pool import get_session, request_timeout
+from TUI.logging_config import get_logger
+
+logger = get_logger('llm', level=2)
 
 
 """
@@ -20,17 +25,32 @@ from core.models import TokenUsage, LLMResponse
     load_config(file_path): Loads LLM configuration from settings.cfg
         Example: config = load_config()
         Default location: script_directory/settings.cfg
+        The parsed file is cached by core.llm_config and re-read only when it changes
 
-    check_llm(name, url, endpoint): Validates LLM server availability
+    check_llm(name, url, endpoint, settings): Validates LLM server availability
         Example: status = check_llm('mistral', 'http://localhost:8000', '/health')
 
     query_llm(prompt, active_llm, config): Sends prompts to the active LLM
         Example: response = query_llm("Hello world", "mistral", config)
         Handles request formatting based on configuration settings
+        Requests go through the keep-alive session pool in core.http_pool
         
     get_clean_llm_response(prompt): Simplified interface for LLM queries
         Example: response = get_clean_llm_response("Summarize this text")
         Handles configuration loading and response parsing automatically
+        Pass backend=get_llm_config().backend() to skip the configuration lookup entirely
+
+    stream_llm(prompt, active_llm, config): Streams a response as it is generated
+        Example: for text, usage in stream_llm("Tell a story", "Ollama"): print(text, end="")
+        Understands Ollama-style NDJSON and OpenAI-style SSE bodies
+
+    get_streamed_llm_response(prompt, on_chunk): Streams, reporting each chunk to on_chunk
+        Example: response = get_streamed_llm_response("Tell a story", on_chunk=print)
+        Returns the assembled LLMResponse once the stream ends
+
+    Response caching: every query function takes a cache_mode of "cache_first",
+    "refresh" or "bypass" (the default), backed by the on-disk cache in core.llm_cache.
+        Example: response = get_clean_llm_response("Summarize this text", cache_mode="cache_first")
 
     Configuration Format:
     [DEFAULT]
@@ -47,43 +67,16 @@ from core.models import TokenUsage, LLMResponse
 """
 
 def load_config(file_path=None):
-    if file_path is None:
-        # Get the directory of the current script (findLLM.py)
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        # Construct the path to settings.cfg relative to the script
-        file_path = os.path.join(script_dir, 'settings.cfg')
-
-    config = configparser.ConfigParser()
-    
-    print(f"Attempting to read config from: {os.path.abspath(file_path)}")
-    
-    if not os.path.exists(file_path):
-        print(f"Error: Config file not found at {file_path}")
-        return {}
-
-    try:
-        with open(file_path, 'r') as f:
-            config.read_file(f)
-    except Exception as e:
-        print(f"Error reading config file: {e}")
-        return {}
-
-    sections = config.sections()
-    print(f"Sections found in config: {sections}")
-
-    if not sections:
-        print("Warning: No sections found in the config file.")
+    # Parsed once and re-read only when settings.cfg changes on disk
+    return get_llm_config().config(file_path)
 
-    config_dict = {section: dict(config[section]) for section in sections}
-    
-    return config
 
-
-def check_llm(name, url, endpoint):
+def check_llm(name, url, endpoint, settings=None):
     try:
         full_url = f"{url}{endpoint}"
         print(f"Checking {name} at {full_url}")
-        response = requests.get(full_url, timeout=2)
+        # Same settings as query_llm, so the check reuses the backend's keep-alive session
+        response = get_session(name, settings).get(full_url, timeout=2)
         if response.status_code == 200:
             print(f"{name} is available")
             return name
@@ -95,42 +88,22 @@ def check_llm(name, url, endpoint):
 
 
 def build_payload(prompt, settings):
-    payload = {}
-    payload_structure = eval(settings.get("payload_structure", "{}"))
-
-    for key, value in payload_structure.items():
-        if isinstance(value, str):
-            payload[key] = prompt if value == "prompt" else settings.get(value, "")
-        elif isinstance(value, list):
-            payload[key] = [
-                {
-                    sub_key: (
-                        prompt if sub_value == "prompt" else settings.get(sub_value, "")
-                    )
-                    for sub_key, sub_value in item.items()
-                }
-                for item in value
-                if isinstance(item, dict)
-            ]
-    return payload
-
-
-def query_llm(prompt, active_llm, config=None):
+    template = get_llm_config().payload_template(dict(settings))
+    return render_payload_template(template, prompt)
+
+
+def query_llm(prompt, active_llm, config=None, cache_mode=BYPASS):
     config = config or load_config()
 
     if not active_llm:
         print("Error: No active LLM specified")
         return None
 
-    # print(f"Active LLM: {active_llm}")
-    # print(f"Config Sections: {config.sections()}")
-
     if active_llm not in config:
         print(f"Error: {active_llm} not found in config")
         return None
 
     settings = {**config["DEFAULT"], **config[active_llm]}
-    #print(f"Settings: {settings}")
 
     url = settings["url"]
     endpoint = settings.get("endpoint", "")
@@ -143,15 +116,25 @@ def query_llm(prompt, active_llm, config=None):
         "stream": settings.get("stream", "false").lower() == "true",
     }
 
-    print(f"URL: {full_url}")
-    print(f"Payload: {payload}")
+    cache = get_llm_cache()
+    cache_key = cache.make_key("generate", active_llm, settings, prompt)
+    if cache_mode not in (BYPASS, REFRESH):
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    # Arguments rather than f-strings, so nothing is formatted unless a handler writes the record
+    logger.debug("query_llm: POST %s payload %s", full_url, payload)
 
     try:
-        response = requests.post(full_url, json=payload, headers=headers)
+        session = get_session(active_llm, settings)
+        response = session.post(full_url, json=payload, headers=headers, timeout=request_timeout(settings))
         response.raise_for_status()
-        print(f"Response status code: {response.status_code}")
-        print(f"Response content text: {response.text}")
-        return response.json()
+        logger.debug("query_llm: %s returned %s: %s", active_llm, response.status_code, response.text)
+        result = response.json()
+        if cache_mode != BYPASS:
+            cache.put(cache_key, result)
+        return result
     except requests.RequestException as e:
         print(f"Error querying {active_llm}: {e}")
         if e.response:
@@ -173,19 +156,25 @@ def extract_response(response, response_key):
 
 
 def get_response(response, active_llm, config=None):
-    config = config or load_config()
-    settings = {**config["DEFAULT"], **config[active_llm]}
-    response_key = settings.get("response_key", "")
+    if config is None:
+        backend = get_llm_config().backend(active_llm)
+        response_key = backend.response_key if backend else ""
+    else:
+        settings = {**config["DEFAULT"], **config[active_llm]}
+        response_key = settings.get("response_key", "")
     return extract_response(response, response_key)
 
 
-def get_clean_llm_response(prompt):
+def get_clean_llm_response(prompt, cache_mode=BYPASS, backend: Optional[LLMBackend] = None):
     # raw response
-    config = load_config()
-    active_llm = get_active_llm_from_config()
+    if backend is not None:
+        config, active_llm = backend.config, backend.name
+    else:
+        config = load_config()
+        active_llm = get_active_llm_from_config()
 
     if active_llm:
-        response = query_llm(prompt, active_llm, config)
+        response = query_llm(prompt, active_llm, config, cache_mode=cache_mode)
         if response:
             content = get_response(response, active_llm, config)
             return content  # only if it's a NOT list item, aka a Riff!
@@ -193,7 +182,15 @@ def get_clean_llm_response(prompt):
     return "Error: No active Local LLM found"
 
 
-def query_llm_with_tokens(prompt: str, active_llm: str, config=None) -> Tuple[Optional[str], Optional[TokenUsage]]:
+def query_llm_with_tokens(prompt: str, active_llm: str, config=None,
+                          cache_mode: str = BYPASS) -> Tuple[Optional[str], Optional[TokenUsage]]:
+    """
+    Queries active_llm through LiteLLM and returns (content, token_usage).
+    The usage is stored in the response cache with the content. A cache hit
+    returns it with cached=True: those are the tokens the original query
+    used, and none were spent on this call. token_usage is None when the
+    backend reported no usage.
+    """
     config = config or load_config()
 
     if not active_llm:
@@ -212,6 +209,13 @@ def query_llm_with_tokens(prompt: str, active_llm: str, config=None) -> Tuple[Op
 
     api_base = settings.get("url", "http://localhost:11434")
 
+    cache = get_llm_cache()
+    cache_key = cache.make_key("completion", active_llm, settings, prompt)
+    if cache_mode not in (BYPASS, REFRESH):
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached["content"], _cached_token_usage(cached)
+
     try:
         import litellm
         response = litellm.completion(
@@ -242,6 +246,11 @@ def query_llm_with_tokens(prompt: str, active_llm: str, config=None) -> Tuple[Op
                 print(f"Warning: Failed to parse token usage from LLM response: {e}")
                 token_usage = None
 
+        if cache_mode != BYPASS and content is not None:
+            cache.put(cache_key, {
+                "content": content,
+                "token_usage": token_usage.to_dict() if token_usage else None,
+            })
         return content, token_usage
 
     except Exception as e:
@@ -249,9 +258,19 @@ def query_llm_with_tokens(prompt: str, active_llm: str, config=None) -> Tuple[Op
         return None, None
 
 
-def get_clean_llm_response_with_tokens(prompt: str) -> LLMResponse:
-    config = load_config()
-    active_llm = get_active_llm_from_config()
+def _cached_token_usage(cached: dict) -> Optional[TokenUsage]:
+    """The usage stored with a cached response, marked cached; None if none was stored."""
+    usage = cached.get("token_usage")
+    return TokenUsage(**{**usage, "cached": True}) if usage else None
+
+
+def get_clean_llm_response_with_tokens(prompt: str, cache_mode: str = BYPASS,
+                                       backend: Optional[LLMBackend] = None) -> LLMResponse:
+    if backend is not None:
+        config, active_llm = backend.config, backend.name
+    else:
+        config = load_config()
+        active_llm = get_active_llm_from_config()
 
     if not active_llm:
         return LLMResponse(
@@ -259,7 +278,7 @@ def get_clean_llm_response_with_tokens(prompt: str) -> LLMResponse:
             token_usage=None
         )
 
-    content, token_usage = query_llm_with_tokens(prompt, active_llm, config)
+    content, token_usage = query_llm_with_tokens(prompt, active_llm, config, cache_mode=cache_mode)
 
     if content is None:
         return LLMResponse(
@@ -269,3 +288,122 @@ def get_clean_llm_response_with_tokens(prompt: str) -> LLMResponse:
 
     return LLMResponse(content=content, token_usage=token_usage)
 
+
+
+def _usage_from_counts(prompt_tokens, completion_tokens, total_tokens=None) -> Optional[TokenUsage]:
+    try:
+        input_tokens = int(prompt_tokens or 0)
+        output_tokens = int(completion_tokens or 0)
+        total = int(total_tokens) if total_tokens is not None else input_tokens + output_tokens
+        return TokenUsage(input_tokens=input_tokens, output_tokens=output_tokens, total_tokens=total)
+    except (ValueError, TypeError) as e:
+        print(f"Warning: Failed to parse token usage from LLM stream: {e}")
+        return None
+
+
+def parse_stream_line(line: str) -> Tuple[Optional[str], Optional[TokenUsage], bool]:
+    """
+    Parses one line of a streamed LLM body into (text, token_usage, done).
+    Handles Ollama-style NDJSON objects and OpenAI-style SSE "data:" events.
+    """
+    line = line.strip()
+    if not line or line.startswith(":") or line.startswith("event:"):
+        return None, None, False
+
+    if line.startswith("data:"):
+        data = line[len("data:"):].strip()
+        if data == "[DONE]":
+            return None, None, True
+        event = json.loads(data)
+        choices = event.get("choices") or [{}]
+        choice = choices[0]
+        text = (choice.get("delta") or {}).get("content") or choice.get("text")
+        usage = event.get("usage")
+        token_usage = None
+        if usage:
+            token_usage = _usage_from_counts(usage.get("prompt_tokens"), usage.get("completion_tokens"),
+                                             usage.get("total_tokens"))
+        return text, token_usage, False
+
+    event = json.loads(line)
+    text = event.get("response")
+    if text is None:
+        text = (event.get("message") or {}).get("content")
+    done = bool(event.get("done", False))
+    token_usage = None
+    if done and ("prompt_eval_count" in event or "eval_count" in event):
+        token_usage = _usage_from_counts(event.get("prompt_eval_count"), event.get("eval_count"))
+    return text, token_usage, done
+
+
+def stream_llm(prompt: str, active_llm: str, config=None) -> Iterator[Tuple[str, Optional[TokenUsage]]]:
+    """
+    Sends prompt with streaming enabled and yields (text, token_usage) pairs as they arrive.
+    token_usage is only set on the pair that carries the backend's usage report.
+    """
+    config = config or load_config()
+    if not active_llm or active_llm not in config:
+        raise ValueError(f"LLM '{active_llm}' not found in config")
+
+    settings = {**config["DEFAULT"], **config[active_llm]}
+    full_url = f"{settings['url']}{settings.get('endpoint', '')}"
+    if settings.get("payload_structure"):
+        payload = build_payload(prompt, settings)
+    else:
+        payload = {"model": settings.get("model", "mistral:latest"), "prompt": prompt}
+    payload["stream"] = True
+
+    session = get_session(active_llm, settings)
+    with session.post(full_url, json=payload, headers={"Content-Type": "application/json"},
+                      timeout=request_timeout(settings), stream=True) as response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            text, token_usage, done = parse_stream_line(line.decode("utf-8") if line else "")
+            if text or token_usage:
+                yield text or "", token_usage
+            if done:
+                break
+
+
+def get_streamed_llm_response(prompt: str, on_chunk: Optional[Callable[[str], None]] = None,
+                              cache_mode: str = BYPASS, backend: Optional[LLMBackend] = None) -> LLMResponse:
+    if backend is not None:
+        config, active_llm = backend.config, backend.name
+    else:
+        config = load_config()
+        active_llm = get_active_llm_from_config()
+
+    if not active_llm:
+        return LLMResponse(content="Error: No active Local LLM found", token_usage=None)
+
+    settings = {**config["DEFAULT"], **config[active_llm]} if active_llm in config else {}
+    cache = get_llm_cache()
+    cache_key = cache.make_key("stream", active_llm, settings, prompt)
+    if cache_mode not in (BYPASS, REFRESH):
+        cached = cache.get(cache_key)
+        if cached is not None:
+            if on_chunk:
+                on_chunk(cached["content"])
+            return LLMResponse(content=cached["content"], token_usage=_cached_token_usage(cached))
+
+    parts = []
+    token_usage = None
+    try:
+        for text, usage in stream_llm(prompt, active_llm, config):
+            if text:
+                parts.append(text)
+                if on_chunk:
+                    on_chunk(text)
+            if usage:
+                token_usage = usage
+    except (requests.RequestException, ValueError) as e:
+        print(f"Error streaming from {active_llm}: {e}")
+        return LLMResponse(content="Error: Failed to get a response from the LLM", token_usage=None)
+
+    content = "".join(parts)
+    if cache_mode != BYPASS:
+        cache.put(cache_key, {
+            "content": content,
+            "token_usage": token_usage.to_dict() if token_usage else None,
+        })
+    return LLMResponse(content=content, token_usage=token_usage)
@@ -0,0 +1,149 @@
+"""Append-only store for the results a LooperNode collects across iterations.
+
+OutputNullNode used to grow its out_data parm by reading the whole list,
+extending it and setting it back on every iteration, which copies everything
+collected so far each time and pushes an undo entry per iteration. A
+LoopAccumulator only ever appends, and it keeps a running count of the bytes
+it holds. Once that count passes its budget (the looper's data_limit parm), the items
+collected so far are written to a temporary file and every later item goes
+straight to the file, so memory stays bounded however many iterations run.
+
+Reading is streaming: iterating an accumulator yields its items in order,
+from the file first and then from memory. as_payload() hands the contents to
+a parm as a LazyPayload, so a spilled result is only turned back into a list
+if something actually reads the parm. Every parm given the payload shares
+one object, which reads the file line by line the first time any of them is
+read and then hands all of them the same list. That list does hold the whole
+result: a downstream node that reads the parm, or its looper's get_output(),
+gets everything in memory at once. Only iterating the accumulator (see
+LooperNode.iter_output) stays bounded. fingerprint() is kept up to date as
+items are appended, so a looper whose result was spilled still publishes an
+output fingerprint (see core.fingerprint) without reading the file back.
+
+Example:
+    >>> accumulator = LoopAccumulator(budget_bytes=1024)
+    >>> accumulator.extend(["first", "second"])
+    >>> list(accumulator)
+    ['first', 'second']
+"""
+
+import json
+import os
+import tempfile
+import weakref
+from typing import IO, Iterable, Iterator, List, Optional
+
+from core.flowstate_archive import LazyPayload
+
+PAYLOAD_MEMBER = "items"
+
+
+class LoopAccumulator:
+    """Collects strings in memory up to budget_bytes, then on disk."""
+
+    def __init__(self, budget_bytes: int):
+        self.budget_bytes = budget_bytes
+        self._items: List[str] = []
+        self._count = 0
+        self._memory_bytes = 0
+        self._fingerprint = 0
+        self._spill: Optional[IO[bytes]] = None
+        self._payload: Optional['weakref.ReferenceType[SpilledPayload]'] = None
+
+    def extend(self, items: Iterable[str]) -> int:
+        """Appends items and returns how many were added."""
+        added = 0
+        for item in items:
+            self._fingerprint = hash((self._fingerprint, item))
+            if self._spill is not None:
+                self._spill.write(json.dumps(item).encode('utf-8') + b'\n')
+            else:
+                self._items.append(item)
+                self._memory_bytes += len(item.encode('utf-8'))
+            added += 1
+        self._count += added
+        if self._spill is None and self._memory_bytes > self.budget_bytes:
+            self._spill_to_disk()
+        return added
+
+    def _spill_to_disk(self) -> None:
+        self._spill = tempfile.NamedTemporaryFile(prefix="tloom_loop_", suffix=".jsonl", delete=False)
+        self._cleanup = weakref.finalize(self, _remove_spill, self._spill)
+        self._spill.writelines(json.dumps(item).encode('utf-8') + b'\n' for item in self._items)
+        self._items = []
+        self._memory_bytes = 0
+
+    @property
+    def spilled(self) -> bool:
+        return self._spill is not None
+
+    @property
+    def memory_bytes(self) -> int:
+        return self._memory_bytes
+
+    def fingerprint(self) -> int:
+        """Fingerprint of every item appended so far, in order; like core.fingerprint, never persist it."""
+        return hash((self._count, self._fingerprint))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[str]:
+        items, count = self._items, len(self._items)
+        if self._spill is not None:
+            self._spill.flush()
+            # A separate handle, so reading never moves the position appends are written at
+            with open(self._spill.name, 'rb') as reader:
+                for line in reader:
+                    yield json.loads(line)
+        for index in range(count):
+            yield items[index]
+
+    def to_list(self) -> List[str]:
+        return list(self)
+
+    def read(self, member: str) -> bytes:
+        """JSON array of every item, in the form LazyPayload expects from an archive member."""
+        lines = [json.dumps(item).encode('utf-8') for item in self._items]
+        if self._spill is not None:
+            self._spill.flush()
+            with open(self._spill.name, 'rb') as reader:
+                lines = reader.read().splitlines() + lines
+        return b'[' + b','.join(lines) + b']'
+
+    def as_payload(self) -> 'SpilledPayload':
+        """The payload for parms holding this result; the same object while any parm still holds it."""
+        payload = self._payload() if self._payload is not None else None
+        if payload is None:
+            payload = SpilledPayload(self)
+            # Weak, so the payload's reference back to this accumulator is not a cycle
+            self._payload = weakref.ref(payload)
+        return payload
+
+    def close(self) -> None:
+        """Deletes the spill file; it is also deleted when the accumulator is garbage collected."""
+        if self._spill is not None:
+            self._cleanup()
+
+
+class SpilledPayload(LazyPayload):
+    """LazyPayload over a LoopAccumulator, read once however many parms hold it."""
+    __slots__ = ('_items', '__weakref__')
+
+    def __init__(self, accumulator: LoopAccumulator):
+        super().__init__(accumulator, PAYLOAD_MEMBER)
+        self._items: Optional[List[str]] = None
+
+    def load(self) -> List[str]:
+        """Every item, read from the spill file line by line on first use and shared after that."""
+        if self._items is None:
+            self._items = self._archive.to_list()
+        return self._items
+
+
+def _remove_spill(spill: IO[bytes]) -> None:
+    spill.close()
+    try:
+        os.unlink(spill.name)
+    except OSError:
+        pass
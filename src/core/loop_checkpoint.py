@@ -0,0 +1,183 @@
+"""Persistent per-iteration results for LooperNode, so a long loop can resume.
+
+With its checkpoint parm on, a LooperNode stores the output of every finished
+iteration in a SQLite database under the user cache directory
+(``$XDG_CACHE_HOME/textloom`` or ``~/.cache/textloom``; override with the
+``TLOOM_CHECKPOINT_DIR`` environment variable). When the loop is cooked again
+with the same key, stored iterations are replayed from the database instead
+of cooking the inner network, so a 300-iteration loop that died at iteration
+280 only runs the last 20 again.
+
+The key is a hash of the looper's path, a digest of its input items, and the
+state of everything inside it: each inner node's type, setup parm values (not
+the parms that hold results) and input connections, the looper parms that
+change what an iteration produces, and the global variables. Changing any of
+them starts from scratch, and the previous key's rows for that looper are
+dropped.
+
+Example:
+    >>> store = get_loop_checkpoints()
+    >>> store.put(key, "/looper1", 3, ["iteration three"])
+    >>> store.get(key, 3)
+    ['iteration three']
+    >>> store.discard("/looper1")
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from threading import Lock
+from typing import Dict, Iterator, List, Optional, TYPE_CHECKING
+
+from core.global_store import GlobalStore
+
+if TYPE_CHECKING:
+    from core.looper_node import LooperNode
+
+# Looper parms whose value changes the result of an individual iteration
+KEY_PARMS = ("feedback_mode", "cook_loops", "max_from_input")
+# Parms that hold what a node produced rather than how it is set up
+OUTPUT_PARMS = frozenset({"response", "file_text", "out_data", "in_data", "staging_data", "stopped_at"})
+
+
+def default_checkpoint_dir() -> str:
+    override = os.environ.get("TLOOM_CHECKPOINT_DIR")
+    if override:
+        return override
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "textloom")
+
+
+def input_digest(looper: 'LooperNode') -> Optional[str]:
+    """sha256 of the items on the looper's input, None if nothing is connected.
+
+    Unlike Node.input_fingerprint this is stable across processes, so a key
+    built before a crash still matches the one built after the restart.
+    """
+    connection = next((conn for conn in looper.inputs() if conn.input_index() == 0), None)
+    if connection is None:
+        return None
+    items = connection.output_node().get_output(requesting_node=looper)
+    return hashlib.sha256(json.dumps(items, default=str).encode("utf-8")).hexdigest()
+
+
+def checkpoint_key(looper: 'LooperNode') -> str:
+    from core.base_classes import NodeEnvironment
+
+    inner = []
+    for path in NodeEnvironment.child_paths(looper.path()):
+        node = NodeEnvironment.nodes[path]
+        inner.append({
+            "path": path,
+            "type": node.type().value,
+            "parms": {name: parm.raw_value() for name, parm in sorted(node._parms.items())
+                      if name not in OUTPUT_PARMS},
+            "inputs": sorted((conn.input_index(), conn.output_node().path(), conn.output_index())
+                             for conn in node.inputs()),
+        })
+    material = json.dumps(
+        {"path": looper.path(), "input": input_digest(looper),
+         "loop": {name: looper._parms[name].raw_value() for name in KEY_PARMS},
+         "inner": inner, "globals": GlobalStore.list()},
+        sort_keys=True, default=str,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class LoopCheckpointStore:
+    _instance = None
+    _lock = Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super(LoopCheckpointStore, cls).__new__(cls)
+                    cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self._db_lock = Lock()
+        self._path: Optional[str] = None
+        self._initialized = True
+
+    def configure(self, checkpoint_dir: Optional[str] = None) -> None:
+        with self._db_lock:
+            if checkpoint_dir is not None:
+                self._path = os.path.join(checkpoint_dir, "loop_checkpoints.sqlite3")
+
+    def path(self) -> str:
+        if self._path is None:
+            self._path = os.path.join(default_checkpoint_dir(), "loop_checkpoints.sqlite3")
+        return self._path
+
+    def load(self, key: str, loop_path: str) -> Dict[int, List[str]]:
+        """Every stored iteration for key; rows left by other keys of the same looper are dropped."""
+        with self._db_lock:
+            try:
+                with self._connection() as conn:
+                    conn.execute("DELETE FROM checkpoints WHERE loop_path = ? AND key != ?", (loop_path, key))
+                    rows = conn.execute(
+                        "SELECT iteration, items FROM checkpoints WHERE key = ?", (key,)
+                    ).fetchall()
+            except sqlite3.Error as e:
+                print(f"Warning: loop checkpoint read failed: {e}")
+                return {}
+        return {iteration: json.loads(items) for iteration, items in rows}
+
+    def get(self, key: str, iteration: int) -> Optional[List[str]]:
+        with self._db_lock:
+            try:
+                with self._connection() as conn:
+                    row = conn.execute(
+                        "SELECT items FROM checkpoints WHERE key = ? AND iteration = ?", (key, iteration)
+                    ).fetchone()
+            except sqlite3.Error as e:
+                print(f"Warning: loop checkpoint read failed: {e}")
+                return None
+        return json.loads(row[0]) if row else None
+
+    def put(self, key: str, loop_path: str, iteration: int, items: List[str]) -> None:
+        with self._db_lock:
+            try:
+                with self._connection() as conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO checkpoints (key, loop_path, iteration, items, created) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (key, loop_path, iteration, json.dumps(items), time.time()),
+                    )
+            except sqlite3.Error as e:
+                print(f"Warning: loop checkpoint write failed: {e}")
+
+    def discard(self, loop_path: Optional[str] = None) -> int:
+        """Deletes the checkpoints of one looper, or of every looper; returns the rows removed."""
+        with self._db_lock:
+            with self._connection() as conn:
+                if loop_path is None:
+                    return conn.execute("DELETE FROM checkpoints").rowcount
+                return conn.execute("DELETE FROM checkpoints WHERE loop_path = ?", (loop_path,)).rowcount
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        os.makedirs(os.path.dirname(self.path()), exist_ok=True)
+        conn = sqlite3.connect(self.path(), timeout=5)
+        try:
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS checkpoints ("
+                    "key TEXT NOT NULL, loop_path TEXT NOT NULL, iteration INTEGER NOT NULL, "
+                    "items TEXT NOT NULL, created REAL NOT NULL, PRIMARY KEY (key, iteration))"
+                )
+                yield conn
+        finally:
+            conn.close()
+
+
+def get_loop_checkpoints() -> LoopCheckpointStore:
+    return LoopCheckpointStore()
@@ -1,9 +1,16 @@
-import re
 import os
-from typing import Optional, Dict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from types import MappingProxyType
+from typing import Iterator, Mapping, Optional
+from TUI.logging_config import get_logger
 
-import inspect
+_NO_LOOPS: Mapping[str, int] = MappingProxyType({})
 
+# Loop counters of the calling context. The mapping is never mutated in place:
+# every change installs a new one, so contexts copied for worker threads,
+# asyncio tasks and nested looper cooks never see each other's updates.
+_active_loops: ContextVar[Mapping[str, int]] = ContextVar('active_loops', default=_NO_LOOPS)
 
 
 class LoopManager:
@@ -32,8 +39,13 @@ class LoopManager:
     clean_stale_loops(looper_name): Removes loop tracking for inactive loopers
         Example: loop_manager.clean_stale_loops('/root/oldloop')
 
-    The class maintains thread safety through singleton pattern implementation and
-    provides cleanup methods to prevent memory leaks from stale loop contexts.
+    iteration(looper_name, value): Sets the iteration for the duration of a with block
+        Example: with loop_manager.iteration('/root/myloop', 5): output_node.cook()
+
+    Loop state is held in a ContextVar rather than on the instance, so each
+    thread, asyncio task and API request sees only the iterations set in its
+    own context; concurrent cooks of the same looper do not interfere, and a
+    nested looper's counter is dropped with the context that set it.
     """
 
     _instance = None
@@ -41,35 +53,51 @@ class LoopManager:
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(LoopManager, cls).__new__(cls)
-            cls._instance._loops: Dict[str, int] = {}
+            cls._instance.logger = get_logger('loop', level=2)
         return cls._instance
 
+    @property
+    def _loops(self) -> Mapping[str, int]:
+        return _active_loops.get()
+
     def get_current_loop(self, path: str) -> Optional[int]:
+        loops = _active_loops.get()
+        if not loops:  # outside any loop, which is every evaluation outside a looper cook
+            return 0
         # Extract the looper name from the full path
-        looper_path = os.path.dirname(path)
-        loop_key = f"loop_{looper_path}"
-        current_loop = self._loops.get(loop_key)
-        #print(f"♺ Get_Current_LOOP: Returning {current_loop} for {path} with {current_loop}")
-        if current_loop == None: #because if we don't it'll error out if we don't cook the loop, better to have something than error out
+        current_loop = loops.get(f"loop_{os.path.dirname(path)}")
+        if current_loop is None: #because if we don't it'll error out if we don't cook the loop, better to have something than error out
             return 0
         return current_loop
 
     def set_loop(self, looper_name: str, value: Optional[int]) -> None:
         loop_key = f"loop_{looper_name}"
+        loops = dict(_active_loops.get())
         if value is None:
-            self._loops.pop(loop_key, None)
-            print(f"SET-LOOP: Removed loop {loop_key}")
+            loops.pop(loop_key, None)
+            self.logger.debug(f"set_loop: Removed loop {loop_key}")
         else:
-            self._loops[loop_key] = value
-            print(f"SET_LOOP: Set loop {loop_key} to {value}")
+            loops[loop_key] = value
+            self.logger.debug(f"set_loop: Set loop {loop_key} to {value}")
+        _active_loops.set(MappingProxyType(loops) if loops else _NO_LOOPS)
+
+    @contextmanager
+    def iteration(self, looper_name: str, value: int) -> Iterator[None]:
+        loops = dict(_active_loops.get())
+        loops[f"loop_{looper_name}"] = value
+        token = _active_loops.set(MappingProxyType(loops))
+        try:
+            yield
+        finally:
+            _active_loops.reset(token)
 
     def clean_stale_loops(self, looper_name: str) -> None:
         loop_key = f"loop_{looper_name}"
-        if loop_key in self._loops:
-            del self._loops[loop_key]
-            print(f"clean_stale_loops: Removed loop {loop_key}")
+        if loop_key in _active_loops.get():
+            self.set_loop(looper_name, None)
+            self.logger.debug(f"clean_stale_loops: Removed loop {loop_key}")
         else:
-            print(f"clean_stale_loops: No loop found for {looper_name}")
+            self.logger.debug(f"clean_stale_loops: No loop found for {looper_name}")
 
 
 # Create a single instance of LoopManager
@@ -0,0 +1,158 @@
+"""Runs the iterations of a LooperNode side by side.
+
+With parallel_iterations above 1, a LooperNode hands its iterations to a
+thread pool instead of cooking them one after another. Every worker thread
+gets its own copy of the looper's inner network in a private Workspace (see
+core.workspace), and every iteration sets its loop index in its own context
+(see core.loop_manager), so concurrent iterations never read or write each
+other's parms, outputs or loop counters. Results are handed back in
+iteration order, so the looper collects exactly what a sequential run would.
+
+Only loops whose iterations are independent can run this way: feedback_mode
+feeds each iteration from the one before it, and an inner node wired to a
+node outside the looper would have that node cooked from several threads at
+once. parallel_blocker() names the reason a looper has to stay sequential.
+
+The copies read the looper's input through the looper itself and report
+tokens to the calling workspace's TokenManager. Globals are copied when the
+loop starts, so a global an iteration sets is not seen by the others. The
+real inner nodes are not cooked; the errors and warnings their copies raise
+are returned with each result so the looper can add them to the real nodes.
+
+Example:
+    >>> runner = ParallelIterations(looper, workers=4, budget_bytes=1024 * 1024)
+    >>> results = runner.run([1, 2, 3], deadline=time.time() + 60)
+    >>> [result.output for result in results]
+    [['item 1'], ['item 2'], ['item 3']]
+"""
+
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, TYPE_CHECKING
+
+from core.base_classes import NodeEnvironment
+from core.cook_scheduler import cook_scheduler
+from core.loop_manager import loop_manager
+from core.token_manager import TokenManager
+from core.workspace import Workspace, current_workspace, use_workspace
+
+if TYPE_CHECKING:
+    from core.looper_node import LooperNode
+    from core.node import Node
+    from core.output_null_node import OutputNullNode
+
+
+@dataclass
+class IterationResult:
+    """What one iteration produced, with the messages its inner nodes raised, keyed by path."""
+    iteration: int
+    output: List[str]
+    clean: bool = True
+    errors: Dict[str, List[str]] = field(default_factory=dict)
+    warnings: Dict[str, List[str]] = field(default_factory=dict)
+
+
+def parallel_blocker(looper: 'LooperNode') -> Optional[str]:
+    """Why the looper's iterations cannot run in parallel, None if they can."""
+    if looper._parms["feedback_mode"].eval():
+        return "feedback_mode feeds each iteration from the previous one"
+    inner = set(NodeEnvironment.child_paths(looper.path()))
+    for path in inner:
+        for connection in NodeEnvironment.nodes[path].inputs():
+            source = connection.output_node().path()
+            if source not in inner:
+                return f"{path} is wired to {source}, outside the looper"
+    return None
+
+
+class _IterationCopy:
+    """One worker's private copy of a looper's inner network."""
+
+    def __init__(self, looper: 'LooperNode'):
+        from core.flowstate_manager import (
+            _bulk_apply_node_data, _bulk_create_node, _bulk_restore_connections, _serialize_node)
+        from core.undo_manager import UndoManager
+
+        self.looper = looper
+        paths = NodeEnvironment.child_paths(looper.path())
+        save_data = {"nodes": {path: _serialize_node(NodeEnvironment.nodes[path]) for path in paths}}
+        self.workspace = Workspace(f"{looper.path()} iteration copy",
+                                   globals=dict(current_workspace().globals),
+                                   token_manager=TokenManager())
+        with use_workspace(self.workspace):
+            undo = UndoManager()
+            undo.disable()
+            # Read-only here: the copies reach the looper's input through it
+            NodeEnvironment.nodes[looper.path()] = looper
+            for path in paths:
+                node_data = save_data["nodes"][path]
+                node = NodeEnvironment.nodes.get(path)  # a nested looper made its null nodes already
+                if node is None:
+                    node = _bulk_create_node(path, node_data, undo)
+                _bulk_apply_node_data(node, node_data)
+            _bulk_restore_connections(save_data, undo)
+            self.output_node: 'OutputNullNode' = NodeEnvironment.nodes[looper._output_node.path()]
+
+    def cook(self, iteration: int, budget_bytes: int) -> IterationResult:
+        with use_workspace(self.workspace), loop_manager.iteration(self.looper.path(), iteration):
+            self.output_node.start_accumulation(budget_bytes)
+            self.output_node.cook()
+            result = IterationResult(iteration, list(self.output_node.get_output() or []),
+                                     clean=not self.output_node.errors())
+            for path, node in self.workspace.nodes.items():
+                if node is self.looper:
+                    continue
+                if node.errors():
+                    result.errors[path] = list(node.errors())
+                    node.clear_errors()
+                if node.warnings():
+                    result.warnings[path] = list(node.warnings())
+                    node.clear_warnings()
+        return result
+
+
+class ParallelIterations:
+    """Cooks iterations of one looper on a pool of workers, each with its own copy of the inner network."""
+
+    def __init__(self, looper: 'LooperNode', workers: int, budget_bytes: int):
+        self._looper = looper
+        self._workers = workers
+        self._budget_bytes = budget_bytes
+        self._idle: 'queue.SimpleQueue[_IterationCopy]' = queue.SimpleQueue()
+
+    def run(self, iterations: List[int], deadline: float) -> Iterator[Optional[IterationResult]]:
+        """
+        Yields each iteration's result in the order given, as soon as it and
+        every iteration before it have finished. Iterations not started by
+        the deadline yield None. Closing the iterator early cancels the ones
+        that have not started and waits for the running ones.
+        """
+        if not iterations:
+            return
+        count = min(self._workers, len(iterations))
+        for _ in range(count):
+            self._idle.put(_IterationCopy(self._looper))
+
+        executor = ThreadPoolExecutor(max_workers=count, thread_name_prefix="tloom-loop")
+        futures = [executor.submit(copy_context().run, self._cook_one, iteration, deadline)
+                   for iteration in iterations]
+        try:
+            for future in futures:
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    def _cook_one(self, iteration: int, deadline: float) -> Optional[IterationResult]:
+        if time.time() > deadline:
+            return None
+        cook_scheduler.check_cancelled()
+        copy = self._idle.get()
+        try:
+            return copy.cook(iteration, self._budget_bytes)
+        finally:
+            self._idle.put(copy)
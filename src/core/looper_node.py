@@ -1,14 +1,18 @@
 import time
 import sys
 import re
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional
 import traceback
 
 from core.base_classes import Node, NodeType, NodeState, NodeEnvironment
-from core.parm import Parm, ParameterType
+from core.parm import Parm, ParameterType, expression_scope
 from core.input_null_node import InputNullNode
 from core.output_null_node import OutputNullNode
+from core.loop_accumulator import LoopAccumulator
+from core.loop_checkpoint import checkpoint_key, get_loop_checkpoints
+from core.loop_parallel import IterationResult, ParallelIterations, parallel_blocker
 from core.loop_manager import LoopManager, loop_manager
+from core.cook_scheduler import cook_scheduler
 from core.enums import FunctionalGroup
 
 from dataclasses import dataclass
@@ -35,7 +39,20 @@ class LooperNode(Node):
         input_hook (str): Custom input processing hook (advanced usage)
         output_hook (str): Custom output processing hook (advanced usage)
         timeout_limit (float): Maximum execution time in seconds (default: 300.0)
-        data_limit (int): Maximum memory usage in bytes (default: 200MB)
+        data_limit (int): Bytes of collected output held in memory before the rest is spilled
+            to a temporary file (default: 200MB)
+        stop_when (str): Expression checked after every iteration; the loop ends early once it
+            evaluates true. Backticked code can read output (the iteration's output, lines
+            joined with newlines), previous (the previous iteration's, None on the first),
+            iteration, and the helpers similarity(a, b) and matches(pattern, text)
+        stopped_at (int): Read-only; the iteration stop_when ended the loop at, 0 if it ran out
+        checkpoint (bool): Stores every finished iteration on disk; a re-cook with unchanged
+            input, inner nodes and globals replays stored iterations and cooks only the rest
+        discard_checkpoints (button): Deletes this looper's stored iterations
+        parallel_iterations (int): How many iterations cook at once (default: 1, one after
+            another). Above 1, each worker cooks its own copy of the inner network, and the
+            results are collected in iteration order. Ignored, with a warning, in
+            feedback_mode or when inner nodes are wired to nodes outside the looper
 
     Loop Behavior Modes:
         1. Standard Loop:
@@ -53,6 +70,12 @@ class LooperNode(Node):
         - Useful for recursive or cumulative operations
         Example use case: Iterative refinement or accumulation of results
 
+        Any mode can end early through stop_when, which matters most for feedback loops
+        that converge before max:
+        - "`output == previous`" stops once an iteration changes nothing
+        - "`similarity(output, previous) > 0.95`" stops once changes become minor
+        - "`matches(r'FINAL ANSWER', output)`" stops once the output contains a marker
+
         4. Test Mode (use_test=True):
         - Runs single iteration specified by test_number
         - Useful for debugging and development
@@ -60,8 +83,16 @@ class LooperNode(Node):
 
     Safety Features:
         - Timeout protection (timeout_limit parameter)
-        - Memory usage limits (data_limit parameter)
+        - Memory usage limits (data_limit parameter): results beyond the limit are kept
+          on disk and only read back when a downstream node asks for them. That read
+          loads the whole list into memory once, shared by staging_data and the output
+          node's out_data; only iter_output() streams them without building the list
         - Automatic cleanup of stale loops
+        - Checkpoint and resume (checkpoint parameter): an interrupted loop restarts
+          from the first iteration it had not finished
+        - Parallel iterations (parallel_iterations parameter): independent iterations,
+          such as one QueryNode call per input item, cook side by side; the inner nodes
+          keep the errors and warnings their copies raised, not the outputs
         - Parameter validation to prevent invalid configurations
 
     Internal Structure:
@@ -104,6 +135,7 @@ class LooperNode(Node):
         self._input_node = None
         self._output_node = None
         self._internal_nodes_created = False
+        self._accumulator: Optional[LoopAccumulator] = None
 
         # Initialize parameters
         self._parms.update({
@@ -120,6 +152,11 @@ class LooperNode(Node):
             "staging_data": Parm("staging_data", ParameterType.STRINGLIST, self),
             "timeout_limit": Parm("timeout_limit", ParameterType.FLOAT, self),
             "data_limit": Parm("data_limit", ParameterType.INT, self),
+            "stop_when": Parm("stop_when", ParameterType.STRING, self),
+            "stopped_at": Parm("stopped_at", ParameterType.INT, self),
+            "checkpoint": Parm("checkpoint", ParameterType.TOGGLE, self),
+            "discard_checkpoints": Parm("discard_checkpoints", ParameterType.BUTTON, self),
+            "parallel_iterations": Parm("parallel_iterations", ParameterType.INT, self),
         })
 
         # Set default values
@@ -136,6 +173,12 @@ class LooperNode(Node):
         self._parms["staging_data"].set([])
         self._parms["timeout_limit"].set(300.0)  # 5 minutes in seconds
         self._parms["data_limit"].set(200 * 1024 * 1024)  # 200MB in bytes
+        self._parms["stop_when"].set("")
+        self._parms["stopped_at"].set(0)
+        self._parms["checkpoint"].set(False)
+        self._parms["parallel_iterations"].set(1)
+
+        self._parms["discard_checkpoints"].set_script_callback(self._discard_checkpoints_callback)
 
     @classmethod
     def post_registration_init(cls, node):
@@ -164,6 +207,9 @@ class LooperNode(Node):
         if use_test and (test_number < min_val or test_number > max_val):
             self.add_error("'test_number' must be between 'min' and 'max' when 'use_test' is True.")
 
+        if self._parms["parallel_iterations"].eval() < 1:
+            self.add_error("'parallel_iterations' must be at least 1.")
+
         if (max_val - min_val) // step == 0:
             self.add_warning("The current parameter values will result in no iterations.")
 
@@ -187,6 +233,8 @@ class LooperNode(Node):
         # Clear the OutputNullNode's accumulated data
         if self._output_node:
             self._output_node._parms["out_data"].set([])
+        # Not closed here: undo entries may still hold its payload, the spill file goes when they do
+        self._accumulator = None
 
         try:
             self._perform_iterations()
@@ -201,7 +249,8 @@ class LooperNode(Node):
         if self.state() == NodeState.COOKING:
             self.set_state(NodeState.UNCHANGED)
 
-        self._output = self._parms["staging_data"].raw_value()
+        if self._parms["staging_data"].is_loaded():
+            self._output = self._parms["staging_data"].raw_value()
 
 
     def _perform_iterations(self):
@@ -235,33 +284,141 @@ class LooperNode(Node):
 
         start_time = time.time()
         self._parms["staging_data"].set([])
-        collected_outputs = []
-
-        for i in iteration_range:
-            if time.time() - start_time > timeout_limit:
-                self.add_warning(f"Iteration timeout reached after {timeout_limit} seconds.")
-                break
-
-            loop_manager.set_loop(self.path(), i)
-            self._output_node.cook()
-            iteration_result = self._output_node._parms["out_data"].eval()
-
-            if iteration_result:
-                collected_outputs.append(iteration_result)
-            else:
-                self.add_warning(f"Iteration {i} created a blank or null value.")
-
-        if collected_outputs:
-            last_valid_output = collected_outputs[-1]
-            self._parms["staging_data"].set(last_valid_output)
-            self._output = last_valid_output
+        accumulator = self._output_node.start_accumulation(self._parms["data_limit"].eval())
+        check_stop = bool(self._parms["stop_when"].raw_value().strip())
+        previous_output = None
+        stopped_at = 0
+
+        checkpoints = get_loop_checkpoints() if self._parms["checkpoint"].eval() else None
+        if checkpoints is not None:
+            key = checkpoint_key(self)
+            finished = checkpoints.load(key, self.path())
+            if finished:
+                print(f"∞ loop: resuming, {len(finished)} iterations restored from checkpoint")
         else:
-            self._parms["staging_data"].set([])
-            self._output = []
+            finished = {}
+
+        results = self._parallel_results([i for i in iteration_range if i not in finished],
+                                         start_time + timeout_limit)
+        try:
+            for i in iteration_range:
+                cook_scheduler.check_cancelled()
+                if time.time() - start_time > timeout_limit:
+                    self.add_warning(f"Iteration timeout reached after {timeout_limit} seconds.")
+                    break
+
+                collected = len(accumulator)
+                with loop_manager.iteration(self.path(), i):
+                    if i in finished:
+                        iteration_output = finished[i]
+                        accumulator.extend(iteration_output)
+                    elif results is not None:
+                        result = next(results)
+                        if result is None:
+                            self.add_warning(f"Iteration timeout reached after {timeout_limit} seconds.")
+                            break
+                        self._add_inner_messages(result)
+                        iteration_output = result.output
+                        accumulator.extend(iteration_output)
+                        if checkpoints is not None and result.clean:
+                            checkpoints.put(key, self.path(), i, iteration_output)
+                    else:
+                        self._output_node.cook()
+                        iteration_output = self._output_node.get_output() or []
+                        if checkpoints is not None and not self._output_node.errors():
+                            checkpoints.put(key, self.path(), i, iteration_output)
+                    if check_stop:
+                        latest_output = "\n".join(iteration_output)
+                        stop = self._stop_condition_met(latest_output, previous_output, i)
+                        previous_output = latest_output
+
+                if len(accumulator) == collected:
+                    self.add_warning(f"Iteration {i} created a blank or null value.")
+                if check_stop and stop:
+                    stopped_at = i
+                    print(f"∞ loop: stop_when met at iteration {i}")
+                    break
+        finally:
+            if results is not None:
+                results.close()
+            self._output_node.finish_accumulation()
+            self._parms["stopped_at"].set(stopped_at)
+
+        self._accumulator = accumulator
+        if accumulator.spilled:
+            self.add_warning(f"Loop output passed data_limit ({accumulator.budget_bytes} bytes) and was spilled to disk.")
+            # Downstream nodes load the list from disk when they first ask for it (see get_output);
+            # out_data holds the same payload, so the file is read once for both parms
+            self._parms["staging_data"].set(accumulator.as_payload())
+            self._output = None
+        else:
+            self._output = accumulator.to_list()
+            self._parms["staging_data"].set(self._output)
 
-        loop_manager.set_loop(self.path(), value=None)
         print("∞ loop: end of loop reached, cleaning up\n")
 
+    def _parallel_results(self, iterations: List[int], deadline: float) -> Optional[Iterator[Optional[IterationResult]]]:
+        """Results of the iterations cooked on a pool, in order; None when they cook one by one."""
+        workers = self._parms["parallel_iterations"].eval()
+        if workers <= 1 or len(iterations) <= 1:
+            return None
+        blocker = parallel_blocker(self)
+        if blocker:
+            self.add_warning(f"parallel_iterations ignored: {blocker}.")
+            return None
+        runner = ParallelIterations(self, workers, self._parms["data_limit"].eval())
+        return runner.run(iterations, deadline)
+
+    @staticmethod
+    def _add_inner_messages(result: IterationResult) -> None:
+        """Adds what an iteration's copies of the inner nodes raised to the real inner nodes."""
+        for path, errors in result.errors.items():
+            node = NodeEnvironment.nodes.get(path)
+            for error in errors:
+                if node is not None and error not in node.errors():
+                    node.add_error(error)
+        for path, warnings in result.warnings.items():
+            node = NodeEnvironment.nodes.get(path)
+            for warning in warnings:
+                if node is not None and warning not in node.warnings():
+                    node.add_warning(warning)
+
+    def _stop_condition_met(self, output: str, previous: Optional[str], iteration: int) -> bool:
+        with expression_scope(output=output, previous=previous, iteration=iteration):
+            result = self._parms["stop_when"].eval()
+        return str(result).strip().lower() in ("true", "1", "yes")
+
+    def discard_checkpoints(self) -> None:
+        """Deletes this looper's stored iterations, so the next cook starts from the first one."""
+        removed = get_loop_checkpoints().discard(self.path())
+        print(f"∞ loop: discarded {removed} checkpointed iterations")
+
+    def _discard_checkpoints_callback(self) -> None:
+        self.discard_checkpoints()
+
+    def stopped_at(self) -> int:
+        """The iteration stop_when ended the last cook at, 0 if the loop ran its full range."""
+        return self._parms["stopped_at"].eval()
+
+    def iter_output(self) -> Iterator[str]:
+        """Streams the last cook's results without building the list, even when they were spilled to disk."""
+        if self._accumulator is not None:
+            return iter(self._accumulator)
+        return iter(self.get_output() or [])
+
+    def _publish_output_fingerprint(self) -> None:
+        if self._output is None and self._accumulator is not None:
+            # Spilled: fingerprint what was appended rather than reading the file back
+            self._output_fingerprint = self._accumulator.fingerprint()
+            self._fingerprinted_output = None
+        else:
+            super()._publish_output_fingerprint()
+
+    def get_output(self, requesting_node: Optional[Node] = None):
+        if self._output is None and self._accumulator is not None:
+            return self._parms["staging_data"].raw_value()
+        return super().get_output(requesting_node)
+
     def input_names(self) -> Dict[int, str]:
         return {0: "Input Data"}
 
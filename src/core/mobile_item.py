@@ -2,6 +2,7 @@ from abc import ABC, abstractmethod
 from enum import Enum, auto
 import re
 import uuid
+import weakref
 from typing import Any, ClassVar, Dict, List, Optional, Set, Tuple, TYPE_CHECKING
 from core.enums import NetworkItemType
 from core.internal_path import InternalPath
@@ -26,12 +27,13 @@ class MobileItem(NetworkEntity):
         _position (Tuple[float, float]): The x, y position of the item.
         _session_id (str): A unique identifier for the session.
 
-    Class Attributes:session
-        _existing_session_ids (Set[str]): A set of all existing session IDs.
-        all_MobileItems : A global list of nodes for UndoManager
+    Class Attributes:
+        _live_items (WeakValueDictionary[str, MobileItem]): Every MobileItem
+            still alive, keyed by session ID. Entries disappear when the item
+            is garbage collected, so the registry never keeps a node alive and
+            a session ID is free for reuse as soon as its item is gone.
     """
-    _existing_session_ids: Set[str] = set()
-    all_MobileItems = []
+    _live_items: ClassVar['weakref.WeakValueDictionary[str, MobileItem]'] = weakref.WeakValueDictionary()
 
     def __init__(self, name: str, path: str, position=[0.0, 0.0]) ->None:
         """
@@ -42,7 +44,6 @@ class MobileItem(NetworkEntity):
             path (str): The full path of the item in the internal network.
             position (Tuple[float, float]): The initial x, y position of the item.
         """
-        MobileItem.all_MobileItems.append(self)
         super().__init__()
         self._name: str = name
         self._path: InternalPath = InternalPath(path)
@@ -51,20 +52,28 @@ class MobileItem(NetworkEntity):
         self._position: Tuple[float, float] = position
 
         self._session_id: str = self._generate_unique_session_id()
+        MobileItem._live_items[self._session_id] = self
 
     def delete(self):
-        if self in MobileItem.all_MobileItems:
-            MobileItem.all_MobileItems.remove(self)
-            state = self.__dict__.copy()
-            del self
+        if MobileItem._live_items.get(self._session_id) is self:
+            del MobileItem._live_items[self._session_id]
 
     @classmethod
     def recreate(cls, state):
         new_MobileItem = cls.__new__(cls)
         new_MobileItem.__dict__.update(state)
-        cls.all_MobileItems.append(new_MobileItem)
+        MobileItem._live_items[new_MobileItem._session_id] = new_MobileItem
         return new_MobileItem
 
+    @classmethod
+    def live_items(cls) ->List['MobileItem']:
+        """Every MobileItem that has not been garbage collected, registered or not."""
+        return list(MobileItem._live_items.values())
+
+    @classmethod
+    def live_count(cls) ->int:
+        return len(MobileItem._live_items)
+
     def name(self) ->str:
         """Get the name of the item."""
         return self._name
@@ -107,6 +116,8 @@ class MobileItem(NetworkEntity):
             ] is not self:
             return False
         old_path = str(self._path)
+        from core.undo_manager import UndoManager
+        UndoManager().record_paths([self] + NodeEnvironment.nodes.descendant_nodes(old_path))
         self._name = new_name
         self._path = InternalPath(new_path)
         if old_path in NodeEnvironment.nodes:
@@ -152,11 +163,9 @@ class MobileItem(NetworkEntity):
                 item in items}
             for future in as_completed(future_to_item):
                 new_items.append(future.result())
-        if len(new_session_ids) != len(items
-            ) or not new_session_ids.isdisjoint(cls._existing_session_ids):
+        if len(new_session_ids) != len(items):
             raise RuntimeError(
                 'Failed to generate unique session IDs for all items')
-        cls._existing_session_ids.update(new_session_ids)
         return new_items
 
     @classmethod
@@ -172,8 +181,7 @@ class MobileItem(NetworkEntity):
         """
         for attempt in range(100):
             new_id = cls._generate_session_id()
-            if new_id not in cls._existing_session_ids:
-                cls._existing_session_ids.add(new_id)
+            if new_id not in MobileItem._live_items:
                 return new_id
 
         raise RuntimeError('Unable to generate a unique session ID')
@@ -197,11 +205,3 @@ class MobileItem(NetworkEntity):
             NetworkItemType: The type of this network item (always NODE for MobileItem).
         """
         return NetworkItemType.NODE
-
-    def __del__(self) ->None:
-        """
-        Clean up when the object is deleted.
-
-        Removes the session ID from the set of existing IDs.
-        """
-        self._existing_session_ids.discard(self._session_id)
@@ -13,6 +13,8 @@ class TokenUsage:
     input_tokens: int
     output_tokens: int
     total_tokens: int
+    # Replayed from the LLM response cache: what the original query used, not spent again
+    cached: bool = False
 
     def __post_init__(self) -> None:
         if self.input_tokens < 0:
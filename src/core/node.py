@@ -3,11 +3,14 @@ from enum import Enum, auto
 from typing import Any, ClassVar, Dict, List, Optional, Set, Tuple, TYPE_CHECKING, Sequence, Union
 import re
 import importlib
+import threading
 from core.enums import NetworkItemType
 from core.enums import NodeState
 from core.enums import NodeType
 from core.mobile_item import MobileItem
 from core.node_connection import NodeConnection
+from core.cook_scheduler import cook_scheduler
+from core.fingerprint import fingerprint
 from core.node_environment import NodeEnvironment
 
 if TYPE_CHECKING:
@@ -74,8 +77,8 @@ class Node(MobileItem):
             - Handles force evaluation
 
         2. Cooking Process:
-            - Dependency resolution
-            - Ordered processing
+            - Dependency resolution (delegated to core.cook_scheduler)
+            - Ordered processing, each dirty node cooked once per request
             - State management
             - Error handling
 
@@ -129,7 +132,10 @@ class Node(MobileItem):
         self._inputs: Dict[int, NodeConnection] = {}
         self._outputs: Dict[int, List[NodeConnection]] = {}
         self._output = None
+        self._output_fingerprint = None
+        self._fingerprinted_output = None
         self._state: NodeState = NodeState.UNCOOKED
+        self._state_lock = threading.RLock()
         self._errors: List[str] = []
         self._warnings: List[str] = []
         self._is_time_dependent = False
@@ -142,6 +148,7 @@ class Node(MobileItem):
         self._output_node = None
         self._internal_nodes_created = False
         self._parent_looper = False
+        self._item_memo = None
 
         from core.parm import Parm, ParameterType
 
@@ -215,6 +222,7 @@ class Node(MobileItem):
             node_class = getattr(module, f'{class_name}Node')
 
             new_node = node_class(new_name, new_path, node_type)
+            UndoManager().record_create(new_node)
 
             # Note: session_id is already generated in MobileItem.__init__()
             NodeEnvironment.add_node(new_node)
@@ -237,6 +245,8 @@ class Node(MobileItem):
     def destroy(self) ->None:
         from core.undo_manager import UndoManager
         UndoManager().push_state(f'Delete node: {self.node_path()}')
+        UndoManager().record_destroy(self)
+        downstream_nodes = self.outputs()
         for conn in list(self._inputs.values()):
             output_node = conn.output_node()
             output_idx = conn.output_index()
@@ -253,6 +263,8 @@ class Node(MobileItem):
                     del input_node._inputs[input_idx]
                 del conn
             self._outputs[output_idx].clear()
+        for downstream_node in downstream_nodes:
+            cook_scheduler.mark_dirty(downstream_node)
         NodeEnvironment.remove_node_from_dictionary(self.node_path())
 
     def type(self) ->NodeType:
@@ -315,7 +327,8 @@ class Node(MobileItem):
         connection = NodeConnection(input_node, self, output_index, input_index)
         self._inputs[input_index] = connection
         input_node._outputs.setdefault(output_index, []).append(connection)
-        self.set_state(NodeState.UNCOOKED)
+        UndoManager().record_connection(connection, connected=True)
+        cook_scheduler.mark_dirty(self)
 
     def set_next_input(self, input_node: 'Node', output_index: int=0) ->None:
         from core.undo_manager import UndoManager
@@ -356,13 +369,16 @@ class Node(MobileItem):
         UndoManager().push_state(
             f'Remove connection between {connection.output_node().name()} and {connection.input_node().name()}'
             )
+        input_node = connection.input_node()
+        if input_node._inputs.get(connection.input_index()) is connection:
+            UndoManager().record_connection(connection, connected=False)
 
         # Clean up input side
         if connection.input_node() == self:
             input_idx = connection.input_index()
             if input_idx in self._inputs and self._inputs[input_idx] == connection:
                 del self._inputs[input_idx]
-                self.set_state(NodeState.UNCOOKED)
+                cook_scheduler.mark_dirty(self)
 
         # Clean up output side
         if connection.output_node() == self:
@@ -386,11 +402,13 @@ class Node(MobileItem):
             input_idx = connection.input_index()
             if input_idx in input_node._inputs and input_node._inputs[input_idx] == connection:
                 del input_node._inputs[input_idx]
+                cook_scheduler.mark_dirty(input_node)
 
     def set_parent(self, new_parent_path: str) ->None:
         from core.undo_manager import UndoManager
         old_path = self.path()
         UndoManager().push_state(f'Move {old_path} to {new_parent_path}')
+        UndoManager().record_paths([self] + NodeEnvironment.nodes.descendant_nodes(old_path))
         try:
             NodeEnvironment.update_node_path(old_path, new_parent_path)
         except ValueError:
@@ -398,11 +416,13 @@ class Node(MobileItem):
 
     def state(self) ->NodeState:
         """Returns the current state of the node."""
-        return self._state
+        with self._state_lock:
+            return self._state
 
     def set_state(self, state: NodeState) ->None:
-        """Sets the state of the node."""
-        self._state = state
+        """Sets the state of the node. Safe to call from cook worker threads."""
+        with self._state_lock:
+            self._state = state
 
     def errors(self) ->Tuple[str, ...]:
         """Returns a tuple of error messages associated with this node."""
@@ -455,30 +475,18 @@ class Node(MobileItem):
     def cook_dependencies(self) ->List['Node']:
         """
         Gathers all input nodes that this node depends on into a list in the correct order (furthest nodes first).
-        The actual cooking is deferred and should be handled later by the last node in the chain.
-        Returns a list of nodes in the correct order they should be cooked.
+        Only nodes that currently need to cook are returned; the cooking itself is done by the cook scheduler.
         """
-        nodes_to_cook: List[Node] = []
-        visited_nodes: Set[Node] = set()
-
-        def dfs(node: Node):
-            if node in visited_nodes:
-                return
-            visited_nodes.add(node)
-            for input_node in node.input_nodes():
-                dfs(input_node)
-            if node.needs_to_cook():
-                nodes_to_cook.append(node)
-        for input_node in self.input_nodes():
-            dfs(input_node)
-        return nodes_to_cook
+        upstream_nodes = cook_scheduler.topological_order(self)[:-1]
+        return [node for node in upstream_nodes if node.needs_to_cook()]
 
     def cook(self, force: bool=False) ->None:
-        if not self._parms["enabled"].eval():
-            dependencies = self.cook_dependencies()
-            for node in dependencies:
-                node._internal_cook()
+        """Cooks this node and every dirty node upstream of it, each exactly once."""
+        cook_scheduler.cook(self)
 
+    def _run_cook(self) ->None:
+        """Cooks this node on its own; called by the cook scheduler once its inputs are ready."""
+        if not self._parms["enabled"].eval():
             if self.inputs():
                 input_conn = self.inputs()[0]
                 self._output = input_conn.output_node().get_output(requesting_node=self)
@@ -486,10 +494,6 @@ class Node(MobileItem):
                 self._output = []
             self.set_state(NodeState.UNCHANGED)
             return
-
-        dependencies = self.cook_dependencies()
-        for node in dependencies:
-            node._internal_cook()
         self._internal_cook()
 
     def last_cook_time(self) ->float:
@@ -507,6 +511,37 @@ class Node(MobileItem):
         """Returns the number of times this node has cooked in the current session."""
         return self._cook_count
 
+    def output_fingerprint(self, output_index: Optional[int]=None) ->Optional[int]:
+        """
+        Returns the fingerprint published with the node's output at cook time.
+        Nodes with several outputs fingerprint each one separately; pass output_index to get one of them.
+        """
+        if self._output is not self._fingerprinted_output:
+            self._publish_output_fingerprint()
+        published = self._output_fingerprint
+        if output_index is not None and isinstance(published, tuple) and output_index < len(published):
+            return published[output_index]
+        return hash(published) if isinstance(published, tuple) else published
+
+    def input_fingerprint(self, input_index: int=0) ->Optional[int]:
+        """Returns the fingerprint of the data arriving on input_index, None if it is not connected."""
+        connection = self._inputs.get(input_index)
+        if connection is None:
+            return None
+        return connection.output_node().output_fingerprint(connection.output_index())
+
+    def _publish_output_fingerprint(self) ->None:
+        output = self._output
+        if not getattr(self, 'SINGLE_OUTPUT', True) and isinstance(output, list):
+            self._output_fingerprint = tuple(fingerprint(slot) for slot in output)
+        else:
+            self._output_fingerprint = fingerprint(output)
+        self._fingerprinted_output = output
+
+    def memo_stats(self) ->Optional[Dict[str, Any]]:
+        """Returns per-item memo hit/miss counters for item-wise nodes, None for other nodes."""
+        return self._item_memo.stats() if self._item_memo is not None else None
+
     def _parse_string_list(self, s: str) -> list[str]:
 
         """
@@ -626,6 +661,8 @@ class Node(MobileItem):
         return result
 
     def eval(self, force: bool = False, requesting_node: Optional['Node'] = None) -> Any:
+        if force is not True and cook_scheduler.has_cooked(self):
+            return self.get_output(requesting_node)
         if self.state() != NodeState.UNCHANGED or force is True or self._is_time_dependent:
             self.cook()
         return self.get_output(requesting_node)
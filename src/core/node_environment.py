@@ -8,6 +8,8 @@ import inspect
 if TYPE_CHECKING:
     from core.node import Node
 from core.internal_path import InternalPath
+from core.node_registry import NodeRegistry
+from core.workspace import current_workspace
 
 _node_types = None
 
@@ -42,7 +44,19 @@ def OperationFailed(message: str):
             print(f"    {code.strip()}")
     print()  # Add an empty line for better readability
 
-class NodeEnvironment:
+class _NodeEnvironmentType(type):
+    """Resolves NodeEnvironment.nodes to the registry of the current workspace."""
+
+    @property
+    def nodes(cls) -> NodeRegistry:
+        return current_workspace().nodes
+
+    @nodes.setter
+    def nodes(cls, nodes: Dict[str, 'Node']) -> None:
+        current_workspace().nodes = nodes if isinstance(nodes, NodeRegistry) else NodeRegistry(nodes)
+
+
+class NodeEnvironment(metaclass=_NodeEnvironmentType):
 
     """
     NodeEnvironment: A singleton class managing the lifecycle and organization of nodes in a hierarchical node graph system.
@@ -59,7 +73,8 @@ class NodeEnvironment:
         
         - Node Registration and Lookup:
             * Tracks all active nodes in the system
-            * Provides methods to find nodes by name or path
+            * Provides methods to find nodes by name, path or session id, indexed
+              by NodeRegistry so lookups do not scan every path
             * Supports post-registration initialization for specialized node types
         
         - Environment Control:
@@ -111,6 +126,8 @@ class NodeEnvironment:
 
     Notes:
         - Always use get_instance() to obtain the NodeEnvironment instance
+        - nodes belongs to the current core.workspace.Workspace, so switching
+          workspaces switches the whole registry
         - Node paths must be unique within the environment
         - Child nodes' paths are automatically updated when parent nodes move
         - The root path ('/') is protected and cannot be deleted
@@ -118,7 +135,10 @@ class NodeEnvironment:
     """
 
     _instance = None
-    nodes: Dict[str, 'Node'] = {}
+
+    @property
+    def nodes(self) -> NodeRegistry:
+        return current_workspace().nodes
 
     def __init__(self):
         self._node_created_callbacks = []
@@ -190,17 +210,22 @@ class NodeEnvironment:
     def node_from_name(cls, node_name: str) ->Optional['Node']:
         if node_name in cls.nodes:
             return cls.nodes[node_name]
-        for path, node in cls.nodes.items():
-            if node_name == path.split('/')[-1]:
-                return node
-        return None
+        return cls.nodes.first_named(node_name)
+
+    @classmethod
+    def node_from_session_id(cls, session_id: str) ->Optional['Node']:
+        return cls.nodes.find_by_session_id(session_id)
+
+    @classmethod
+    def child_paths(cls, node_path: str) ->List[str]:
+        """Every registered path below node_path, parents before their children."""
+        return cls.nodes.descendants(node_path)
 
     @classmethod
     def remove_node(cls, node_path: str) ->None:
         if node_path == '/':
             return
-        nodes_to_remove = [path for path in cls.nodes.keys() if path.
-            startswith(node_path)]
+        nodes_to_remove = cls.nodes.subtree(node_path)
         nodes_to_destroy = [(path, cls.nodes[path]) for path in nodes_to_remove
             ]
         for path, node in nodes_to_destroy:
@@ -239,7 +264,7 @@ class NodeEnvironment:
                 break
             counter += 1
         path_updates = {}
-        children = [p for p in cls.nodes if p.startswith(old_path + '/')]
+        children = cls.nodes.descendants(old_path)
         path_updates[old_path] = new_path
         for child_path in children:
             relative_path = child_path[len(old_path):]
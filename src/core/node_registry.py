@@ -0,0 +1,177 @@
+"""Path-keyed node registry with secondary indexes.
+
+NodeEnvironment.nodes maps a node's path to the node, and a lot of code reads
+and writes it as a plain dict. NodeRegistry keeps that interface but also
+maintains three indexes on every insert, delete and clear:
+
+    session id -> paths       find_by_session_id
+    name       -> paths       paths_named, first_named
+    path trie                 descendants, subtree
+
+so lookups by session id or bare name, and "everything under /foo" queries,
+no longer scan every registered path. Subtree queries walk whole path
+components, so /foo never matches /foobar.
+
+Names are taken from the last component of the path, the same rule
+NodeEnvironment.node_from_name has always used. Paths in each index are kept
+in registration order, so first_named returns the node a scan of the dict
+would have found first.
+
+Example:
+    >>> registry = NodeRegistry()
+    >>> registry["/foo"] = foo
+    >>> registry["/foo/bar"] = bar
+    >>> registry.descendants("/foo")
+    ['/foo/bar']
+    >>> registry.first_named("bar") is bar
+    True
+"""
+
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from core.node import Node
+
+
+def _parent(path: str) -> Optional[str]:
+    if path == '/' or '/' not in path:
+        return None
+    return path.rsplit('/', 1)[0] or '/'
+
+
+def _session_id(node: Any) -> Optional[str]:
+    try:
+        return node.session_id()
+    except AttributeError:
+        return None
+
+
+class NodeRegistry(Dict[str, 'Node']):
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self._by_session: Dict[str, Dict[str, None]] = {}
+        self._by_name: Dict[str, Dict[str, None]] = {}
+        self._children: Dict[str, Dict[str, None]] = {}
+        self.update(*args, **kwargs)
+
+    def __setitem__(self, path: str, node: 'Node') -> None:
+        old = dict.get(self, path)
+        if old is node:
+            return
+        if old is None:
+            self._index_path(path)
+        else:
+            self._unindex_session(path, old)
+        dict.__setitem__(self, path, node)
+        self._index_session(path, node)
+
+    def __delitem__(self, path: str) -> None:
+        node = dict.pop(self, path)
+        self._unindex(path, node)
+
+    def pop(self, path: str, *default: Any) -> Any:
+        if path not in self:
+            if default:
+                return default[0]
+            raise KeyError(path)
+        node = dict.pop(self, path)
+        self._unindex(path, node)
+        return node
+
+    def popitem(self) -> Tuple[str, 'Node']:
+        path, node = dict.popitem(self)
+        self._unindex(path, node)
+        return path, node
+
+    def setdefault(self, path: str, node: 'Node' = None) -> 'Node':
+        if path not in self:
+            self[path] = node
+        return dict.__getitem__(self, path)
+
+    def update(self, *args, **kwargs) -> None:
+        for path, node in dict(*args, **kwargs).items():
+            self[path] = node
+
+    def __ior__(self, other: Any) -> 'NodeRegistry':
+        self.update(other)
+        return self
+
+    def clear(self) -> None:
+        dict.clear(self)
+        self._by_session.clear()
+        self._by_name.clear()
+        self._children.clear()
+
+    def find_by_session_id(self, session_id: str) -> Optional['Node']:
+        paths = self._by_session.get(str(session_id))
+        if not paths:
+            return None
+        return dict.__getitem__(self, next(iter(paths)))
+
+    def paths_named(self, name: str) -> List[str]:
+        return list(self._by_name.get(name, ()))
+
+    def first_named(self, name: str) -> Optional['Node']:
+        paths = self._by_name.get(name)
+        if not paths:
+            return None
+        return dict.__getitem__(self, next(iter(paths)))
+
+    def descendants(self, path: str) -> List[str]:
+        """Registered paths strictly below path, parents before their children."""
+        found: List[str] = []
+        stack = list(reversed(self._children.get(path, ())))
+        while stack:
+            current = stack.pop()
+            if current in self:
+                found.append(current)
+            stack.extend(reversed(self._children.get(current, ())))
+        return found
+
+    def subtree(self, path: str) -> List[str]:
+        """path itself, if registered, followed by its descendants."""
+        return ([path] if path in self else []) + self.descendants(path)
+
+    def descendant_nodes(self, path: str) -> List['Node']:
+        return [dict.__getitem__(self, p) for p in self.descendants(path)]
+
+    def _index_path(self, path: str) -> None:
+        self._by_name.setdefault(path.split('/')[-1], {})[path] = None
+        child, parent = path, _parent(path)
+        while parent is not None:
+            siblings = self._children.setdefault(parent, {})
+            if child in siblings:
+                break
+            siblings[child] = None
+            child, parent = parent, _parent(parent)
+
+    def _unindex(self, path: str, node: 'Node') -> None:
+        self._unindex_session(path, node)
+        name = path.split('/')[-1]
+        self._discard(self._by_name, name, path)
+        current = path
+        while current not in self and not self._children.get(current):
+            self._children.pop(current, None)
+            parent = _parent(current)
+            if parent is None:
+                break
+            self._discard(self._children, parent, current)
+            current = parent
+
+    def _index_session(self, path: str, node: 'Node') -> None:
+        session_id = _session_id(node)
+        if session_id is not None:
+            self._by_session.setdefault(str(session_id), {})[path] = None
+
+    def _unindex_session(self, path: str, node: 'Node') -> None:
+        session_id = _session_id(node)
+        if session_id is not None:
+            self._discard(self._by_session, str(session_id), path)
+
+    @staticmethod
+    def _discard(index: Dict[str, Dict[str, None]], key: str, path: str) -> None:
+        paths = index.get(key)
+        if paths is not None:
+            paths.pop(path, None)
+            if not paths:
+                del index[key]
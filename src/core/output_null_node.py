@@ -1,8 +1,9 @@
 import hashlib
 import time
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from core.base_classes import Node, NodeType, NodeState, NodeEnvironment
 from core.parm import Parm, ParameterType
+from core.loop_accumulator import LoopAccumulator
 
 class OutputNullNode(Node):
     """
@@ -10,6 +11,8 @@ class OutputNullNode(Node):
 
     This node is typically used inside a Looper Node, but can function independently.
     It takes a list of strings as input and mirrors it to the out_data parameter.
+    While its looper is iterating, input is appended to the looper's
+    LoopAccumulator instead, and out_data is written once when the loop ends.
 
     Attributes:
         _input_hash (str): Hash of the last processed input.
@@ -29,6 +32,7 @@ class OutputNullNode(Node):
         self._input_hash = None
         self._last_input_size = 0
         self._parent_looper = True
+        self._accumulator: Optional[LoopAccumulator] = None
 
         self._parms.update({
             "out_data": Parm("out_data", ParameterType.STRINGLIST, self),
@@ -70,10 +74,16 @@ class OutputNullNode(Node):
                 self._output = []
             elif not isinstance(input_data, list):
                 raise TypeError("Input data must be a list")
+            elif self._accumulator is not None:
+                if not all(isinstance(x, str) for x in input_data):
+                    self.add_warning(f"Received non-string data: {input_data}")
+                    input_data = [str(x) for x in input_data if x]
+                self._accumulator.extend(input_data)
+                self._output = input_data
             else:
                 current_data = self._parms["out_data"].raw_value()
-                if not isinstance(current_data, list):
-                    current_data = []
+                # A copy: after a loop the list may be shared with the looper's staging_data
+                current_data = list(current_data) if isinstance(current_data, list) else []
 
                 if all(isinstance(x, str) for x in input_data):
                     current_data.extend(input_data)
@@ -93,6 +103,26 @@ class OutputNullNode(Node):
         self._last_cook_time = (time.time() - start_time) * 1000
 
 
+    def start_accumulation(self, budget_bytes: int) -> LoopAccumulator:
+        self._accumulator = LoopAccumulator(budget_bytes)
+        return self._accumulator
+
+    def finish_accumulation(self) -> Optional[LoopAccumulator]:
+        """Stops accumulating and publishes the collected items to out_data in one write."""
+        accumulator, self._accumulator = self._accumulator, None
+        if accumulator is not None:
+            if accumulator.spilled:
+                self._parms["out_data"].set(accumulator.as_payload())
+            else:
+                self._parms["out_data"].set(accumulator.to_list())
+        return accumulator
+
+    def accumulated_data(self) -> List[str]:
+        """Everything collected so far in the running loop, or out_data outside one."""
+        if self._accumulator is not None:
+            return self._accumulator.to_list()
+        return self._parms["out_data"].eval()
+
     def _calculate_hash(self, content: str) -> str:
         return hashlib.md5(content.encode()).hexdigest()
 
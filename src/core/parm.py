@@ -4,18 +4,54 @@ import re
 import operator
 import builtins
 import math, datetime, random
+import difflib
+from contextlib import contextmanager
+from contextvars import ContextVar
 from enum import Enum
+from types import CodeType
 from typing import Dict, Tuple, Union, Callable
 from typing import List, Optional
 from core.base_classes import OperationFailed
 from core.loop_manager import *
 from core.global_store import GlobalStore
-from core.base_classes import OperationFailed, NodeState
+from core.cook_scheduler import cook_scheduler
+from core.parm_template import ParmTemplate
+from core.flowstate_archive import LazyPayload
+from core.base_classes import OperationFailed, NodeState, NodeEnvironment
 
 """Defines parameter types and the Parm class for node-based operations.
 Provides functionality for parameter management, evaluation, and script execution."""
 
 
+def similarity(a: Any, b: Any) -> float:
+    """Ratio between 0.0 and 1.0 of how alike two texts are."""
+    return difflib.SequenceMatcher(None, str(a), str(b)).ratio()
+
+
+def matches(pattern: str, text: Any) -> bool:
+    """True if the regular expression pattern is found anywhere in text."""
+    return re.search(pattern, str(text)) is not None
+
+
+# Extra names that backticked code can read, set by the caller for one evaluation
+_expression_scope: ContextVar[Dict[str, Any]] = ContextVar('expression_scope', default={})
+
+
+@contextmanager
+def expression_scope(**names: Any):
+    """Makes names readable from backticked code evaluated inside the with block.
+
+    Example:
+        >>> with expression_scope(output="done", previous="draft"):
+        ...     looper._parms["stop_when"].eval()   # "`output == previous`" -> 'False'
+    """
+    token = _expression_scope.set({**_expression_scope.get(), **names})
+    try:
+        yield
+    finally:
+        _expression_scope.reset(token)
+
+
 class ParameterType(Enum):
     INT = "int"
     FLOAT = "float"
@@ -45,16 +81,22 @@ class Parm:
         # Stage 4: Python Code
         'PYTHON_CODE': r"`([^`]+)`"                # `len("test")`
     }
+    __compiled_patterns = {key: re.compile(pattern) for key, pattern in __patterns.items()}
+    __any_pattern = re.compile('|'.join(__patterns.values()))
+    __safe_globals = None
 
     def __init__(self, name: str, parm_type: ParameterType, node: "Node"):
         self._name: str = name
         self._type: ParameterType = parm_type
         self._node: "Node" = node
         self._script_callback: str = ""
+        self._payload: Optional[LazyPayload] = None
         self._value: Union[int, float, str, List[str], bool] = ""
         self._default_value: Union[int, float, str, List[str], bool] = ""
         self._is_default: bool = True
-
+        self._templates: Dict[str, Optional[ParmTemplate]] = {}
+        self._templates_value: Any = None
+        self._is_expression: Optional[bool] = None
 
     def name(self) -> str:
         """Returns this parameter's name."""
@@ -76,6 +118,27 @@ class Parm:
         """Returns the node on which this parameter exists."""
         return self._node
 
+    @property
+    def _value(self) -> Union[int, float, str, List[str], bool]:
+        if self._payload is not None:
+            self._loaded_value = self._payload.load()
+            self._payload = None
+        return self._loaded_value
+
+    @_value.setter
+    def _value(self, value: Union[int, float, str, List[str], bool, LazyPayload]) -> None:
+        """Assigning a LazyPayload defers reading the value from its flowstate archive until first use."""
+        if isinstance(value, LazyPayload):
+            self._payload = value
+            self._loaded_value = ""
+        else:
+            self._payload = None
+            self._loaded_value = value
+
+    def is_loaded(self) -> bool:
+        """False while the value is still waiting in a flowstate archive."""
+        return self._payload is None
+
     @property
     def is_default(self) -> bool:
         return self._is_default
@@ -84,10 +147,17 @@ class Parm:
     def default_value(self):
         return self._default_value
 
-    def set(self, value: Union[int, float, str, List[str], bool, Dict[str, str]]) -> None:
+    def set(self, value: Union[int, float, str, List[str], bool, Dict[str, str], LazyPayload]) -> None:
+        """Sets the value, recording it for undo and marking the node dirty.
+
+        A LazyPayload is stored without being read; it always counts as a change,
+        as does replacing a value that has not been read yet.
+        """
         from core.undo_manager import UndoManager
 
-        if self._type == ParameterType.STRINGLIST:
+        if isinstance(value, LazyPayload):
+            new_value = value
+        elif self._type == ParameterType.STRINGLIST:
             if not isinstance(value, list):
                 raise TypeError(f"Expected list for STRINGLIST, got {type(value)}")
             new_value = [str(item) for item in value]
@@ -108,14 +178,20 @@ class Parm:
         else:
             raise TypeError(f"Cannot set value type {type(value)} for parameter type {self._type}")
 
-        if new_value != self._value:
-            UndoManager().push_state(f"Set {self.node().name()} parm: {self.name()} to {value}")
-            if self._default_value == "":
+        old_value = self._payload if self._payload is not None else self._value
+        lazy = isinstance(new_value, LazyPayload)
+        if lazy or isinstance(old_value, LazyPayload) or new_value != old_value:
+            registered = NodeEnvironment.nodes.get(self._node.path()) is self._node
+            if registered:
+                UndoManager().push_state(f"Set {self.node().name()} parm: {self.name()} to {value}")
+                UndoManager().record_parm(self, old_value, new_value)
+            if self._default_value == "" and not lazy:
                 self._default_value = new_value
             self._value = new_value
-            self._is_default = (self._value == self._default_value)
+            self._is_default = not lazy and new_value == self._default_value
+            self._invalidate_templates()
             if self._node.state() != NodeState.COOKING:
-                self._node.set_state(NodeState.UNCOOKED)
+                cook_scheduler.mark_dirty(self._node)
 
     def script_callback(self) -> str:
         """Return the contents of the script that gets runs when this parameter changes."""
@@ -207,17 +283,15 @@ class Parm:
 
     def eval(self) -> Any:
         if self._type == ParameterType.STRINGLIST:
-            return [self._expand_and_evaluate(str(item)) for item in self._value]
+            return [self._render(str(item)) for item in self._value]
         elif self._type == ParameterType.INT:
             return int(self._value)
         elif self._type == ParameterType.FLOAT:
             return float(self._value)
         elif self._type == ParameterType.STRING:
             if self.is_expression():
-                #print(f"CONTAINS EXPRESSION {self.raw_value()}")
-                return self._expand_and_evaluate(str(self._value))
+                return self._render(str(self._value))
             else:
-                #print(f"DOES NOT CONTAIN EXPRESSION  {self.raw_value()}")
                 return str(self._value)
         elif self._type == ParameterType.TOGGLE:
             return bool(self._value)
@@ -226,6 +300,30 @@ class Parm:
         else:
             raise OperationFailed(f"Unsupported parameter type: {self._type}")
 
+    def _invalidate_templates(self) -> None:
+        self._templates.clear()
+        self._templates_value = self._value if self.is_loaded() else None
+        self._is_expression = None
+
+    def _template(self, text: str) -> Optional[ParmTemplate]:
+        """Returns the compiled template for text, parsing it on first use after each set()."""
+        if self._value is not self._templates_value:
+            self._invalidate_templates()
+        try:
+            return self._templates[text]
+        except KeyError:
+            template = ParmTemplate.compile(text, self.__compiled_patterns, self._check_script_safety)
+            self._templates[text] = template
+            return template
+
+    def _render(self, text: str) -> str:
+        template = self._template(text)
+        if template is not None:
+            result = template.render(self)
+            if result is not None:
+                return result
+        return self._expand_and_evaluate(text)
+
     def raw_value(self) -> str:
         """Returns the parameter's raw text value without evaluation or expansion."""
         return self._value
@@ -245,21 +343,11 @@ class Parm:
 
     def is_expression(self) -> bool:
         """Returns True if the parameter contains one or more valid functions accoring to self.__patterns ."""
-        all_patterns = self._get_patterns()
-        matches = re.finditer(all_patterns, self._value)
-        
-        # Store result before printing since we need to use matches twice
-        has_matches = False
-        matching_strings = []
-        
-        for match in matches:
-            has_matches = True
-            matching_strings.append(match.group(0))
-        
-        if matching_strings:
-            #print(f"Expression matches in {self.name()}: {matching_strings}")
-            
-            return has_matches
+        if self._value is not self._templates_value:
+            self._invalidate_templates()
+        if self._is_expression is None:
+            self._is_expression = bool(self.__any_pattern.search(self._value))
+        return self._is_expression
 
     def _process_global(self, match) -> str:
         var_part = match.group(0)
@@ -362,66 +450,76 @@ class Parm:
             return expression
 
     def _process_python_code(self, match) -> str:
-        script = match.group(1)
+        return self._evaluate_script(match.group(1))
+
+    def _evaluate_script(self, script: str, code: Optional[CodeType] = None,
+                         safe: Optional[bool] = None) -> str:
         print(f"🐍 Evaluating: {script}")
-        
-        if not self._check_script_safety(script):
+
+        if safe is None:
+            safe = self._check_script_safety(script)
+        if not safe:
             print("🐍 Error: Unsafe script detected")
             raise ValueError("Script contains unsafe operations")
-            
+
         try:
             safe_globals = self.create_safe_globals()
-            result = str(eval(script, safe_globals, {}))
+            result = str(eval(code if code is not None else script, safe_globals, {}))
             print(f"🐍 Result: {result}")
             return result
         except Exception as e:
             print(f"🐍 Error evaluating script: {e}")
-            return match.group(0)
+            return f"`{script}`"
+
+    def _render_loop_number(self) -> str:
+        loop_number = loop_manager.get_current_loop(self.node().path()) - 1
+        print(f"🔢 Loop number {loop_number}")
+        return str(loop_number)
 
     def _expand_and_evaluate(self, value: str) -> str:
+        patterns = self.__compiled_patterns
         result = value
-        #print(f"\n🔄 Processing: {value}")
 
         # Stage 1: Global Variables
-        result = re.sub(self._get_patterns('GLOBAL'), 
-                       self._process_global, result)
+        result = patterns['GLOBAL'].sub(self._process_global, result)
 
         # Stage 2: Loop Number
-        loop_number = loop_manager.get_current_loop(self.node().path()) - 1
-        result = result.replace("$$L", str(loop_number))
-        if "$$L" in value:
-            print(f"🔢 Loop number {loop_number}")
+        if "$$L" in result:
+            loop_number = loop_manager.get_current_loop(self.node().path()) - 1
+            result = result.replace("$$L", str(loop_number))
+            if "$$L" in value:
+                print(f"🔢 Loop number {loop_number}")
 
         # Stage 3: List Access (combined)
-        result = re.sub(self._get_patterns('LIST_ACCESS'), 
-                       self._process_list_access, result)
+        result = patterns['LIST_ACCESS'].sub(self._process_list_access, result)
 
         # Stage 4: Python Code
-        result = re.sub(self._get_patterns('PYTHON_CODE'), 
-                       self._process_python_code, result)
+        result = patterns['PYTHON_CODE'].sub(self._process_python_code, result)
 
-        #print(f"🔄 Final result: {result}\n")
         return result
 
 
     def create_safe_globals(self):
-        allowed_builtins = [
-            'len', 'abs', 'round', 'min', 'max', 'sum',
-            'sorted', 'reversed', 'list', 'tuple', 'set', 'dict',
-            'range', 'enumerate', 'zip',
-            'isinstance', 'type', 'ascii',
-            'int', 'float', 'str', 'bool',
-            'print', 'True', 'False', 'None'
-        ]
-        safe_builtins = {name: getattr(builtins, name) for name in allowed_builtins}
-        safe_modules = {
-            'math': math,
-            'datetime': datetime,
-            'random': random
-        }
-
-        # Combine safe_builtins and safe_modules
-        return {'__builtins__': safe_builtins, **safe_modules}
+        if Parm.__safe_globals is None:
+            allowed_builtins = [
+                'len', 'abs', 'round', 'min', 'max', 'sum',
+                'sorted', 'reversed', 'list', 'tuple', 'set', 'dict',
+                'range', 'enumerate', 'zip',
+                'isinstance', 'type', 'ascii',
+                'int', 'float', 'str', 'bool',
+                'print', 'True', 'False', 'None'
+            ]
+            safe_builtins = {name: getattr(builtins, name) for name in allowed_builtins}
+            safe_builtins.update(similarity=similarity, matches=matches)
+            safe_modules = {
+                'math': math,
+                'datetime': datetime,
+                'random': random
+            }
+
+            # Combine safe_builtins and safe_modules
+            Parm.__safe_globals = {'__builtins__': safe_builtins, **safe_modules}
+        return {**Parm.__safe_globals, **_expression_scope.get()}
 
     def _check_script_safety(self, script: str) -> bool:
         """
@@ -477,6 +575,8 @@ class Parm:
         return True
 
     def _expand_loop_number(self, value: str) -> str: 
+        if "$$L" not in value:
+            return value
         loop_number = loop_manager.get_current_loop(self.node().path()) - 1
         result = value.replace("$$L", str(loop_number))
         return result
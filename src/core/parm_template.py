@@ -0,0 +1,132 @@
+"""Compiled form of a parameter value for fast repeated evaluation.
+
+Parm.eval() expands four kinds of expression, always in the same order:
+global variables ($FOO, $FOO+4), the loop number ($$L), list access ($$N,
+$$N*2, $$1) and backticked Python code. Running those as four re.sub passes
+on every call is wasteful when the same value is evaluated once per loop
+iteration, so ParmTemplate parses the value once into literal segments and
+typed placeholders, checks and compiles every constant code span up front,
+and evaluation becomes a walk over the placeholders followed by a join.
+
+Rendering reproduces the stage order of Parm._expand_and_evaluate, so the
+result is identical. Values that the stages could rewrite in ways a template
+cannot express (a literal '$' left over after parsing, or a substituted value
+that introduces '$' or '`') are reported as not compilable (compile() returns
+None, render() returns None) and the caller falls back to the regex passes.
+
+Example:
+    >>> template = ParmTemplate.compile("item $$N is `2 * 3`", patterns, is_safe)
+    >>> template.render(parm)
+    'item apple is 6'
+"""
+
+import re
+from dataclasses import dataclass
+from types import CodeType
+from typing import Callable, Dict, List, Optional, Pattern, Tuple, Union, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from core.parm import Parm
+
+
+GLOBAL = 'GLOBAL'
+LOOP_NUMBER = 'LOOP_NUMBER'
+LIST_ACCESS = 'LIST_ACCESS'
+PYTHON_CODE = 'PYTHON_CODE'
+
+_HOLD = "\x00"
+_HELD = re.compile("\x00(\\d+)\x00")
+
+Segment = Union[str, int]
+
+
+@dataclass(frozen=True)
+class Placeholder:
+    kind: str
+    match: Optional[re.Match] = None
+    source: Tuple[Segment, ...] = ()
+    code: Optional[CodeType] = None
+    safe: Optional[bool] = None
+
+
+def _split(held: str) -> Tuple[Segment, ...]:
+    parts = _HELD.split(held)
+    segments: List[Segment] = []
+    for i, part in enumerate(parts):
+        if i % 2:
+            segments.append(int(part))
+        elif part:
+            segments.append(part)
+    return tuple(segments)
+
+
+class ParmTemplate:
+    def __init__(self, segments: Tuple[Segment, ...], placeholders: List[Placeholder]):
+        self.segments = segments
+        self.placeholders = placeholders
+        self._stages = {
+            kind: [i for i, p in enumerate(placeholders) if p.kind == kind]
+            for kind in (GLOBAL, LOOP_NUMBER, LIST_ACCESS, PYTHON_CODE)
+        }
+
+    @classmethod
+    def compile(cls, text: str, patterns: Dict[str, Pattern],
+                is_safe: Callable[[str], bool]) -> Optional['ParmTemplate']:
+        if _HOLD in text:
+            return None
+        placeholders: List[Placeholder] = []
+
+        def hold(placeholder: Placeholder) -> str:
+            placeholders.append(placeholder)
+            return f"{_HOLD}{len(placeholders) - 1}{_HOLD}"
+
+        held = patterns[GLOBAL].sub(lambda m: hold(Placeholder(GLOBAL, m)), text)
+        if "$$L" in held:
+            held = held.replace("$$L", hold(Placeholder(LOOP_NUMBER)))
+        held = patterns[LIST_ACCESS].sub(lambda m: hold(Placeholder(LIST_ACCESS, m)), held)
+        if "$" in held:
+            return None
+        held = patterns[PYTHON_CODE].sub(lambda m: hold(cls._compile_code(m.group(1), is_safe)), held)
+        return cls(_split(held), placeholders)
+
+    @staticmethod
+    def _compile_code(held_source: str, is_safe: Callable[[str], bool]) -> Placeholder:
+        source = _split(held_source)
+        if any(isinstance(segment, int) for segment in source):
+            return Placeholder(PYTHON_CODE, source=source)
+        script = "".join(source)
+        safe = is_safe(script)
+        code = None
+        if safe:
+            try:
+                code = compile(script, "<parm>", "eval")
+            except SyntaxError:
+                code = None
+        return Placeholder(PYTHON_CODE, source=source, code=code, safe=safe)
+
+    def render(self, parm: 'Parm') -> Optional[str]:
+        """Evaluates the template for parm, or returns None if the regex passes must be used instead."""
+        if not self.placeholders:
+            return "".join(self.segments)
+        placeholders = self.placeholders
+        values: List[Optional[str]] = [None] * len(placeholders)
+
+        for i in self._stages[GLOBAL]:
+            match = placeholders[i].match
+            value = parm._process_global(match)
+            if value != match.group(0) and ("$" in value or "`" in value):
+                return None
+            values[i] = value
+        for i in self._stages[LOOP_NUMBER]:
+            values[i] = parm._render_loop_number()
+        for i in self._stages[LIST_ACCESS]:
+            value = parm._process_list_access(placeholders[i].match)
+            if "`" in value:
+                return None
+            values[i] = value
+        for i in self._stages[PYTHON_CODE]:
+            placeholder = placeholders[i]
+            script = "".join(s if isinstance(s, str) else values[s] for s in placeholder.source)
+            values[i] = parm._evaluate_script(script, code=placeholder.code, safe=placeholder.safe)
+
+        return "".join(s if isinstance(s, str) else values[s] for s in self.segments)
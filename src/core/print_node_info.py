@@ -21,3 +21,7 @@ def print_node_info(node):
     print(f"Warnings: {node.warnings()}")
     print(f"Last Cook Time: {node.last_cook_time()}")
     print(f"Cook Count: {node.cook_count()}")
+    memo_stats = node.memo_stats()
+    if memo_stats is not None:
+        print(f"Item Memo: {memo_stats['last_hits']} hits / {memo_stats['last_misses']} misses last cook, "
+              f"{memo_stats['hit_ratio']:.0%} hit ratio overall ({memo_stats['entries']} entries)")
@@ -1,10 +1,16 @@
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from typing import List, Dict, Any, Optional, Tuple
 from core.base_classes import Node, NodeType, NodeState
 from core.parm import Parm, ParameterType
-from core.llm_utils import get_clean_llm_response, get_clean_llm_response_with_tokens
+from core.llm_utils import get_clean_llm_response, get_clean_llm_response_with_tokens, get_streamed_llm_response
 from core.findLLM import *
 from core.enums import FunctionalGroup
 from core.token_manager import get_token_manager
+from core.models import TokenUsage
+from core.llm_cache import CACHE_MODES, CACHE_FIRST, REFRESH
+from core.llm_config import get_llm_config, LLMBackend
+from core.stream_events import emit_chunk
 
 class QueryNode(Node):
 
@@ -24,6 +30,13 @@ class QueryNode(Node):
         llm_name (str): Identifier for the target LLM (e.g., "Ollama"). Defaults to "Ollama" but can be auto-detected.
         find_llm (button): Triggers automatic LLM detection and updates `llm_name` with the found installation.
         respond (button): Forces reprocessing of current prompts, updating responses regardless of cache.
+        max_concurrency (int): Number of prompts kept in flight against the LLM at once. Defaults to 1 (sequential).
+        cache_mode (menu): "cache_first" (default) answers repeated prompts from the on-disk response cache,
+            "refresh" always queries and updates the cache, "bypass" ignores the cache entirely.
+            Cached answers still report the tokens their original query used; token_usage shows
+            how many of them came from the cache.
+        stream (bool): Requests a streamed response (Ollama NDJSON or OpenAI-style SSE) and publishes each
+            piece of text through core.stream_events as it arrives. The output is still the full responses.
 
     Example:
         >>> query_node = Node.create_node(NodeType.QUERY)
@@ -60,9 +73,13 @@ class QueryNode(Node):
         **Performance Considerations:**
         
         *   This node is always time-dependent.
-        *   Response caching is available but not forced.
+        *   Responses are cached on disk by backend, model settings and prompt, so re-running
+            unchanged prompts makes no network calls unless 'cache_mode' says otherwise.
+            Pressing 'respond' always refreshes the cached responses.
         *   Resource usage scales with input size.
         *   Consider using 'limit' for large prompt sets.
+        *   Raise 'max_concurrency' for large prompt sets when the backend can serve parallel requests;
+            output order and per-prompt error slots are preserved.
     """
 
 
@@ -83,7 +100,10 @@ class QueryNode(Node):
             "find_llm": Parm("find_llm", ParameterType.BUTTON, self),
             "respond": Parm("respond", ParameterType.BUTTON, self),
             "track_tokens": Parm("track_tokens", ParameterType.TOGGLE, self),
-            "token_usage": Parm("token_usage", ParameterType.STRING, self)
+            "token_usage": Parm("token_usage", ParameterType.STRING, self),
+            "max_concurrency": Parm("max_concurrency", ParameterType.INT, self),
+            "cache_mode": Parm("cache_mode", ParameterType.MENU, self),
+            "stream": Parm("stream", ParameterType.TOGGLE, self)
         })
 
         # Set default values
@@ -92,6 +112,10 @@ class QueryNode(Node):
         self._parms["llm_name"].set("Ollama")
         self._parms["track_tokens"].set("True")
         self._parms["token_usage"].set("")
+        self._parms["max_concurrency"].set(1)
+        self._parms["cache_mode"].set(CACHE_FIRST)
+        self._parms["stream"].set(False)
+        self._refresh_next_cook = False
 
         # Set button callbacks
         self._parms["find_llm"].set_script_callback(self._find_llm_callback)
@@ -120,32 +144,40 @@ class QueryNode(Node):
         track_tokens = self._parms["track_tokens"].eval()
         token_manager = get_token_manager() if track_tokens else None
 
+        max_concurrency = max(1, int(self._parms["max_concurrency"].eval() or 1))
+        cache_mode = self._parms["cache_mode"].eval()
+        if cache_mode not in CACHE_MODES:
+            self.add_warning(f"Unknown cache_mode '{cache_mode}', using '{CACHE_FIRST}'")
+            cache_mode = CACHE_FIRST
+        if self._refresh_next_cook:
+            cache_mode = REFRESH
+            self._refresh_next_cook = False
+        backend = get_llm_config().backend()
+        stream = self._parms["stream"].eval()
+        results = self._dispatch_prompts(input_data, track_tokens, max_concurrency, cache_mode, backend, stream)
+
         responses = []
         total_input_tokens = 0
         total_output_tokens = 0
         total_tokens = 0
-
-        for prompt in input_data:
-            try:
-                if track_tokens:
-                    llm_response = get_clean_llm_response_with_tokens(prompt)
-                    responses.append(llm_response.content)
-
-                    if llm_response.token_usage:
-                        token_manager.add_usage(self.name(), llm_response.token_usage)
-                        total_input_tokens += llm_response.token_usage.input_tokens
-                        total_output_tokens += llm_response.token_usage.output_tokens
-                        total_tokens += llm_response.token_usage.total_tokens
-                else:
-                    response = get_clean_llm_response(prompt)
-                    responses.append(response)
-
-            except Exception as e:
-                self.add_error(f"Error processing prompt: {str(e)}")
-                responses.append("")
+        cached_tokens = 0
+
+        for content, token_usage, error in results:
+            if error is not None:
+                self.add_error(f"Error processing prompt: {error}")
+            responses.append(content)
+            if token_usage:
+                token_manager.add_usage(self.name(), token_usage)
+                total_input_tokens += token_usage.input_tokens
+                total_output_tokens += token_usage.output_tokens
+                total_tokens += token_usage.total_tokens
+                if token_usage.cached:
+                    cached_tokens += token_usage.total_tokens
 
         if track_tokens:
             token_summary = f"Input: {total_input_tokens}, Output: {total_output_tokens}, Total: {total_tokens}"
+            if cached_tokens:
+                token_summary += f" (Cached: {cached_tokens})"
             self._parms["token_usage"].set(token_summary)
         else:
             self._parms["token_usage"].set("Token tracking disabled")
@@ -154,11 +186,43 @@ class QueryNode(Node):
         self._output = responses
         self.set_state(NodeState.UNCHANGED)
 
+    def _dispatch_prompts(self, prompts: List[str], track_tokens: bool, max_concurrency: int,
+                          cache_mode: str, backend: Optional[LLMBackend] = None, stream: bool = False
+                          ) -> List[Tuple[str, Optional[TokenUsage], Optional[str]]]:
+        """
+        Sends every prompt to the LLM, keeping up to max_concurrency requests in flight.
+        Returns one (content, token_usage, error) tuple per prompt, in prompt order.
+        """
+        node_path = self.path()
+
+        def query(index: int, prompt: str) -> Tuple[str, Optional[TokenUsage], Optional[str]]:
+            try:
+                if stream:
+                    llm_response = get_streamed_llm_response(
+                        prompt, on_chunk=lambda text: emit_chunk(node_path, index, text),
+                        cache_mode=cache_mode, backend=backend)
+                    return llm_response.content, llm_response.token_usage if track_tokens else None, None
+                if track_tokens:
+                    llm_response = get_clean_llm_response_with_tokens(prompt, cache_mode=cache_mode, backend=backend)
+                    return llm_response.content, llm_response.token_usage, None
+                return get_clean_llm_response(prompt, cache_mode=cache_mode, backend=backend), None, None
+            except Exception as e:
+                return "", None, str(e)
+
+        if max_concurrency == 1 or len(prompts) <= 1:
+            return [query(index, prompt) for index, prompt in enumerate(prompts)]
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, len(prompts)),
+                                thread_name_prefix="tloom-query") as executor:
+            futures = [executor.submit(copy_context().run, query, index, prompt)
+                       for index, prompt in enumerate(prompts)]
+            return [future.result() for future in futures]
+
     def _find_llm_callback(self) -> None:
         llm_name = find_local_LLM()
         self._parms["llm_name"].set(llm_name)
 
     def _respond_callback(self) -> None:
+        self._refresh_next_cook = True
         self.cook(force=True)
 
     def input_names(self) -> Dict[int, str]:
@@ -5,6 +5,7 @@ from typing import Dict, Tuple
 from core.base_classes import Node, NodeType, NodeState
 from core.parm import Parm, ParameterType
 from core.enums import FunctionalGroup
+from core.item_memo import ItemMemo
 
 
 class SearchNode(Node):
@@ -86,6 +87,7 @@ class SearchNode(Node):
         self._is_time_dependent = False
         self._input_hash = None
         self._param_hash = None
+        self._item_memo = ItemMemo()
         self._output = [[], [], []]
 
         self._parms.update({
@@ -130,8 +132,9 @@ class SearchNode(Node):
         matcher = evaluators.get(boolean_mode, lambda item: False)
         matching, non_matching = [], []
 
-        for item in items:
-            (matching if matcher(item) != invert else non_matching).append(item)
+        matched = self._item_memo.map(items, self._compute_param_hash(), lambda item: matcher(item) != invert)
+        for item, is_match in zip(items, matched):
+            (matching if is_match else non_matching).append(item)
 
         return matching, non_matching
 
@@ -170,7 +173,7 @@ class SearchNode(Node):
                         conn.input_node().set_state(NodeState.UNCOOKED)
 
         self._param_hash = self._compute_param_hash()
-        self._input_hash = hashlib.md5(str(input_data).encode()).hexdigest()
+        self._input_hash = self.input_fingerprint()
         self.set_state(NodeState.UNCHANGED)
         self._last_cook_time = (time.time() - start_time) * 1000
 
@@ -179,7 +182,7 @@ class SearchNode(Node):
             return True
         try:
             return (self._compute_param_hash('raw_value') != self._param_hash or
-                    hashlib.md5(str(self._get_input_data()).encode()).hexdigest() != self._input_hash)
+                    self.input_fingerprint() != self._input_hash)
         except Exception:
             return True
 
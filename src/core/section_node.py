@@ -332,7 +332,7 @@ class SectionNode(Node):
             str(self._parms["trim_prefix"].eval()) +
             self._parms["regex_file"].eval()
         )
-        self._input_hash = self._calculate_hash(str(input_data))
+        self._input_hash = self.input_fingerprint()
 
         self.set_state(NodeState.UNCHANGED)
         self._last_cook_time = (time.time() - start_time) * 1000
@@ -350,16 +350,7 @@ class SectionNode(Node):
             self._parms["regex_file"].eval()
         )
 
-        input_data = []
-        if self.inputs():
-            input_node = self.inputs()[0].output_node()
-            raw_input = input_node.eval(requesting_node=self)
-            if isinstance(raw_input, list) and all(isinstance(x, str) for x in raw_input):
-                input_data = raw_input
-
-        new_input_hash = self._calculate_hash(str(input_data))
-
-        if new_input_hash != self._input_hash:
+        if self.input_fingerprint() != self._input_hash:
             return True
 
         if new_param_hash != self._param_hash:
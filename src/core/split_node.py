@@ -180,7 +180,7 @@ class SplitNode(Node):
             self._output = [input_data if input_data else [], [], []]
 
         self._param_hash = self._calculate_hash(str(enabled) + split_expr)
-        self._input_hash = self._calculate_hash(str(input_data))
+        self._input_hash = self.input_fingerprint()
         
         self.set_state(NodeState.UNCHANGED)
         self._last_cook_time = (time.time() - start_time) * 1000
@@ -193,16 +193,7 @@ class SplitNode(Node):
             enabled = self._parms["enabled"].eval()  # Changed to eval()
             split_expr = self._parms["split_expr"].eval()  # Changed to eval()
             new_param_hash = self._calculate_hash(str(enabled) + split_expr)
-
-            input_data = []
-            if self.inputs():
-                input_node = self.inputs()[0].output_node()
-                raw_input = input_node.eval(requesting_node=self)
-                if isinstance(raw_input, list) and all(isinstance(x, str) for x in raw_input):
-                    input_data = raw_input
-
-            new_input_hash = self._calculate_hash(str(input_data))
-            return new_input_hash != self._input_hash or new_param_hash != self._param_hash
+            return self.input_fingerprint() != self._input_hash or new_param_hash != self._param_hash
         except Exception:
             return True
 
@@ -0,0 +1,90 @@
+"""Incremental output events for nodes that produce text while they cook.
+
+A streaming node (QueryNode with its stream parm on) calls emit_chunk() for
+every piece of text it receives. Whoever asked for the cook can listen for
+those chunks, either with a callback for the duration of a block:
+
+    >>> with listen(lambda chunk: print(chunk.text, end="")):
+    ...     query_node.eval()
+
+or by iterating stream_eval(), which cooks the node on a worker thread and
+yields StreamChunk events as they arrive, followed by a single StreamDone that
+carries the node's final output:
+
+    >>> for event in stream_eval(query_node):
+    ...     if isinstance(event, StreamChunk):
+    ...         print(event.text, end="")
+
+Listeners are held in a context variable, so they follow the cook into the
+cook scheduler's worker threads and never leak between concurrent requests.
+"""
+
+import queue
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, Optional, Union, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from core.node import Node
+
+
+@dataclass(frozen=True)
+class StreamChunk:
+    node_path: str
+    item_index: int
+    text: str
+
+
+@dataclass(frozen=True)
+class StreamDone:
+    output: Any = None
+    error: Optional[BaseException] = None
+
+
+_stream_listener: ContextVar[Optional[Callable[[StreamChunk], None]]] = ContextVar(
+    'stream_listener', default=None
+)
+
+
+def is_listening() -> bool:
+    return _stream_listener.get() is not None
+
+
+def emit_chunk(node_path: str, item_index: int, text: str) -> None:
+    listener = _stream_listener.get()
+    if listener is not None and text:
+        listener(StreamChunk(node_path=node_path, item_index=item_index, text=text))
+
+
+@contextmanager
+def listen(callback: Callable[[StreamChunk], None]) -> Iterator[None]:
+    token = _stream_listener.set(callback)
+    try:
+        yield
+    finally:
+        _stream_listener.reset(token)
+
+
+def stream_eval(node: 'Node', force: bool = False) -> Iterator[Union[StreamChunk, StreamDone]]:
+    events: "queue.Queue[Union[StreamChunk, StreamDone]]" = queue.Queue()
+
+    def run() -> None:
+        with listen(events.put):
+            try:
+                output = node.eval(force=force)
+            except BaseException as e:
+                events.put(StreamDone(error=e))
+                return
+        events.put(StreamDone(output=output))
+
+    context = copy_context()
+    worker = threading.Thread(target=context.run, args=(run,), name="tloom-stream", daemon=True)
+    worker.start()
+    while True:
+        event = events.get()
+        yield event
+        if isinstance(event, StreamDone):
+            break
+    worker.join()
@@ -5,6 +5,7 @@ from typing import Dict
 from core.base_classes import Node, NodeType, NodeState
 from core.parm import Parm, ParameterType
 from core.enums import FunctionalGroup
+from core.item_memo import ItemMemo
 
 
 class StringTransformNode(Node):
@@ -43,6 +44,7 @@ class StringTransformNode(Node):
         self._is_time_dependent = False
         self._input_hash = None
         self._param_hash = None
+        self._item_memo = ItemMemo()
 
         self._parms.update({
             "operation": Parm("operation", ParameterType.MENU, self),
@@ -111,17 +113,20 @@ class StringTransformNode(Node):
         p = lambda k: self._parms[k].eval()
         input_data = self._get_input_data()
 
-        self._output = input_data if not p('enabled') or not input_data else [
-            self._transform_item(item, p('operation'),
-                find=p('find_text'), replace=p('replace_text'),
-                use_regex=p('use_regex'), case_sensitive=p('case_sensitive'),
-                case_mode=p('case_mode'), trim_mode=p('trim_mode'),
-                normalize_spaces=p('normalize_spaces'))
-            for item in input_data
-        ]
-
         self._param_hash = self._compute_param_hash()
-        self._input_hash = hashlib.md5(str(input_data).encode()).hexdigest()
+        if not p('enabled') or not input_data:
+            self._output = input_data
+        else:
+            params = dict(find=p('find_text'), replace=p('replace_text'),
+                          use_regex=p('use_regex'), case_sensitive=p('case_sensitive'),
+                          case_mode=p('case_mode'), trim_mode=p('trim_mode'),
+                          normalize_spaces=p('normalize_spaces'))
+            operation = p('operation')
+            self._output = self._item_memo.map(
+                input_data, self._param_hash,
+                lambda item: self._transform_item(item, operation, **params))
+
+        self._input_hash = self.input_fingerprint()
         self.set_state(NodeState.UNCHANGED)
         self._last_cook_time = (time.time() - start_time) * 1000
 
@@ -130,7 +135,7 @@ class StringTransformNode(Node):
             return True
         try:
             return (self._compute_param_hash('raw_value') != self._param_hash or
-                    hashlib.md5(str(self._get_input_data()).encode()).hexdigest() != self._input_hash)
+                    self.input_fingerprint() != self._input_hash)
         except Exception:
             return True
 
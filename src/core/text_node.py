@@ -98,8 +98,12 @@ class TextNode(Node):
             result = parsed_strings
 
         self._output = result
-        self._param_hash = self._calculate_hash(text_string + str(per_item))
-        self._input_hash = self._calculate_hash(str(input_data)) if pass_through and input_data else None
+        self._param_hash = self._calculate_hash(
+            self._parms["text_string"].raw_value() +
+            str(self._parms["prefix"].raw_value()) +
+            str(self._parms["per_item"].raw_value())
+        )
+        self._input_hash = self.input_fingerprint() if pass_through else None
         self.set_state(NodeState.UNCHANGED)
 
         self._last_cook_time = (time.time() - start_time) * 1000
@@ -129,9 +133,7 @@ class TextNode(Node):
             new_param_hash = self._calculate_hash(text_string + str(prefix) + str(per_item))
 
             if pass_through:
-                input_data = self.inputs()[0].output_node().get_output() if self.inputs() else []  # CHANGED: use get_output() instead of eval()
-                new_input_hash = self._calculate_hash(str(input_data))
-                return new_input_hash != self._input_hash or new_param_hash != self._param_hash
+                return self.input_fingerprint() != self._input_hash or new_param_hash != self._param_hash
             else:
                 return new_param_hash != self._param_hash
         except Exception:
@@ -3,25 +3,30 @@
 Provides session-wide and per-node token usage tracking with timestamped history.
 Supports accumulation across multiple queries and provides data structures ready
 for JSON serialization to React GUI. Thread-safe for concurrent access.
+There is one TokenManager per core.workspace.Workspace.
+Usage replayed from the LLM response cache counts towards the totals like any
+other and is flagged cached in its history entry.
 """
 
 from typing import Dict, List, Any
 from datetime import datetime
 from threading import Lock
 from core.models import TokenUsage
+from core.workspace import current_workspace
 
 
 class TokenManager:
-    _instance = None
     _lock = Lock()
 
     def __new__(cls):
-        if cls._instance is None:
+        workspace = current_workspace()
+        if workspace.token_manager is None:
             with cls._lock:
-                if cls._instance is None:
-                    cls._instance = super(TokenManager, cls).__new__(cls)
-                    cls._instance._initialized = False
-        return cls._instance
+                if workspace.token_manager is None:
+                    instance = super(TokenManager, cls).__new__(cls)
+                    instance._initialized = False
+                    workspace.token_manager = instance
+        return workspace.token_manager
 
     def __init__(self):
         if self._initialized:
@@ -47,7 +52,8 @@ class TokenManager:
                 "node_name": node_name,
                 "input_tokens": token_usage.input_tokens,
                 "output_tokens": token_usage.output_tokens,
-                "total_tokens": token_usage.total_tokens
+                "total_tokens": token_usage.total_tokens,
+                "cached": token_usage.cached
             }
             self._history.append(entry)
 
@@ -1,20 +1,25 @@
+from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Set, Tuple, Any, Union, Deque
-from enum import Enum
-from pathlib import PurePosixPath
+from typing import Dict, Iterator, List, Optional, Tuple, Any, Deque
 from collections import deque
-from weakref import WeakSet
+from contextlib import contextmanager
 from TUI.logging_config import get_logger
-from core.base_classes import NodeEnvironment, Node, NodeConnection, NodeType, NodeState
+from core.base_classes import NodeEnvironment, Node, NodeConnection
+from core.internal_path import InternalPath
 from core.parm import Parm
+from core.workspace import current_workspace
 
 """
 Undo System Implementation Guide:
 
 Key Principles:
-- Push state BEFORE changes occur (like a bookmark)
-- Each undoable action pushes its own state
-- Parent methods must disable undo for child methods that push state
+- Push state BEFORE changes occur (like a bookmark); push_state opens a new
+  undo entry named after the operation
+- The change itself records what it did as an inverse delta (parm old/new
+  value, connection added/removed, node created/destroyed, global changed,
+  node moved) into the entry that is currently open
+- Parent methods must disable undo for child methods that push state, so the
+  child's deltas land in the parent's entry instead of opening a new one
 - Always use try/finally when disabling undo to ensure it's re-enabled
 
 Example Pattern:
@@ -29,400 +34,343 @@ Example Pattern:
 
     def child_method():
         UndoManager().push_state("Child operation")
-        # make changes
+        # make changes, recording each one, e.g.
+        UndoManager().record_parm(parm, old_value, new_value)
+
+Bulk edits (loading a flowstate, creating a node and setting its parms) should
+run inside a transaction, which opens one entry and ignores every push_state
+made inside it, however deeply nested, so the whole edit undoes in one step:
+    with UndoManager().transaction("Load flowstate"):
+        ...  # any number of create_node, set_input, Parm.set calls
 
 To avoid circular imports:
     from core.undo_manager import UndoManager
     UndoManager().push_state("Operation name")
 
 
-Stack Size: Limited to 100 operations. Arbitrary, but a starting point.
-Eventually it should be limited by memory, not number
-State Capture: Full network state including nodes, connections, parameters
-Restoration: Two-phase process (clear all, then rebuild) to avoid state conflicts
+History Size: Bounded by the estimated bytes held by the recorded deltas
+(MAX_UNDO_BYTES by default, see set_max_bytes), oldest entries go first.
+Deltas hold references to the values they replaced rather than copies, so an
+edit costs memory proportional to what it changed, not to the network.
+Undo applies an entry's deltas in reverse; redo applies them forward again.
 """
 
-MAX_STACK_SIZE = 100
+MAX_UNDO_BYTES = 64 * 1024 * 1024
+
+_MISSING = object()
+
+
+def estimate_bytes(value: Any) -> int:
+    """Rough size of a parm value, output or global, without copying it."""
+    if isinstance(value, str):
+        return len(value) + 48
+    if isinstance(value, (list, tuple)):
+        return 56 + 8 * len(value) + sum(estimate_bytes(item) for item in value)
+    if isinstance(value, dict):
+        return 64 + sum(estimate_bytes(k) + estimate_bytes(v) for k, v in value.items())
+    return 32
+
+
+class UndoDelta(ABC):
+    """One recorded change that can be reverted and reapplied."""
+    nbytes: int = 0
+
+    @abstractmethod
+    def undo(self) -> None:
+        """Reverts the change."""
+
+    @abstractmethod
+    def redo(self) -> None:
+        """Applies the change again after undo()."""
+
 
 @dataclass
-class ParmState:
-    """Captures the state of a parameter including its type, value, and callback"""
-    name: str
-    parm_type: str
-    value: Union[int, float, str, List[str], bool]
-    script_callback: str
+class ParmDelta(UndoDelta):
+    parm: Parm
+    old_value: Any
+    new_value: Any
+
+    def __post_init__(self):
+        self.nbytes = estimate_bytes(self.old_value) + estimate_bytes(self.new_value)
+
+    def undo(self) -> None:
+        self.parm.set(self.old_value)
+
+    def redo(self) -> None:
+        self.parm.set(self.new_value)
+
 
 @dataclass
-class NodeConnectionState:
-    """Represents a connection between two nodes with input/output references"""
-    output_node_path: str
-    input_node_path: str
+class ConnectionDelta(UndoDelta):
+    output_node: Node
     output_index: int
+    input_node: Node
     input_index: int
-    output_ref: Optional[WeakSet]
-    input_ref: Optional[WeakSet]
+    connected: bool
+    nbytes: int = 128
+
+    def undo(self) -> None:
+        self._apply(not self.connected)
+
+    def redo(self) -> None:
+        self._apply(self.connected)
+
+    def _apply(self, connect: bool) -> None:
+        existing = self.input_node._inputs.get(self.input_index)
+        matches = (existing is not None and existing.output_node() is self.output_node
+                   and existing.output_index() == self.output_index)
+        if connect and not matches:
+            self.input_node.set_input(self.input_index, self.output_node, self.output_index)
+        elif not connect and matches:
+            self.input_node.remove_connection(existing)
+
+
+@dataclass
+class NodeDelta(UndoDelta):
+    """A node created (created=True) or destroyed, along with the connections it had when destroyed."""
+    node: Node
+    created: bool
+    connections: List[Tuple[Node, int, Node, int]] = field(default_factory=list)
+
+    def __post_init__(self):
+        self.nbytes = 512 + 128 * len(self.connections)
+        if not self.created:
+            self.nbytes += sum(estimate_bytes(parm.raw_value()) for parm in self.node._parms.values())
+            self.nbytes += estimate_bytes(self.node._output)
+
+    def undo(self) -> None:
+        if self.created:
+            self.node.destroy()
+        else:
+            self._revive()
+
+    def redo(self) -> None:
+        if self.created:
+            self._revive()
+        else:
+            self.node.destroy()
+
+    def _revive(self) -> None:
+        from core.cook_scheduler import cook_scheduler
+        NodeEnvironment.nodes[self.node.path()] = self.node
+        for output_node, output_index, input_node, input_index in self.connections:
+            ConnectionDelta(output_node, output_index, input_node, input_index, True).redo()
+        cook_scheduler.mark_dirty(self.node)
+
 
 @dataclass
-class FullNodeState:
-    """Complete snapshot of a node's state including position, parameters, and connections"""
-    session_id: str
-    name: str
-    path: str
-    position: List[float]
-    node_type: str
-    state: str
-    errors: List[str]
-    warnings: List[str]
-    is_time_dependent: bool = False
-    last_cook_time: float = 0.0
-    cook_count: int = 0
-    file_hash: Optional[str] = None
-    param_hash: Optional[str] = None
-    last_input_size: int = 0
-    internal_nodes_created: bool = False
-    parent_looper: bool = False
-    parms: Dict[str, ParmState] = field(default_factory=dict)
-    inputs: Dict[str, NodeConnectionState] = field(default_factory=dict)
-    outputs: Dict[str, List[NodeConnectionState]] = field(default_factory=dict)
+class GlobalDelta(UndoDelta):
+    key: str
+    old_value: Any
+    new_value: Any
+
+    def __post_init__(self):
+        self.nbytes = 64 + estimate_bytes(self.old_value) + estimate_bytes(self.new_value)
+
+    def undo(self) -> None:
+        self._apply(self.old_value)
+
+    def redo(self) -> None:
+        self._apply(self.new_value)
+
+    def _apply(self, value: Any) -> None:
+        from core.global_store import GlobalStore
+        if value is _MISSING:
+            GlobalStore._instance.pop(self.key, None)
+        else:
+            GlobalStore._instance[self.key] = value
+
 
 @dataclass
-class GlobalStoreState:
-    """Captures the state of the global store dictionary"""
-    store: Dict[str, Any]
+class PathDelta(UndoDelta):
+    """Nodes renamed or moved; each entry is (node, path, name) from before the change."""
+    moves: List[Tuple[Node, str, str]]
+
+    def __post_init__(self):
+        self.nbytes = 128 * len(self.moves)
+
+    def undo(self) -> None:
+        self.moves = self._swap(self.moves)
+
+    def redo(self) -> None:
+        self.moves = self._swap(self.moves)
+
+    @staticmethod
+    def _swap(moves: List[Tuple[Node, str, str]]) -> List[Tuple[Node, str, str]]:
+        current = [(node, node.path(), node.name()) for node, _, _ in moves]
+        for node, path, _ in current:
+            if NodeEnvironment.nodes.get(path) is node:
+                del NodeEnvironment.nodes[path]
+        for node, path, name in moves:
+            node._path = InternalPath(path)
+            node._name = name
+            NodeEnvironment.nodes[path] = node
+        return current
+
 
 @dataclass
-class NetworkState:
-    """Complete network state including all nodes and global store data"""
-    nodes: Dict[str, FullNodeState]
-    global_store: GlobalStoreState
-    restore_order: List[str]
+class AttributeDelta(UndoDelta):
+    """A plain node attribute such as _position that is assigned directly."""
+    node: Node
+    attribute: str
+    value: Any
+    nbytes: int = 64
+
+    def undo(self) -> None:
+        self._swap()
+
+    def redo(self) -> None:
+        self._swap()
+
+    def _swap(self) -> None:
+        current = getattr(self.node, self.attribute)
+        setattr(self.node, self.attribute, self.value)
+        self.value = current
+
+
+@dataclass
+class UndoEntry:
+    """All deltas recorded between one push_state and the next."""
+    operation: str
+    deltas: List[UndoDelta] = field(default_factory=list)
+    nbytes: int = 0
+
 
 class UndoManager:
     """Singleton manager handling undo/redo operations for the node network.
-    
-    Maintains stacks of network states and provides methods to capture, restore,
-    and manage the history of network operations. Uses a singleton pattern to 
-    ensure consistent state management across the application.
+
+    Keeps a journal of undo entries, each holding the inverse deltas of one
+    operation, and provides methods to record, revert and reapply them. Uses a
+    singleton pattern to ensure consistent state management across the
+    application; there is one UndoManager per core.workspace.Workspace.
     """
-    _instance: Optional['UndoManager'] = None
-    _initialized: bool = False
     _undo_active: bool = True  # Class level variable
 
     def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(UndoManager, cls).__new__(cls)
-            cls._instance.logger = get_logger('undo', level=1)
-            cls._instance._undo_active = True
-            cls._initialized = False
-        return cls._instance
+        workspace = current_workspace()
+        if workspace.undo_manager is None:
+            instance = super(UndoManager, cls).__new__(cls)
+            instance.logger = get_logger('undo', level=1)
+            instance._undo_active = True
+            instance._initialized = False
+            workspace.undo_manager = instance
+        return workspace.undo_manager
 
     def __init__(self):
-        if not UndoManager._initialized:
-            self.undo_stack: Deque[Tuple[str, NetworkState]] = deque(maxlen=MAX_STACK_SIZE)
-            self.redo_stack: Deque[Tuple[str, NetworkState]] = deque(maxlen=MAX_STACK_SIZE)
+        if not self._initialized:
+            self.undo_stack: Deque[UndoEntry] = deque()
+            self.redo_stack: Deque[UndoEntry] = deque()
             self._restoring: bool = False
-            self._current_operation: Optional[str] = None
-            self._node_paths_restored: Set[str] = set()
+            self._open_entry: Optional[UndoEntry] = None
+            self._transaction_depth: int = 0
+            self._max_bytes: int = MAX_UNDO_BYTES
+            self._total_bytes: int = 0
             self.logger.info("Initializing UndoManager")
-            UndoManager._initialized = True
+            self._initialized = True
 
     @property
     def undo_active(self) -> bool:
         return self._undo_active
 
-    @undo_active.setter 
+    @undo_active.setter
     def undo_active(self, value: bool) -> None:
         self.logger.info(f"Setting undo_active to {value}")
         self._undo_active = value
 
-    def capture_network_state(self) -> NetworkState:
-        from core.global_store import GlobalStore
-        
-        """Captures the complete current state of the network including all nodes and global store.
-        Returns a NetworkState object containing all node states, connections, and global variables.
-        """
-
-        self.logger.debug("Capturing network state")
-        node_order = []
-        captured_nodes = {}
-        
-        all_nodes = NodeEnvironment.list_nodes()
-        self.logger.debug(f"Nodes found in environment: {all_nodes}")
-        
-        for node_path in all_nodes:
-            node = NodeEnvironment.node_from_name(node_path)
-            if not node:
-                self.logger.debug(f"Skipping non-existent node: {node_path}")
-                continue
-            
-            self.logger.debug(f"Capturing state for node: {node_path}")
-            node_order.append(node_path)
-            captured_nodes[node_path] = self._capture_node_state(node)
-            
-        self.logger.debug(f"Captured nodes: {list(captured_nodes.keys())}")
-        self.logger.debug(f"Node order: {node_order}")
-        
-        network_state = NetworkState(
-            nodes=captured_nodes,
-            global_store=GlobalStoreState(dict(GlobalStore.list())),
-            restore_order=node_order
-        )
-        self.logger.debug(f"Final network state nodes: {list(network_state.nodes.keys())}")
-        return network_state
-
-    def _capture_node_state(self, node: 'Node') -> FullNodeState:
-
-        """
-        Creates a comprehensive snapshot of a single node's current state.
-        Includes parameters, connections, position, and internal state variables.
-        Returns a FullNodeState object.
-        """
-
-        node_session_id = node.session_id()
-        self.logger.debug(f"[UNDO_CAPTURE] Capturing state for {node.path()}, session_id={node_session_id}")
-
-        parms = {}
-        if hasattr(node, '_parms'):
-            for parm_name, parm in node._parms.items():
-                # Validate that parm is actually a Parm object
-                if not hasattr(parm, 'type') or not callable(parm.type):
-                    self.logger.error(f"[UNDO_CAPTURE] Invalid parm object for {parm_name} in {node.path()}: type={type(parm)}, value={parm}")
-                    self.logger.error(f"[UNDO_CAPTURE] This indicates deserialization failure - parm should be a Parm object")
-                    # Skip this invalid parm instead of crashing
-                    continue
-
-                if str(parm.type()) == 'ParameterType.BUTTON':
-                    continue
-                parms[parm_name] = ParmState(
-                    name=parm.name(),
-                    parm_type=str(parm.type()),
-                    value=parm.raw_value(),
-                    script_callback=parm.script_callback()
-                )
-
-        inputs = {}
-        for idx, conn in node._inputs.items():
-            inputs[str(idx)] = self._capture_connection_state(conn)
-
-        outputs = {}
-        for idx, conns in node._outputs.items():
-            outputs[str(idx)] = [self._capture_connection_state(c) for c in conns]
-
-        state = FullNodeState(
-            session_id=node_session_id,
-            name=node.name(),
-            path=node.path(),
-            position=node._position,
-            node_type=str(node.type()),
-            state=node._state,
-            errors=node._errors.copy(),
-            warnings=node._warnings.copy(),
-            is_time_dependent=node._is_time_dependent,
-            last_cook_time=node._last_cook_time,
-            cook_count=node._cook_count,
-            file_hash=node._file_hash,
-            param_hash=node._param_hash,
-            last_input_size=node._last_input_size,
-            internal_nodes_created=node._internal_nodes_created,
-            parent_looper=node._parent_looper,
-            parms=parms,
-            inputs=inputs,
-            outputs=outputs
-        )
-
-        self.logger.debug(f"[UNDO_CAPTURE] Captured session_id={state.session_id} for {node.path()}")
-        return state
-
-    def _capture_connection_state(self, conn: 'NodeConnection') -> NodeConnectionState:
-        self.logger.debug(f"Capturing connection from {conn.output_node().path()} to {conn.input_node().path()}")
-        return NodeConnectionState(
-            output_node_path=conn.output_node().path(),
-            input_node_path=conn.input_node().path(),
-            output_index=conn.output_index(),
-            input_index=conn.input_index(),
-            output_ref=None,
-            input_ref=None
-        )
-    
-    def restore_network_state(self, state: NetworkState) -> None:
-
-        """
-        Two-phase restoration of a previously captured network state.
-        First removes nodes not present in target state, then rebuilds network
-        from stored state including all connections and parameters.
-        """
-
-
-        if self._restoring:
-            self.logger.debug("Already restoring state, skipping")
-            return
+    def max_bytes(self) -> int:
+        return self._max_bytes
 
-        self.logger.info("Starting network state restoration")
-        self._restoring = True
-        self._node_paths_restored.clear()
-        
+    def set_max_bytes(self, max_bytes: int) -> None:
+        self._max_bytes = max_bytes
+        self._enforce_budget()
+
+    def memory_usage(self) -> int:
+        """Estimated bytes held by the undo and redo history."""
+        return self._total_bytes
+
+    def push_state(self, operation_name: str = "") -> None:
+        if not self._restoring and self.undo_active and not self._transaction_depth:
+            self.logger.info(f"[UNDO_PUSH] {operation_name}")
+            if self.undo_stack and not self.undo_stack[-1].deltas:
+                self.undo_stack.pop()
+            self._open_entry = UndoEntry(operation_name)
+            self.undo_stack.append(self._open_entry)
+            self._drop_redo()
+
+    @contextmanager
+    def transaction(self, operation_name: str = "") -> Iterator[None]:
+        """Coalesces everything done inside the block into a single undo entry."""
+        if not self._transaction_depth:
+            self.push_state(operation_name)
+        self._transaction_depth += 1
         try:
-            # First, remove nodes that shouldn't exist in this state
-            current_nodes = set(NodeEnvironment.list_nodes())
-            target_nodes = set(state.nodes.keys())
-            nodes_to_remove = current_nodes - target_nodes
-            
-            self.logger.debug(f"Removing nodes not in target state: {nodes_to_remove}")
-            for node_path in nodes_to_remove:
-                NodeEnvironment.remove_node(node_path)  # Changed: pass the path directly
-            
-            self._restore_global_store(state.global_store)
-            
-            for node_path in state.restore_order:
-                if node_path not in self._node_paths_restored:
-                    self._restore_node(state.nodes[node_path])
-            
-            self._restore_connections(state)
-            self.logger.info("Network state restoration completed")
-            
-        except Exception as e:
-            self.logger.error(f"Error during state restoration: {str(e)}")
-            raise
+            yield
         finally:
-            self._restoring = False
-            self._node_paths_restored.clear()
-            
-    def _restore_global_store(self, state: GlobalStoreState) -> None:
-        from core.global_store import GlobalStore
-        self.logger.debug("Restoring global store")
-        GlobalStore.flush_all_globals()
-        for key, value in state.store.items():
-            GlobalStore.set(key, value)
+            self._transaction_depth -= 1
 
-    def _restore_node(self, state: FullNodeState) -> None:
-        from core.mobile_item import MobileItem
+    def in_transaction(self) -> bool:
+        return self._transaction_depth > 0
 
-        if state.path in self._node_paths_restored:
+    def record(self, delta: UndoDelta) -> None:
+        """Adds delta to the open entry; changes made while undoing or with no open entry are not recorded."""
+        entry = self._open_entry
+        if self._restoring or entry is None or not self.undo_stack or self.undo_stack[-1] is not entry:
             return
-        self.logger.debug(f"Restoring node: {state.path}")
-        self.logger.info(f"[UNDO_RESTORE] === START RESTORE NODE {state.path} ===")
-
-        node = NodeEnvironment.node_from_name(state.path)
-        if not node:
-            self.logger.info(f"[UNDO_RESTORE] Node doesn't exist, creating it...")
-            node_type_str = state.node_type.split('.')[-1] if '.' in state.node_type else state.node_type
-            node = Node.create_node(
-                NodeType[node_type_str],
-                state.name,
-                str(PurePosixPath(state.path).parent)
-            )
-            self.logger.info(f"[UNDO_RESTORE] Node created with session_id: {node.session_id()}")
-
-        # NOTE: We intentionally DO NOT restore session_id here.
-        # Session IDs are permanent and should never change once assigned.
-        # Restoring them would break client-side references and violate the
-        # principle that session_ids are stable identifiers.
-        self.logger.info(f"[UNDO_RESTORE] Keeping existing session_id: {node.session_id()}")
-        self.logger.info(f"[UNDO_RESTORE] === END RESTORE NODE {state.path} ===")
-
-        node._position = state.position
-        node._state = NodeState(state.state)
-        node._errors = state.errors
-        node._warnings = state.warnings
-        node._is_time_dependent = state.is_time_dependent
-        node._last_cook_time = state.last_cook_time
-        node._cook_count = state.cook_count
-        node._file_hash = state.file_hash
-        node._param_hash = state.param_hash
-        node._last_input_size = state.last_input_size
-        node._internal_nodes_created = state.internal_nodes_created
-        node._parent_looper = state.parent_looper
-        if hasattr(node, '_parms'):
-            for parm_name, parm_state in state.parms.items():
-                parm = node._parms.get(parm_name)
-                if parm and str(parm.type()) != 'ParameterType.BUTTON':
-                    parm.set(parm_state.value)
-                    parm.set_script_callback(parm_state.script_callback)
-        self._node_paths_restored.add(state.path)
-
-    def _restore_connections(self, state: NetworkState) -> None:
-
-        """
-        Reconstructs all node connections from a stored network state.
-        Handles clearing existing connections and rebuilding them based on
-        stored input/output relationships.
-        """
-
-
-        self.logger.debug("Starting connection restoration")
-        try:
-            for node_path, node_state in state.nodes.items():
-                node = NodeEnvironment.node_from_name(node_path)
-                if not node:
-                    self.logger.error(f"Missing node {node_path} during connection restore")
-                    continue
-                    
-                self.logger.debug(f"Clearing existing connections for node {node_path}")
-                node._inputs.clear()
-                node._outputs.clear()
-
-            for node_path, node_state in state.nodes.items():
-                node = NodeEnvironment.node_from_name(node_path)
-                if not node:
-                    continue
-                    
-                self.logger.debug(f"Restoring connections for node {node_path}")
-                self._restore_node_connections(node, node_state)
-                
-        except Exception as e:
-            self.logger.error(f"Error during connection restoration: {str(e)}", exc_info=True)
-            raise
-
-    def _restore_node_connections(self, node: 'Node', state: FullNodeState) -> None:
-        self.logger.debug(f"Processing inputs for node {node.path()}")
-        for idx_str, conn_state in state.inputs.items():
-            idx = int(idx_str)
-            output_node = NodeEnvironment.node_from_name(conn_state.output_node_path)
-            if not output_node:
-                self.logger.warning(f"Missing output node {conn_state.output_node_path} for connection to {node.path()}")
-                continue
-                
-            self.logger.debug(f"Setting input {idx} from {output_node.path()}[{conn_state.output_index}] to {node.path()}")
-            node.set_input(idx, output_node, conn_state.output_index)
-            
-        self.logger.debug(f"Processing outputs for node {node.path()}")
-        for idx_str, conn_states in state.outputs.items():
-            idx = int(idx_str)
-            for conn_state in conn_states:
-                input_node = NodeEnvironment.node_from_name(conn_state.input_node_path)
-                if not input_node:
-                    self.logger.warning(f"Missing input node {conn_state.input_node_path} for connection from {node.path()}")
-                    continue
-                    
-                if not any(c.output_node() == node for c in input_node._inputs.values()):
-                    self.logger.debug(f"Setting input {conn_state.input_index} from {node.path()}[{idx}] to {input_node.path()}")
-                    input_node.set_input(conn_state.input_index, node, idx)
-
-
-    def _validate_connection_refs(self, state: NodeConnectionState) -> bool:
-        return (state.output_ref and state.input_ref and
-                bool(state.output_ref) and bool(state.input_ref))
-
-    def _recreate_connection(self, state: NodeConnectionState) -> None:
-        output_node = next(iter(state.output_ref))
-        input_node = next(iter(state.input_ref))
-        input_node.set_input(state.input_index, output_node, state.output_index)
+        entry.deltas.append(delta)
+        entry.nbytes += delta.nbytes
+        self._total_bytes += delta.nbytes
+        if self._total_bytes > self._max_bytes:
+            self._enforce_budget()
+
+    def record_parm(self, parm: Parm, old_value: Any, new_value: Any) -> None:
+        if self._recording():
+            self.record(ParmDelta(parm, old_value, new_value))
+
+    def record_connection(self, connection: NodeConnection, connected: bool) -> None:
+        if self._recording():
+            self.record(ConnectionDelta(connection.output_node(), connection.output_index(),
+                                        connection.input_node(), connection.input_index(), connected))
+
+    def record_create(self, node: Node) -> None:
+        if self._recording():
+            self.record(NodeDelta(node, created=True))
+
+    def record_destroy(self, node: Node) -> None:
+        if not self._recording():
+            return
+        connections = [(conn.output_node(), conn.output_index(), node, conn.input_index())
+                       for conn in node._inputs.values()]
+        connections.extend((node, conn.output_index(), conn.input_node(), conn.input_index())
+                           for conns in node._outputs.values() for conn in conns)
+        self.record(NodeDelta(node, created=False, connections=connections))
+
+    def record_clear_nodes(self) -> None:
+        """Call before emptying NodeEnvironment.nodes directly, so undo can bring every node back."""
+        if self._recording():
+            for node in list(NodeEnvironment.nodes.values()):
+                self.record_destroy(node)
+
+    def record_global(self, key: str, old_value: Any = _MISSING, new_value: Any = _MISSING) -> None:
+        if self._recording():
+            self.record(GlobalDelta(key, old_value, new_value))
+
+    def record_paths(self, nodes: List[Node]) -> None:
+        """Call before renaming or moving nodes, with every node whose path is about to change."""
+        if self._recording():
+            self.record(PathDelta([(node, node.path(), node.name()) for node in nodes]))
+
+    def record_attribute(self, node: Node, attribute: str) -> None:
+        """Call before assigning a plain attribute such as _position on node."""
+        if self._recording():
+            self.record(AttributeDelta(node, attribute, getattr(node, attribute)))
+
+    def _recording(self) -> bool:
+        return not self._restoring and self._open_entry is not None
 
-    def push_state(self, operation_name: str = "") -> None:
-        if not self._restoring and self.undo_active:
-            self.logger.info(f"[UNDO_PUSH] === PUSH STATE: {operation_name} ===")
-            self.logger.info(f"[UNDO_PUSH] Current thread: {__import__('threading').current_thread().name}")
-            self.logger.info(f"[UNDO_PUSH] Capturing current network state...")
-            current_state = self.capture_network_state()
-            self.logger.info(f"[UNDO_PUSH] State captured, adding to undo stack")
-            self.undo_stack.append((operation_name, current_state))
-            self.redo_stack.clear()
-            self.logger.info(f"[UNDO_PUSH] === PUSH STATE COMPLETE ===")
-    
     def disable(self) -> None:
         self.logger.debug("Disabling undo system")
         self._undo_active = False
-        
+
     def enable(self) -> None:
         self.logger.debug("Enabling undo system")
         self._undo_active = True
@@ -431,45 +379,70 @@ class UndoManager:
         if not self.undo_stack:
             self.logger.debug("No states to undo")
             return None
-        
-        self.disable()
-        try:
-            operation_name, previous_state = self.undo_stack.pop()
-            self.logger.info(f"Undoing operation: {operation_name}")
-            current_state = self.capture_network_state()
-            self.redo_stack.append((operation_name, current_state))
-            self.restore_network_state(previous_state)
-            return operation_name
-        finally:
-            self.enable()
+
+        entry = self.undo_stack.pop()
+        self.logger.info(f"Undoing operation: {entry.operation}")
+        self._open_entry = None
+        self._apply(entry, reverse=True)
+        self.redo_stack.append(entry)
+        return entry.operation
 
     def redo(self) -> Optional[str]:
         if not self.redo_stack:
             self.logger.debug("No states to redo")
             return None
-            
+
+        entry = self.redo_stack.pop()
+        self.logger.info(f"Redoing operation: {entry.operation}")
+        self._open_entry = None
+        self._apply(entry, reverse=False)
+        self.undo_stack.append(entry)
+        return entry.operation
+
+    def _apply(self, entry: UndoEntry, reverse: bool) -> None:
+        was_active = self._undo_active
+        self._restoring = True
         self.disable()
         try:
-            operation_name, next_state = self.redo_stack.pop()
-            self.logger.info(f"Redoing operation: {operation_name}")
-            current_state = self.capture_network_state()
-            self.undo_stack.append((operation_name, current_state))
-            self.restore_network_state(next_state)
-            return operation_name
+            if reverse:
+                for delta in reversed(entry.deltas):
+                    delta.undo()
+            else:
+                for delta in entry.deltas:
+                    delta.redo()
+        except Exception as e:
+            self.logger.error(f"Error applying undo entry '{entry.operation}': {str(e)}")
+            raise
         finally:
-            self.enable()
-    
+            self._restoring = False
+            self._undo_active = was_active
+
+    def _drop_redo(self) -> None:
+        for entry in self.redo_stack:
+            self._total_bytes -= entry.nbytes
+        self.redo_stack.clear()
+
+    def _enforce_budget(self) -> None:
+        self._total_bytes = (sum(entry.nbytes for entry in self.undo_stack) +
+                             sum(entry.nbytes for entry in self.redo_stack))
+        while self._total_bytes > self._max_bytes and len(self.undo_stack) > 1:
+            evicted = self.undo_stack.popleft()
+            self._total_bytes -= evicted.nbytes
+            self.logger.debug(f"Evicted undo entry '{evicted.operation}' ({evicted.nbytes} bytes)")
+
     def get_undo_text(self) -> str:
         if not self.undo_stack:
             return "Nothing to undo"
-        return "\n".join(f"{i+1}: {action}" for i, (action, _) in enumerate(reversed(self.undo_stack)))
+        return "\n".join(f"{i+1}: {entry.operation}" for i, entry in enumerate(reversed(self.undo_stack)))
 
     def get_redo_text(self) -> str:
         if not self.redo_stack:
             return "Nothing to redo"
-        return "\n".join(f"{i+1}: {action}" for i, (action, _) in enumerate(reversed(self.redo_stack)))
-    
+        return "\n".join(f"{i+1}: {entry.operation}" for i, entry in enumerate(reversed(self.redo_stack)))
+
     def flush_all_undos(self) -> None:
         self.undo_stack.clear()
         self.redo_stack.clear()
-        self.logger.info("Cleared all undo and redo stacks")
\ No newline at end of file
+        self._open_entry = None
+        self._total_bytes = 0
+        self.logger.info("Cleared all undo and redo stacks")
@@ -0,0 +1,57 @@
+"""Swappable bundle of the state that makes up one Text Loom workspace.
+
+NodeEnvironment.nodes, GlobalStore, the TokenManager and the UndoManager all
+look like process-wide singletons, but each of them actually reads its state
+from the Workspace that is current in the calling context. Ordinary use
+never notices: there is one default workspace and everything runs in it.
+(Loop iteration counters are narrower still: core.loop_manager keeps them per
+context rather than per workspace.)
+
+Code that needs several independent networks in one process (the MCP server
+keeps one per agent session) creates a Workspace per network and switches to
+it by reference, which costs the same however large the network is:
+
+    >>> session = Workspace()
+    >>> with use_workspace(session):
+    ...     Node.create_node(NodeType.TEXT, "draft")   # lands in session.nodes
+    >>> "/draft" in NodeEnvironment.nodes               # the default workspace
+    False
+
+The current workspace is held in a ContextVar, so a switch made in one thread
+or asyncio task does not leak into the others.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, Optional
+
+from core.node_registry import NodeRegistry
+
+
+@dataclass(eq=False)
+class Workspace:
+    name: str = ""
+    nodes: NodeRegistry = field(default_factory=NodeRegistry)
+    globals: Dict[str, Any] = field(default_factory=dict)
+    token_manager: Optional[Any] = None  # created by TokenManager() on first use
+    undo_manager: Optional[Any] = None  # created by UndoManager() on first use
+
+
+DEFAULT_WORKSPACE = Workspace("default")
+
+_current_workspace: ContextVar[Workspace] = ContextVar('current_workspace', default=DEFAULT_WORKSPACE)
+
+
+def current_workspace() -> Workspace:
+    return _current_workspace.get()
+
+
+@contextmanager
+def use_workspace(workspace: Workspace) -> Iterator[Workspace]:
+    """Makes workspace current for the calling context until the block exits."""
+    token = _current_workspace.set(workspace)
+    try:
+        yield workspace
+    finally:
+        _current_workspace.reset(token)
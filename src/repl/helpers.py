@@ -1,9 +1,10 @@
-from typing import Optional, List, Dict, Any, Union
+from typing import Optional, List, Dict, Any, Union, ContextManager
 from pathlib import Path
 from core.base_classes import Node, NodeEnvironment, NodeType
 from core.flowstate_manager import save_flowstate, load_flowstate
 from core.global_store import GlobalStore
 from core.token_manager import get_token_manager
+from core.undo_manager import UndoManager
 from utils.node_loader import discover_node_types
 
 
@@ -16,16 +17,17 @@ def create(node_type: str, name: Optional[str] = None, parent: str = '/', **para
         available = [t.name.lower() for t in NodeType]
         raise ValueError(f"Unknown node type: {node_type}. Available: {available}")
 
-    node = Node.create_node(
-        node_type=node_type_enum,
-        node_name=name,
-        parent_path=parent
-    )
+    with UndoManager().transaction(f"Create {node_type_enum.name.lower()} node"):
+        node = Node.create_node(
+            node_type=node_type_enum,
+            node_name=name,
+            parent_path=parent
+        )
 
-    if params and hasattr(node, '_parms'):
-        for param_name, value in params.items():
-            if param_name in node._parms:
-                node._parms[param_name].set(value)
+        if params and hasattr(node, '_parms'):
+            for param_name, value in params.items():
+                if param_name in node._parms:
+                    node._parms[param_name].set(value)
 
     return node
 
@@ -124,7 +126,12 @@ def save(filepath: str) -> None:
 
 
 def clear() -> None:
-    NodeEnvironment.flush_all_nodes()
+    with UndoManager().transaction("Clear all nodes"):
+        NodeEnvironment.flush_all_nodes()
+
+
+def transaction(name: str = "") -> ContextManager[None]:
+    return UndoManager().transaction(name)
 
 
 def types() -> List[str]:
@@ -203,6 +210,10 @@ def last_cook_time(node: Node) -> float:
     return node.last_cook_time()
 
 
+def memo_stats(node: Node) -> Optional[Dict[str, Any]]:
+    return node.memo_stats()
+
+
 def needs_to_cook(node: Node) -> bool:
     return node.needs_to_cook()
 
@@ -9,9 +9,9 @@ from repl.helpers import (
     load, save, clear, types, get_global, set_global, globals_dict, parm,
     children, set_parent, errors, clear_errors, warnings, clear_warnings,
     input_names, output_names, node_type, input_nodes,
-    cook_count, last_cook_time, needs_to_cook, is_time_dependent, cook_dependencies,
+    cook_count, last_cook_time, memo_stats, needs_to_cook, is_time_dependent, cook_dependencies,
     inputs_with_indices, outputs_with_indices, node_exists, rename,
-    token_totals, token_history, node_tokens, reset_tokens
+    token_totals, token_history, node_tokens, reset_tokens, transaction
 )
 
 
@@ -35,12 +35,14 @@ Core helpers:
   ls(), find(name)               - List/find nodes
   load(file), save(file)         - Flowstate persistence
   clear()                        - Clear all nodes
+  with transaction(name):        - Group edits into one undo step
   types()                        - List available node types
 
 Debugging & performance:
   errors(node), warnings(node)   - Get errors/warnings
   cook_count(node)               - Times node has cooked
   last_cook_time(node)           - Last cook time in ms
+  memo_stats(node)               - Per-item memo hit/miss counts
   needs_to_cook(node)            - Check if node is dirty
   cook_dependencies(node)        - Get upstream nodes
 
@@ -96,6 +98,7 @@ def run_shell(flowstate_file: Optional[Path] = None, script_file: Optional[Path]
         'input_nodes': input_nodes,
         'cook_count': cook_count,
         'last_cook_time': last_cook_time,
+        'memo_stats': memo_stats,
         'needs_to_cook': needs_to_cook,
         'is_time_dependent': is_time_dependent,
         'cook_dependencies': cook_dependencies,
@@ -107,6 +110,7 @@ def run_shell(flowstate_file: Optional[Path] = None, script_file: Optional[Path]
         'token_history': token_history,
         'node_tokens': node_tokens,
         'reset_tokens': reset_tokens,
+        'transaction': transaction,
     })
 
     if flowstate_file:
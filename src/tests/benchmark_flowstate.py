@@ -0,0 +1,79 @@
+"""
+Flowstate save/load benchmark
+
+Builds synthetic networks of text nodes, chained in groups of ten, with a
+large STRINGLIST parm on every hundredth node, and times saving to .json and
+.tlz and loading through the Node.create_node path (bulk=False) and the bulk
+path (bulk=True).
+
+Usage:
+    python benchmark_flowstate.py [node_count ...]    # default: 1000 10000
+"""
+
+import sys
+import os
+import io
+import time
+import tempfile
+from contextlib import redirect_stdout
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(parent_dir)
+
+from core.base_classes import Node, NodeType, NodeEnvironment
+from core.flowstate_manager import save_flowstate, load_flowstate
+from core.undo_manager import UndoManager
+
+
+def build_network(node_count: int) -> None:
+    NodeEnvironment.flush_all_nodes()
+    with UndoManager().transaction("Build benchmark network"):
+        previous = None
+        for i in range(node_count):
+            node = Node.create_node(NodeType.TEXT, node_name=f"bench_{i}")
+            node._parms["text_string"].set(f"node {i}")
+            if i % 100 == 0:
+                node._parms["text_string"].set(" ".join(f"word{j}" for j in range(5000)))
+            if previous is not None and i % 10:
+                node.set_input(0, previous)
+            previous = node
+    UndoManager().flush_all_undos()
+
+
+def timed(action) -> float:
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        result = action()
+    elapsed = time.perf_counter() - start
+    if result is False:
+        raise RuntimeError("flowstate operation failed")
+    UndoManager().flush_all_undos()
+    return elapsed
+
+
+def run(node_count: int, directory: str) -> None:
+    json_path = os.path.join(directory, f"bench_{node_count}.json")
+    archive_path = os.path.join(directory, f"bench_{node_count}.tlz")
+    build_network(node_count)
+
+    results = [
+        ("save .json", timed(lambda: save_flowstate(json_path))),
+        ("save .tlz", timed(lambda: save_flowstate(archive_path))),
+        ("load .json, create_node path", timed(lambda: load_flowstate(json_path, bulk=False))),
+        ("load .json, bulk path", timed(lambda: load_flowstate(json_path))),
+        ("load .tlz, bulk path", timed(lambda: load_flowstate(archive_path))),
+    ]
+    assert len(NodeEnvironment.nodes) == node_count
+
+    print(f"\n{node_count} nodes  (.json {os.path.getsize(json_path) / 1e6:.1f} MB, "
+          f".tlz {os.path.getsize(archive_path) / 1e6:.1f} MB)")
+    for label, elapsed in results:
+        print(f"  {label:<32} {elapsed * 1000:10.1f} ms")
+
+
+if __name__ == "__main__":
+    counts = [int(arg) for arg in sys.argv[1:]] or [1000, 10000]
+    with tempfile.TemporaryDirectory() as directory:
+        for count in counts:
+            run(count, directory)
+    NodeEnvironment.flush_all_nodes()
@@ -0,0 +1,122 @@
+import sys
+import os
+import json
+import pytest
+from fastapi import HTTPException
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(parent_dir)
+
+from core.base_classes import Node, NodeType, NodeEnvironment, NodeState
+from core.undo_manager import UndoManager
+from api.job_manager import JobStatus, job_manager
+from api.routers.jobs import cancel_job, get_job, stream_job_events, submit_job
+
+
+@pytest.fixture
+def clean():
+    NodeEnvironment.flush_all_nodes()
+    UndoManager().flush_all_undos()
+    yield
+    for job in job_manager.list():
+        job_manager.cancel(job.job_id)
+        job.wait(timeout=10)
+    NodeEnvironment.flush_all_nodes()
+    UndoManager().flush_all_undos()
+
+
+def build_loop(name, iterations):
+    looper = Node.create_node(NodeType.LOOPER, node_name=name)
+    looper._parms["max"].set(iterations)
+    inner = Node.create_node(NodeType.TEXT, node_name="inner", parent_path=f"/{name}")
+    inner._parms["text_string"].set("pass $$L")
+    looper._output_node.set_input(0, inner)
+    return looper
+
+
+def wait_for_event(job, event_type, node_path):
+    seq = 0
+    while not job.is_finished():
+        for event in job.events_since(seq, timeout=5):
+            seq = event["seq"]
+            if event["type"] == event_type and event.get("node_path") == node_path:
+                return
+    pytest.fail(f"job finished before {event_type} on {node_path}")
+
+
+def test_job_runs_in_background_and_reports_nodes(clean):
+    text = Node.create_node(NodeType.TEXT, node_name="job_text")
+    text._parms["text_string"].set("hello")
+    down = Node.create_node(NodeType.STRING_TRANSFORM, node_name="job_down")
+    down.set_input(0, text)
+
+    submitted = submit_job(session_id=str(down.session_id()), force=False)
+    assert submitted.status.value in ("queued", "running", "completed")
+
+    job = job_manager.get(submitted.job_id)
+    assert job.wait(timeout=10)
+    response = get_job(job_id=job.job_id, include_outputs=True)
+
+    assert response.status.value == "completed"
+    assert response.progress == 1.0
+    assert response.result.success
+    assert [node.node_path for node in response.nodes] == ["/job_text", "/job_down"]
+    assert all(node.cook_count == 1 for node in response.nodes)
+    assert response.nodes[0].output_data == [["hello"]]
+
+    events = list(stream_job_events(job))
+    assert events[0].startswith("id: 1\nevent: started")
+    done = json.loads(events[-1].split("data: ", 1)[1])
+    assert done["type"] == "done" and done["status"] == "completed"
+    assert done["result"]["success"]
+
+
+def test_cancel_running_and_queued_jobs(clean):
+    looper = build_loop("job_loop", 100000)
+    running = job_manager.submit(looper)
+    queued = job_manager.submit(looper)
+
+    cancel_job(job_id=queued.job_id)
+    assert queued.status == JobStatus.CANCELLED
+
+    wait_for_event(running, "node_finished", "/job_loop/inner")
+    response = cancel_job(job_id=running.job_id)
+    assert running.wait(timeout=10)
+
+    assert running.status == JobStatus.CANCELLED
+    assert get_job(job_id=running.job_id, include_outputs=False).result.message == "Execution cancelled"
+    assert response.job_id == running.job_id
+    assert looper.state() == NodeState.UNCOOKED
+    assert all(node.state() != NodeState.COOKING for node in NodeEnvironment.nodes.values())
+
+    looper._parms["max"].set(3)
+    rerun = job_manager.submit(looper)
+    assert rerun.wait(timeout=10)
+    assert rerun.output == ["pass 0", "pass 1", "pass 2"]
+
+
+def test_unknown_job_is_404(clean):
+    with pytest.raises(HTTPException) as excinfo:
+        get_job(job_id="missing", include_outputs=False)
+    assert excinfo.value.status_code == 404
+
+
+def test_progress_counts_only_nodes_dirty_at_submission(clean):
+    chain = [Node.create_node(NodeType.TEXT, node_name=f"clean_{i}") for i in range(4)]
+    for upstream, node in zip(chain, chain[1:]):
+        node.set_input(0, upstream)
+    chain[-1].eval()
+    target = Node.create_node(NodeType.STRING_TRANSFORM, node_name="dirty_target")
+    target.set_input(0, chain[-1])
+
+    looper = build_loop("progress_loop", 100000)
+    running = job_manager.submit(looper)
+    queued = job_manager.submit(target)
+
+    assert queued.status == JobStatus.QUEUED
+    assert queued.to_cook == ["/dirty_target"]
+    assert queued.progress() == 0.0
+
+    cancel_job(job_id=running.job_id)
+    assert queued.wait(timeout=10)
+    assert queued.progress() == 1.0
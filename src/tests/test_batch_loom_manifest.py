@@ -0,0 +1,80 @@
+import sys
+import os
+import json
+import pytest
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(parent_dir)
+
+from core.base_classes import Node, NodeType, NodeEnvironment
+from core.global_store import GlobalStore
+from core.flowstate_manager import save_flowstate
+from core.undo_manager import UndoManager
+from core import batch_loom
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    NodeEnvironment.flush_all_nodes()
+    GlobalStore.flush_all_globals()
+    GlobalStore.set("FOO", "apples")
+    text = Node.create_node(NodeType.TEXT, node_name="batch_text")
+    text._parms["text_string"].set("fruit $FOO")
+    transform = Node.create_node(NodeType.STRING_TRANSFORM, node_name="batch_out")
+    transform.set_input(0, text)
+    save_flowstate(str(tmp_path / "flow.json"))
+    NodeEnvironment.flush_all_nodes()
+    GlobalStore.flush_all_globals()
+
+    path = tmp_path / "manifest.json"
+    path.write_text(json.dumps({
+        "flowstate": "flow.json",
+        "jobs": [
+            {"id": "default"},
+            {"id": "pears", "globals": {"FOO": "pears"}},
+            {"id": "parm", "parms": {"/batch_text": {"text_string": "plain"}}},
+            {"id": "broken", "parms": {"/missing": {"text_string": "x"}}},
+            {},
+        ]
+    }))
+    batch_loom._loaded_flowstate = None
+    yield path
+    batch_loom._loaded_flowstate = None
+    UndoManager().flush_all_undos()
+    NodeEnvironment.flush_all_nodes()
+    GlobalStore.flush_all_globals()
+
+
+def read_results(path):
+    records = {}
+    for line in path.read_text().splitlines():
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        records[record["id"]] = record
+    return records
+
+
+def test_overrides_apply_per_job_and_are_undone(manifest, tmp_path):
+    results_path = tmp_path / "results.jsonl"
+    counts = batch_loom.run_manifest(manifest, results_path)
+
+    assert counts == {"ok": 4, "error": 1, "skipped": 0}
+    results = read_results(results_path)
+    assert results["default"]["outputs"] == {"/batch_out": ["fruit apples"]}
+    assert results["pears"]["outputs"] == {"/batch_out": ["fruit pears"]}
+    assert results["parm"]["outputs"] == {"/batch_out": ["plain"]}
+    assert results["4"]["outputs"] == {"/batch_out": ["fruit apples"]}
+    assert "missing" in results["broken"]["error"]
+
+
+def test_rerun_resumes_after_a_crash(manifest, tmp_path):
+    results_path = tmp_path / "results.jsonl"
+    results_path.write_text(json.dumps({"id": "default", "status": "ok"}) + '\n{"id": "pea')
+
+    counts = batch_loom.run_manifest(manifest, results_path, workers=2)
+
+    assert counts == {"ok": 3, "error": 1, "skipped": 1}
+    assert set(read_results(results_path)) == {"default", "pears", "parm", "broken", "4"}
+    assert batch_loom.run_manifest(manifest, results_path)["skipped"] == 4
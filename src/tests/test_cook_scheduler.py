@@ -0,0 +1,238 @@
+import sys
+import os
+import threading
+import pytest
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(parent_dir)
+
+from core.base_classes import Node, NodeType, NodeState, NodeEnvironment
+from core.cook_scheduler import cook_scheduler
+
+
+@pytest.fixture
+def diamond_graph():
+    NodeEnvironment.flush_all_nodes()
+    source = Node.create_node(NodeType.TEXT, node_name="sched_source")
+    source._parms["text_string"].set('["q: apple pie", "a: banana split", "q: cherry tart"]')
+    source._parms["pass_through"].set(False)
+
+    upper = Node.create_node(NodeType.STRING_TRANSFORM, node_name="sched_upper")
+    upper._parms["operation"].set("case_transform")
+    upper._parms["case_mode"].set("upper")
+    upper.set_input(0, source)
+
+    search = Node.create_node(NodeType.SEARCH, node_name="sched_search")
+    search._parms["search_text"].set("banana")
+    search.set_input(0, upper)
+
+    section = Node.create_node(NodeType.SECTION, node_name="sched_section")
+    section._parms["prefix1"].set("Q:")
+    section._parms["prefix2"].set("A:")
+    section.set_input(0, upper)
+
+    merge = Node.create_node(NodeType.MERGE, node_name="sched_merge")
+    merge._parms["single_string"].set(False)
+    merge.set_input(0, search, 0)
+    merge.set_input(1, section, 0)
+
+    yield {
+        "source": source,
+        "upper": upper,
+        "search": search,
+        "section": section,
+        "merge": merge,
+    }
+    NodeEnvironment.flush_all_nodes()
+
+
+def test_topological_order_puts_inputs_first(diamond_graph):
+    order = cook_scheduler.topological_order(diamond_graph["merge"])
+    paths = [node.path() for node in order]
+
+    assert paths[0] == "/sched_source"
+    assert paths[-1] == "/sched_merge"
+    assert paths.index("/sched_upper") < paths.index("/sched_search")
+    assert paths.index("/sched_upper") < paths.index("/sched_section")
+    assert len(paths) == len(set(paths))
+
+
+def test_each_node_cooks_exactly_once(diamond_graph):
+    output = diamond_graph["merge"].eval()
+    stats = cook_scheduler.last_stats()
+
+    assert output == ["A: BANANA SPLIT", "APPLE PIE", "CHERRY TART"]
+    assert stats.target == "/sched_merge"
+    assert stats.cooked_more_than_once() == []
+    assert set(stats.cook_counts) == {node.path() for node in diamond_graph.values()}
+    assert all(count == 1 for count in stats.cook_counts.values())
+
+
+def test_several_targets_share_one_pass(diamond_graph):
+    search, section = diamond_graph["search"], diamond_graph["section"]
+    stats = cook_scheduler.cook(search, section)
+
+    assert stats.target == "/sched_search, /sched_section"
+    assert stats.order == ["/sched_source", "/sched_upper", "/sched_search", "/sched_section"]
+    assert all(count == 1 for count in stats.cook_counts.values())
+    assert len(stats.cook_counts) == 4
+
+
+def test_clean_graph_does_not_recook(diamond_graph):
+    merge = diamond_graph["merge"]
+    merge.eval()
+    cook_counts = {name: node.cook_count() for name, node in diamond_graph.items()}
+
+    merge.cook()
+    stats = cook_scheduler.last_stats()
+
+    assert stats.cook_counts == {"/sched_merge": 1}
+    for name in ("source", "upper", "search", "section"):
+        assert diamond_graph[name].cook_count() == cook_counts[name]
+
+
+def test_parm_change_marks_downstream_dirty(diamond_graph):
+    diamond_graph["merge"].eval()
+    for node in diamond_graph.values():
+        assert node.state() == NodeState.UNCHANGED
+
+    diamond_graph["upper"]._parms["case_mode"].set("title")
+
+    assert diamond_graph["source"].state() == NodeState.UNCHANGED
+    for name in ("upper", "search", "section", "merge"):
+        assert diamond_graph[name].state() == NodeState.UNCOOKED
+
+    output = diamond_graph["merge"].eval()
+    stats = cook_scheduler.last_stats()
+
+    assert output == ["A: Banana Split", "Apple Pie", "Cherry Tart"]
+    assert "/sched_source" not in stats.cook_counts
+    assert all(count == 1 for count in stats.cook_counts.values())
+
+
+def test_connection_change_marks_downstream_dirty(diamond_graph):
+    diamond_graph["merge"].eval()
+
+    diamond_graph["search"].set_input(0, diamond_graph["source"])
+
+    assert diamond_graph["search"].state() == NodeState.UNCOOKED
+    assert diamond_graph["merge"].state() == NodeState.UNCOOKED
+    assert diamond_graph["section"].state() == NodeState.UNCHANGED
+
+
+def test_looper_iterations_open_nested_passes():
+    NodeEnvironment.flush_all_nodes()
+    source = Node.create_node(NodeType.TEXT, node_name="loop_source")
+    source._parms["text_string"].set('["a", "b", "c"]')
+    source._parms["pass_through"].set(False)
+
+    looper = Node.create_node(NodeType.LOOPER, node_name="sched_looper")
+    looper._parms["max_from_input"].set(True)
+    looper.set_input(0, source)
+
+    inner = Node.create_node(NodeType.TEXT, node_name="inner", parent_path="/sched_looper")
+    inner._parms["text_string"].set("item $$N")
+    inner._parms["pass_through"].set(False)
+    inner.set_input(0, looper._input_node)
+    looper._output_node.set_input(0, inner)
+
+    output = looper.eval()
+    stats = cook_scheduler.last_stats()
+
+    assert output == ["item a", "item b", "item c"]
+    assert stats.cook_counts["/loop_source"] == 1
+    assert stats.cook_counts["/sched_looper"] == 1
+    assert stats.cook_counts["/sched_looper/inner"] == 3
+    assert stats.passes == 4
+    NodeEnvironment.flush_all_nodes()
+
+
+def test_inner_parm_change_marks_looper_and_downstream_dirty():
+    NodeEnvironment.flush_all_nodes()
+    looper = Node.create_node(NodeType.LOOPER, node_name="dirty_looper")
+    looper._parms["max"].set(2)
+    inner = Node.create_node(NodeType.TEXT, node_name="inner", parent_path="/dirty_looper")
+    inner._parms["text_string"].set("first $$L")
+    looper._output_node.set_input(0, inner)
+    downstream = Node.create_node(NodeType.STRING_TRANSFORM, node_name="dirty_downstream")
+    downstream.set_input(0, looper)
+    assert downstream.eval() == ["first 0", "first 1"]
+    assert looper.state() == NodeState.UNCHANGED
+
+    inner._parms["text_string"].set("second $$L")
+
+    assert looper.state() == NodeState.UNCOOKED
+    assert downstream.state() == NodeState.UNCOOKED
+    assert downstream.eval() == ["second 0", "second 1"]
+    NodeEnvironment.flush_all_nodes()
+
+
+@pytest.fixture
+def parallel_scheduler():
+    cook_scheduler.set_max_workers(3)
+    yield cook_scheduler
+    cook_scheduler.set_max_workers(1)
+
+
+def _fan_in_graph():
+    NodeEnvironment.flush_all_nodes()
+    merge = Node.create_node(NodeType.MERGE, node_name="fan_merge")
+    merge._parms["single_string"].set(False)
+    branches = []
+    for index, word in enumerate(["red", "green", "blue"]):
+        branch = Node.create_node(NodeType.TEXT, node_name=f"fan_{word}")
+        branch._parms["text_string"].set(word)
+        branch._parms["pass_through"].set(False)
+        merge.set_input(index, branch)
+        branches.append(branch)
+    return merge, branches
+
+
+def test_parallel_cook_runs_independent_branches_together(parallel_scheduler):
+    merge, branches = _fan_in_graph()
+    barrier = threading.Barrier(len(branches), timeout=5)
+
+    for branch in branches:
+        original_cook = branch._internal_cook
+
+        def cook_after_barrier(original_cook=original_cook):
+            barrier.wait()
+            original_cook()
+
+        branch._internal_cook = cook_after_barrier
+
+    output = merge.eval()
+    stats = cook_scheduler.last_stats()
+
+    assert output == ["red", "green", "blue"]
+    assert not barrier.broken
+    assert all(count == 1 for count in stats.cook_counts.values())
+    assert stats.passes == 1
+    NodeEnvironment.flush_all_nodes()
+
+
+def test_parallel_cook_matches_serial_output(diamond_graph, parallel_scheduler):
+    parallel_output = diamond_graph["merge"].eval()
+    diamond_graph["upper"]._parms["case_mode"].set("title")
+    parallel_output_after_change = diamond_graph["merge"].eval()
+
+    cook_scheduler.set_max_workers(1)
+    diamond_graph["upper"]._parms["case_mode"].set("upper")
+    serial_output = diamond_graph["merge"].eval()
+
+    assert parallel_output == serial_output
+    assert parallel_output_after_change == ["A: Banana Split", "Apple Pie", "Cherry Tart"]
+
+
+def test_parallel_cook_propagates_branch_errors(parallel_scheduler):
+    merge, branches = _fan_in_graph()
+
+    def failing_cook():
+        raise RuntimeError("branch failed")
+
+    branches[1]._internal_cook = failing_cook
+
+    with pytest.raises(RuntimeError, match="branch failed"):
+        merge.cook()
+    assert merge.state() != NodeState.COOKING
+    NodeEnvironment.flush_all_nodes()
@@ -0,0 +1,63 @@
+import sys
+import os
+import pytest
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(parent_dir)
+
+from core.base_classes import Node, NodeType, NodeEnvironment
+from core.fingerprint import fingerprint
+
+
+def test_fingerprint_follows_content():
+    assert fingerprint(["a", "b"]) == fingerprint(["a", "b"])
+    assert fingerprint(["a", "b"]) != fingerprint(["b", "a"])
+    assert fingerprint([["a"], ["b"]]) != fingerprint([["a"], ["c"]])
+    assert fingerprint([{"k": ["v"]}]) == fingerprint([{"k": ["v"]}])
+
+
+@pytest.fixture
+def source():
+    NodeEnvironment.flush_all_nodes()
+    node = Node.create_node(NodeType.TEXT, node_name="fp_source")
+    node._parms["text_string"].set('["red fish", "blue fish"]')
+    node._parms["pass_through"].set(False)
+    yield node
+    NodeEnvironment.flush_all_nodes()
+
+
+@pytest.mark.parametrize("node_type", [
+    NodeType.STRING_TRANSFORM, NodeType.SEARCH, NodeType.CHUNK,
+    NodeType.SECTION, NodeType.COUNT,
+])
+def test_needs_to_cook_compares_upstream_fingerprint(source, node_type):
+    node = Node.create_node(node_type, node_name="fp_downstream")
+    node.set_input(0, source)
+    node.eval()
+    source_cooks = source.cook_count()
+
+    assert not node.needs_to_cook()
+    assert source.cook_count() == source_cooks
+
+    source._output = ["red fish", "green fish"]
+    assert node.needs_to_cook()
+
+
+def test_fingerprint_is_published_per_output(source):
+    search = Node.create_node(NodeType.SEARCH, node_name="fp_search")
+    search._parms["search_text"].set("red")
+    search.set_input(0, source)
+    search.eval()
+    matching, non_matching = search.output_fingerprint(0), search.output_fingerprint(1)
+
+    source._parms["text_string"].set('["red fish", "green fish"]')
+    search.eval()
+
+    assert search.output_fingerprint(0) == matching
+    assert search.output_fingerprint(1) != non_matching
+
+
+def test_unconnected_input_has_no_fingerprint(source):
+    assert source.input_fingerprint() is None
+    assert source.eval() == ["red fish", "blue fish"]
+    assert source.output_fingerprint() == fingerprint(["red fish", "blue fish"])
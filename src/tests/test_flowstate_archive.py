@@ -0,0 +1,71 @@
+import sys
+import os
+import zipfile
+import pytest
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(parent_dir)
+
+from core.base_classes import Node, NodeType, NodeEnvironment
+from core.global_store import GlobalStore
+from core.flowstate_manager import save_flowstate, load_flowstate
+from core.flowstate_archive import MANIFEST, PAYLOAD_DIR
+
+BIG = [f"response line {i} " + "x" * 200 for i in range(500)]
+
+
+@pytest.fixture
+def network():
+    NodeEnvironment.flush_all_nodes()
+    GlobalStore.flush_all_globals()
+    text = Node.create_node(NodeType.TEXT, node_name="arc_text")
+    text._parms["text_string"].set("small value")
+    query = Node.create_node(NodeType.QUERY, node_name="arc_query")
+    query._parms["response"].set(BIG)
+    query.set_input(0, text)
+    GlobalStore.set("ARCKEY", "kept")
+    yield
+    NodeEnvironment.flush_all_nodes()
+    GlobalStore.flush_all_globals()
+
+
+def test_archive_round_trip_loads_payloads_on_first_read(network, tmp_path):
+    archive_path = tmp_path / "net.tlz"
+    json_path = tmp_path / "net.json"
+    assert save_flowstate(str(archive_path))
+    assert save_flowstate(str(json_path))
+
+    with zipfile.ZipFile(archive_path) as archive:
+        names = archive.namelist()
+    assert MANIFEST in names
+    assert len([name for name in names if name.startswith(PAYLOAD_DIR)]) == 1
+    assert archive_path.stat().st_size < json_path.stat().st_size / 10
+
+    NodeEnvironment.flush_all_nodes()
+    assert load_flowstate(str(archive_path))
+
+    query = NodeEnvironment.nodes["/arc_query"]
+    text = NodeEnvironment.nodes["/arc_text"]
+    assert text._parms["text_string"].is_loaded()
+    assert not query._parms["response"].is_loaded()
+    assert query.input_nodes() == [text]
+    assert GlobalStore.get("ARCKEY") == "kept"
+
+    assert query._parms["response"].raw_value() == BIG
+    assert query._parms["response"].is_loaded()
+
+
+def test_pending_payloads_survive_resave_to_same_path(network, tmp_path):
+    archive_path = tmp_path / "net.tlz"
+    save_flowstate(str(archive_path))
+    NodeEnvironment.flush_all_nodes()
+    load_flowstate(str(archive_path))
+
+    assert save_flowstate(str(archive_path))
+    parm = NodeEnvironment.nodes["/arc_query"]._parms["response"]
+    assert not parm.is_loaded()
+
+    NodeEnvironment.flush_all_nodes()
+    load_flowstate(str(archive_path))
+    assert NodeEnvironment.nodes["/arc_query"]._parms["response"].raw_value() == BIG
+    assert parm.raw_value() == BIG
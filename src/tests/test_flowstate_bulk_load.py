@@ -0,0 +1,73 @@
+import sys
+import os
+import pytest
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(parent_dir)
+
+from core.base_classes import Node, NodeType, NodeEnvironment
+from core.global_store import GlobalStore
+from core.flowstate_manager import save_flowstate, load_flowstate
+from core.undo_manager import UndoManager
+
+
+@pytest.fixture
+def saved(tmp_path):
+    NodeEnvironment.flush_all_nodes()
+    GlobalStore.flush_all_globals()
+    text = Node.create_node(NodeType.TEXT, node_name="bulk_text")
+    text._parms["text_string"].set('["a", "b"]')
+    looper = Node.create_node(NodeType.LOOPER, node_name="bulk_loop")
+    looper._parms["max"].set(5)
+    looper.set_input(0, text)
+    inner = Node.create_node(NodeType.STRING_TRANSFORM, node_name="inner", parent_path="/bulk_loop")
+    inner.set_input(0, looper._input_node)
+    looper._output_node.set_input(0, inner)
+    merge = Node.create_node(NodeType.MERGE, node_name="bulk_merge")
+    merge.set_input(0, looper)
+    merge.set_input(1, text)
+    merge._position = (12.0, 34.0)
+
+    filepath = tmp_path / "bulk.json"
+    save_flowstate(str(filepath))
+    yield str(filepath)
+    UndoManager().flush_all_undos()
+    NodeEnvironment.flush_all_nodes()
+    GlobalStore.flush_all_globals()
+
+
+def snapshot():
+    return {
+        path: (
+            node.type(),
+            node._position,
+            {name: parm.raw_value() for name, parm in node._parms.items()},
+            sorted((conn.input_index(), conn.output_node().path(), conn.output_index())
+                   for conn in node.inputs()),
+        )
+        for path, node in NodeEnvironment.nodes.items()
+    }
+
+
+def test_bulk_load_matches_create_node_path(saved):
+    load_flowstate(saved, bulk=False)
+    expected = snapshot()
+    load_flowstate(saved)
+
+    assert snapshot() == expected
+    assert "/bulk_loop/inner" in expected
+    assert NodeEnvironment.nodes["/bulk_merge"]._position == (12.0, 34.0)
+
+
+def test_bulk_load_is_undoable_and_redoable(saved):
+    NodeEnvironment.flush_all_nodes()
+    Node.create_node(NodeType.TEXT, node_name="before_load")
+    UndoManager().flush_all_undos()
+
+    load_flowstate(saved)
+    loaded = snapshot()
+    UndoManager().undo()
+    assert list(NodeEnvironment.nodes) == ["/before_load"]
+
+    UndoManager().redo()
+    assert snapshot() == loaded
@@ -0,0 +1,124 @@
+import sys
+import os
+import json
+import threading
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(parent_dir)
+
+from core.http_pool import HTTPSessionPool, PoolSettings, get_session, request_timeout
+from core.llm_utils import query_llm, check_llm
+
+
+class StubLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        server = self.server
+        server.client_ports.add(self.client_address[1])
+        length = int(self.headers.get("Content-Length", 0))
+        prompt = json.loads(self.rfile.read(length))["prompt"]
+        if server.failures_left > 0:
+            server.failures_left -= 1
+            self._reply(503, {"error": "busy"})
+            return
+        server.requests_served += 1
+        self._reply(200, {"response": f"echo: {prompt}"})
+
+    def do_GET(self):
+        server = self.server
+        server.client_ports.add(self.client_address[1])
+        self._reply(200, {"models": []})
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubLLMHandler)
+    server.client_ports = set()
+    server.failures_left = 0
+    server.requests_served = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    HTTPSessionPool().close_all()
+
+
+def _config(server, **extra):
+    return {
+        "DEFAULT": {"url": f"http://127.0.0.1:{server.server_address[1]}", "model": "stub"},
+        "Stub": {"endpoint": "/api/generate", "retry_backoff": "0", **extra},
+    }
+
+
+def test_pool_settings_from_config():
+    settings = PoolSettings.from_settings({"pool_size": "4", "request_timeout": "30", "retries": "bad"})
+
+    assert settings.pool_size == 4
+    assert settings.retries == PoolSettings().retries
+    assert request_timeout({"connect_timeout": "1", "request_timeout": "30"}) == (1.0, 30.0)
+
+
+def test_sessions_are_shared_per_backend():
+    pool = HTTPSessionPool()
+    try:
+        assert get_session("A", {}) is get_session("A", {})
+        assert get_session("A", {}) is not get_session("B", {})
+        first = get_session("A", {})
+        assert get_session("A", {"pool_size": "2"}) is not first
+        # Asking with other settings must not close or replace the session already handed out
+        assert get_session("A", {}) is first
+    finally:
+        pool.close_all()
+
+
+def test_health_check_shares_the_query_session(stub_server):
+    config = _config(stub_server, pool_size="3")
+    settings = {**config["DEFAULT"], **config["Stub"]}
+
+    for i in range(3):
+        assert check_llm("Stub", settings["url"], "/api/tags", settings) == "Stub"
+        assert query_llm(f"prompt {i}", "Stub", config) == {"response": f"echo: prompt {i}"}
+
+    assert len(stub_server.client_ports) == 1
+
+
+def test_batch_reuses_one_keep_alive_connection(stub_server):
+    config = _config(stub_server)
+
+    responses = [query_llm(f"prompt {i}", "Stub", config) for i in range(5)]
+
+    assert [r["response"] for r in responses] == [f"echo: prompt {i}" for i in range(5)]
+    assert stub_server.requests_served == 5
+    assert len(stub_server.client_ports) == 1
+
+
+def test_busy_backend_is_retried(stub_server):
+    stub_server.failures_left = 2
+    config = _config(stub_server, retries="2")
+
+    response = query_llm("retry me", "Stub", config)
+
+    assert response == {"response": "echo: retry me"}
+    assert stub_server.failures_left == 0
+
+
+def test_retries_exhausted_returns_none(stub_server):
+    stub_server.failures_left = 5
+    config = _config(stub_server, retries="1")
+
+    assert query_llm("give up", "Stub", config) is None
@@ -0,0 +1,105 @@
+import sys
+import os
+import pytest
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(parent_dir)
+
+from core.base_classes import Node, NodeType, NodeEnvironment
+from core.item_memo import ItemMemo
+
+
+def test_item_memo_reuses_results_per_param_hash():
+    calls = []
+
+    def upper(item):
+        calls.append(item)
+        return item.upper()
+
+    memo = ItemMemo()
+    assert memo.map(["a", "b"], "p1", upper) == ["A", "B"]
+    assert memo.map(["a", "c"], "p1", upper) == ["A", "C"]
+    assert memo.map(["a"], "p2", upper) == ["A"]
+
+    assert calls == ["a", "b", "c", "a"]
+    stats = memo.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 4)
+    assert (stats["last_hits"], stats["last_misses"]) == (0, 1)
+
+
+def test_item_memo_evicts_least_recently_used():
+    memo = ItemMemo(max_entries=2)
+    memo.map(["a", "b"], "p", str.upper)
+    memo.map(["a"], "p", str.upper)
+    memo.map(["c"], "p", str.upper)
+
+    memo.map(["a", "b"], "p", str.upper)
+    assert memo.stats()["last_hits"] == 1
+    assert memo.stats()["entries"] == 2
+
+
+@pytest.fixture
+def source():
+    NodeEnvironment.flush_all_nodes()
+    node = Node.create_node(NodeType.TEXT, node_name="memo_source")
+    node._parms["text_string"].set('["one fish", "two fish", "red fish", "blue fish"]')
+    node._parms["pass_through"].set(False)
+    yield node
+    NodeEnvironment.flush_all_nodes()
+
+
+def _change_one_item(source):
+    source._parms["text_string"].set('["one fish", "two fish", "old fish", "blue fish"]')
+
+
+def test_string_transform_only_reprocesses_changed_items(source):
+    transform = Node.create_node(NodeType.STRING_TRANSFORM, node_name="memo_transform")
+    transform._parms["operation"].set("case_transform")
+    transform._parms["case_mode"].set("upper")
+    transform.set_input(0, source)
+
+    transform.eval()
+    _change_one_item(source)
+    output = transform.eval()
+
+    assert output == ["ONE FISH", "TWO FISH", "OLD FISH", "BLUE FISH"]
+    stats = transform.memo_stats()
+    assert (stats["last_hits"], stats["last_misses"]) == (3, 1)
+
+    transform._parms["case_mode"].set("lower")
+    assert transform.eval() == ["one fish", "two fish", "old fish", "blue fish"]
+    assert transform.memo_stats()["last_misses"] == 4
+
+
+def test_search_only_reprocesses_changed_items(source):
+    search = Node.create_node(NodeType.SEARCH, node_name="memo_search")
+    search._parms["search_text"].set("red, blue")
+    search.set_input(0, source)
+
+    search.eval()
+    _change_one_item(source)
+    output = search.eval()
+
+    assert output[0] == ["blue fish"]
+    stats = search.memo_stats()
+    assert (stats["last_hits"], stats["last_misses"]) == (3, 1)
+
+
+def test_chunk_only_reprocesses_changed_items(source):
+    chunk = Node.create_node(NodeType.CHUNK, node_name="memo_chunk")
+    chunk._parms["chunk_size"].set(5)
+    chunk._parms["overlap_size"].set(0)
+    chunk._parms["min_chunk_size"].set(1)
+    chunk.set_input(0, source)
+
+    first = chunk.eval()
+    _change_one_item(source)
+    second = chunk.eval()
+
+    assert len(second) == len(first)
+    stats = chunk.memo_stats()
+    assert (stats["last_hits"], stats["last_misses"]) == (3, 1)
+
+
+def test_non_item_nodes_report_no_memo_stats(source):
+    assert source.memo_stats() is None
@@ -0,0 +1,235 @@
+import sys
+import os
+import time
+import sqlite3
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(parent_dir)
+
+from core.base_classes import Node, NodeType, NodeState, NodeEnvironment
+from core.llm_cache import get_llm_cache, CACHE_FIRST, REFRESH, BYPASS
+from core.llm_utils import query_llm, query_llm_with_tokens, get_streamed_llm_response
+from core.models import TokenUsage
+from core.token_manager import get_token_manager
+
+
+CONFIG = {
+    "DEFAULT": {"url": "http://localhost:11434", "model": "llama3:latest"},
+    "Ollama": {"endpoint": "/api/generate", "provider": "ollama"},
+}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = get_llm_cache()
+    original_dir = os.path.dirname(cache.path())
+    original_ttl, original_max = cache._ttl_seconds, cache._max_bytes
+    cache.configure(cache_dir=str(tmp_path))
+    cache.clear()
+    yield cache
+    cache.configure(cache_dir=original_dir, ttl_seconds=original_ttl, max_bytes=original_max)
+
+
+def _http_response(text):
+    response = Mock()
+    response.status_code = 200
+    response.text = text
+    response.json.return_value = {"response": text}
+    response.raise_for_status = Mock()
+    return response
+
+
+def test_put_and_get_roundtrip(cache):
+    key = cache.make_key("generate", "Ollama", CONFIG["DEFAULT"], "hello")
+
+    assert cache.get(key) is None
+    cache.put(key, {"response": "hi"})
+
+    assert cache.get(key) == {"response": "hi"}
+    stats = cache.stats()
+    assert stats["entries"] == 1
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_key_depends_on_prompt_and_settings(cache):
+    base = cache.make_key("generate", "Ollama", CONFIG["DEFAULT"], "hello")
+
+    assert base == cache.make_key("generate", "Ollama", dict(CONFIG["DEFAULT"]), "hello")
+    assert base != cache.make_key("generate", "Ollama", CONFIG["DEFAULT"], "hello!")
+    assert base != cache.make_key("generate", "Ollama", {**CONFIG["DEFAULT"], "model": "mistral"}, "hello")
+    assert base != cache.make_key("completion", "Ollama", CONFIG["DEFAULT"], "hello")
+
+
+def test_expired_entries_are_misses(cache):
+    cache.configure(ttl_seconds=0.05)
+    key = cache.make_key("generate", "Ollama", CONFIG["DEFAULT"], "stale")
+    cache.put(key, {"response": "old"})
+    time.sleep(0.1)
+
+    assert cache.get(key) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entries_are_evicted(cache):
+    cache.configure(max_bytes=100)
+    keys = [cache.make_key("generate", "Ollama", CONFIG["DEFAULT"], f"p{i}") for i in range(3)]
+    cache.put(keys[0], {"response": "a" * 30})
+    time.sleep(0.01)
+    cache.put(keys[1], {"response": "b" * 30})
+    time.sleep(0.01)
+    cache.get(keys[0])
+    time.sleep(0.01)
+    cache.put(keys[2], {"response": "c" * 30})
+
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[2]) is not None
+    assert cache.stats()["bytes"] <= 100
+
+
+def test_connection_and_schema_are_reused(cache):
+    key = cache.make_key("generate", "Ollama", CONFIG["DEFAULT"], "reuse")
+    cache.put(key, {"response": "hi"})
+
+    with patch('core.llm_cache.sqlite3.connect', wraps=sqlite3.connect) as connect:
+        for _ in range(3):
+            cache.put(key, {"response": "hi"})
+            assert cache.get(key) == {"response": "hi"}
+        cache.stats()
+        assert connect.call_count == 0
+
+        # Another thread opens its own connection once, without recreating the table
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            assert pool.submit(lambda: [cache.get(key) for _ in range(3)]).result() == [{"response": "hi"}] * 3
+        assert connect.call_count == 1
+
+
+def test_concurrent_reads_and_writes(cache):
+    keys = [cache.make_key("generate", "Ollama", CONFIG["DEFAULT"], f"c{i}") for i in range(40)]
+
+    def roundtrip(key):
+        cache.put(key, {"response": key})
+        return cache.get(key)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(roundtrip, keys))
+
+    assert results == [{"response": key} for key in keys]
+    stats = cache.stats()
+    assert stats["entries"] == 40
+    assert stats["hits"] == 40
+
+
+def test_unusable_database_only_warns(cache, tmp_path, capsys):
+    (tmp_path / "broken" / "llm_responses.sqlite3").mkdir(parents=True)
+    cache.configure(cache_dir=str(tmp_path / "broken"))
+    key = cache.make_key("generate", "Ollama", CONFIG["DEFAULT"], "broken")
+
+    cache.put(key, {"response": "lost"})
+    assert cache.get(key) is None
+    cache.clear()
+    stats = cache.stats()
+
+    assert stats["entries"] == 0 and stats["bytes"] == 0
+    output = capsys.readouterr().out
+    for action in ("write", "read", "clear", "stats"):
+        assert f"LLM cache {action} failed" in output
+
+
+def test_query_llm_cache_first_skips_network_on_repeat(cache):
+    with patch('requests.Session.post', return_value=_http_response("fresh")) as post:
+        first = query_llm("same prompt", "Ollama", CONFIG, cache_mode=CACHE_FIRST)
+        second = query_llm("same prompt", "Ollama", CONFIG, cache_mode=CACHE_FIRST)
+
+    assert first == second == {"response": "fresh"}
+    assert post.call_count == 1
+
+
+def test_query_llm_logs_requests_instead_of_printing(cache, capsys):
+    with patch('requests.Session.post', return_value=_http_response("quiet")), \
+            patch('core.llm_utils.logger') as logger:
+        query_llm("quiet prompt", "Ollama", CONFIG, cache_mode=BYPASS)
+
+    assert capsys.readouterr().out == ""
+    logged = " ".join(str(arg) for call in logger.debug.call_args_list for arg in call.args)
+    assert "http://localhost:11434/api/generate" in logged and "quiet prompt" in logged
+
+
+def test_query_llm_refresh_and_bypass(cache):
+    with patch('requests.Session.post', return_value=_http_response("v1")):
+        query_llm("prompt", "Ollama", CONFIG, cache_mode=CACHE_FIRST)
+    with patch('requests.Session.post', return_value=_http_response("v2")) as post:
+        refreshed = query_llm("prompt", "Ollama", CONFIG, cache_mode=REFRESH)
+        cached = query_llm("prompt", "Ollama", CONFIG, cache_mode=CACHE_FIRST)
+        bypassed = query_llm("other prompt", "Ollama", CONFIG, cache_mode=BYPASS)
+
+    assert refreshed == cached == {"response": "v2"}
+    assert bypassed == {"response": "v2"}
+    assert post.call_count == 2
+    assert cache.stats()["entries"] == 1
+
+
+def test_query_llm_with_tokens_cache_hit_reports_cached_usage(cache):
+    completion = Mock()
+    completion.choices = [Mock()]
+    completion.choices[0].message.content = "cached answer"
+    completion.usage = Mock(prompt_tokens=3, completion_tokens=4, total_tokens=7)
+
+    fake_litellm = Mock()
+    fake_litellm.completion.return_value = completion
+
+    with patch.dict(sys.modules, {"litellm": fake_litellm}):
+        first = query_llm_with_tokens("q", "Ollama", CONFIG, cache_mode=CACHE_FIRST)
+        second = query_llm_with_tokens("q", "Ollama", CONFIG, cache_mode=CACHE_FIRST)
+
+    assert first[0] == second[0] == "cached answer"
+    assert first[1].total_tokens == 7 and not first[1].cached
+    assert second[1] == TokenUsage(input_tokens=3, output_tokens=4, total_tokens=7, cached=True)
+    assert fake_litellm.completion.call_count == 1
+
+
+def test_streamed_cache_hit_reports_cached_usage(cache):
+    usage = TokenUsage(input_tokens=2, output_tokens=5, total_tokens=7)
+    with patch('core.llm_utils.stream_llm', return_value=iter([("streamed", usage)])) as stream:
+        first = get_streamed_llm_response("s", cache_mode=CACHE_FIRST)
+        second = get_streamed_llm_response("s", cache_mode=CACHE_FIRST)
+
+    assert first.content == second.content == "streamed"
+    assert first.token_usage == usage
+    assert second.token_usage == TokenUsage(input_tokens=2, output_tokens=5, total_tokens=7, cached=True)
+    assert stream.call_count == 1
+
+
+def test_token_manager_flags_cached_usage():
+    manager = get_token_manager()
+    manager.reset()
+    manager.add_usage("fresh", TokenUsage(1, 2, 3))
+    manager.add_usage("replayed", TokenUsage(1, 2, 3, cached=True))
+
+    assert [entry["cached"] for entry in manager.get_history()] == [False, True]
+    assert manager.get_totals()["total_tokens"] == 6
+    manager.reset()
+
+
+def test_query_node_recook_makes_no_network_calls(cache):
+    NodeEnvironment.flush_all_nodes()
+    text_node = Node.create_node(NodeType.TEXT, node_name="cache_prompts")
+    text_node._parms["text_string"].set('["one", "two"]')
+    text_node._parms["pass_through"].set(False)
+    query_node = Node.create_node(NodeType.QUERY, node_name="cache_query")
+    query_node.set_input(0, text_node)
+    query_node._parms["limit"].set(False)
+    query_node._parms["track_tokens"].set(False)
+
+    with patch('requests.Session.post', side_effect=lambda *a, **k: _http_response("answer")) as post:
+        first = query_node.eval()
+        query_node.set_state(NodeState.UNCOOKED)
+        second = query_node.eval()
+
+    assert first == second == ["answer", "answer"]
+    assert post.call_count == 2
+    NodeEnvironment.flush_all_nodes()
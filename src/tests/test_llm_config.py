@@ -0,0 +1,123 @@
+import sys
+import os
+import pytest
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(parent_dir)
+
+from core.llm_config import get_llm_config
+from core.llm_utils import build_payload
+
+
+SETTINGS = """[DEFAULT]
+active_llm = Studio
+model = base-model
+
+[Studio]
+url = http://localhost:1234
+endpoint = /v1/chat/completions
+model = chat-model
+system_message = Be brief.
+response_key = choices.0.message.content
+payload_structure = {"model": "model", "messages": [{"role": "system", "content": "system_message"}, {"role": "user", "content": "prompt"}]}
+"""
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    path = tmp_path / "settings.cfg"
+    path.write_text(SETTINGS)
+    yield str(path)
+    get_llm_config().invalidate()
+
+
+def test_config_is_parsed_once(config_file):
+    service = get_llm_config()
+
+    first = service.config(config_file)
+    second = service.config(config_file)
+
+    assert first is second
+    assert first["Studio"]["model"] == "chat-model"
+
+
+def test_config_reloads_when_file_changes(config_file):
+    service = get_llm_config()
+    first = service.config(config_file)
+    backend = service.backend(file_path=config_file)
+
+    with open(config_file, "a") as f:
+        f.write("temperature = 0.1\n")
+    stat = os.stat(config_file)
+    os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    reloaded = service.config(config_file)
+    assert reloaded is not first
+    assert reloaded["Studio"]["temperature"] == "0.1"
+    assert service.backend(file_path=config_file) is not backend
+
+
+def test_backend_descriptor(config_file):
+    backend = get_llm_config().backend(file_path=config_file)
+
+    assert backend.name == "Studio"
+    assert backend.full_url == "http://localhost:1234/v1/chat/completions"
+    assert backend.response_key == "choices.0.message.content"
+    assert backend.settings["model"] == "chat-model"
+    assert backend.build_payload("Hi") == {
+        "model": "chat-model",
+        "messages": [
+            {"role": "system", "content": "Be brief."},
+            {"role": "user", "content": "Hi"},
+        ],
+    }
+    assert get_llm_config().backend(file_path=config_file) is backend
+
+
+def test_unknown_backend_and_missing_file(tmp_path, config_file):
+    service = get_llm_config()
+
+    assert service.backend("Nope", file_path=config_file) is None
+    assert service.config(str(tmp_path / "missing.cfg")) == {}
+    assert service.active_llm(str(tmp_path / "missing.cfg")) is None
+
+
+def test_build_payload_uses_compiled_template(config_file):
+    settings = get_llm_config().backend(file_path=config_file).settings
+
+    first = build_payload("one", settings)
+    second = build_payload("two", settings)
+
+    assert first["messages"][1]["content"] == "one"
+    assert second["messages"][1]["content"] == "two"
+    assert first["messages"][0] == second["messages"][0] == {"role": "system", "content": "Be brief."}
+
+
+def baseline_payload(prompt, settings):
+    """build_payload as it was before templates were compiled, minus its blanking of chat roles."""
+    payload = {}
+    for key, value in eval(settings.get("payload_structure", "{}")).items():
+        if isinstance(value, str):
+            payload[key] = prompt if value == "prompt" else settings.get(value, "")
+        elif isinstance(value, list):
+            payload[key] = [
+                {sub_key: sub_value if sub_key == "role" else
+                 (prompt if sub_value == "prompt" else settings.get(sub_value, ""))
+                 for sub_key, sub_value in item.items()}
+                for item in value if isinstance(item, dict)
+            ]
+    return payload
+
+
+def test_stock_payloads_match_baseline():
+    service = get_llm_config()
+    config = service.config()
+    for name in config.sections():
+        backend = service.backend(name)
+        assert backend.build_payload("Hi") == baseline_payload("Hi", backend.settings), name
+
+    # The stock ChatGPT section sets no system_message
+    assert service.backend("ChatGPT").build_payload("Hi")["messages"] == [
+        {"role": "system", "content": ""},
+        {"role": "user", "content": "Hi"},
+    ]
@@ -0,0 +1,156 @@
+import sys
+import os
+import json
+import threading
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(parent_dir)
+
+from core.base_classes import Node, NodeType, NodeEnvironment
+from core.http_pool import HTTPSessionPool
+from core.llm_cache import BYPASS
+from core.llm_config import LLMBackend
+from core.llm_utils import parse_stream_line, stream_llm, get_streamed_llm_response
+from core.stream_events import StreamChunk, StreamDone, listen, stream_eval
+from api.routers.nodes import stream_execution_events
+
+
+class StreamingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length))
+        self.server.payloads.append(payload)
+        prompt = payload.get("prompt") or payload["messages"][-1]["content"]
+        words = [f"{word} " for word in prompt.split()]
+        if self.path.endswith("/chat/completions"):
+            lines = [f"data: {json.dumps({'choices': [{'delta': {'content': w}}]})}" for w in words]
+            lines.append("data: " + json.dumps({"choices": [{"delta": {}}],
+                                                 "usage": {"prompt_tokens": 2, "completion_tokens": len(words),
+                                                           "total_tokens": 2 + len(words)}}))
+            lines.append("data: [DONE]")
+            body = "\n\n".join(lines) + "\n\n"
+            content_type = "text/event-stream"
+        else:
+            lines = [json.dumps({"response": w, "done": False}) for w in words]
+            lines.append(json.dumps({"response": "", "done": True,
+                                     "prompt_eval_count": 3, "eval_count": len(words)}))
+            body = "\n".join(lines) + "\n"
+            content_type = "application/x-ndjson"
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StreamingHandler)
+    server.payloads = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    HTTPSessionPool().close_all()
+
+
+def _config(server, endpoint="/api/generate", **extra):
+    return {
+        "DEFAULT": {"url": f"http://127.0.0.1:{server.server_address[1]}", "model": "stub"},
+        "Stub": {"endpoint": endpoint, **extra},
+    }
+
+
+def test_parse_stream_line_formats():
+    assert parse_stream_line('{"response": "Hi", "done": false}') == ("Hi", None, False)
+    assert parse_stream_line('{"message": {"content": "Yo"}, "done": false}') == ("Yo", None, False)
+    assert parse_stream_line('data: {"choices": [{"delta": {"content": "Hey"}}]}') == ("Hey", None, False)
+    assert parse_stream_line("data: [DONE]") == (None, None, True)
+    assert parse_stream_line(": keep-alive") == (None, None, False)
+
+    text, usage, done = parse_stream_line('{"response": "", "done": true, "prompt_eval_count": 4, "eval_count": 6}')
+    assert done and usage.total_tokens == 10
+
+
+def test_stream_llm_ndjson(stub_server):
+    pieces = list(stream_llm("one two three", "Stub", _config(stub_server)))
+
+    assert "".join(text for text, _ in pieces) == "one two three "
+    assert pieces[-1][1].output_tokens == 3
+    assert stub_server.payloads[0]["stream"] is True
+
+
+def test_stream_llm_sse_with_payload_template(stub_server):
+    config = _config(
+        stub_server,
+        endpoint="/v1/chat/completions",
+        payload_structure='{"model": "model", "messages": [{"role": "user", "content": "prompt"}]}',
+    )
+
+    chunks = []
+    response = get_streamed_llm_response("red green", on_chunk=chunks.append, cache_mode=BYPASS,
+                                         backend=_backend(config))
+
+    assert chunks == ["red ", "green "]
+    assert response.content == "red green "
+    assert response.token_usage.total_tokens == 4
+    assert stub_server.payloads[0]["messages"] == [{"role": "user", "content": "red green"}]
+
+
+def _backend(config):
+    return LLMBackend(name="Stub", settings={**config["DEFAULT"], **config["Stub"]}, config=config)
+
+
+@pytest.fixture
+def streaming_query(stub_server):
+    NodeEnvironment.flush_all_nodes()
+    text_node = Node.create_node(NodeType.TEXT, node_name="stream_prompts")
+    text_node._parms["text_string"].set('["alpha beta", "gamma"]')
+    text_node._parms["pass_through"].set(False)
+    query_node = Node.create_node(NodeType.QUERY, node_name="stream_query")
+    query_node.set_input(0, text_node)
+    query_node._parms["limit"].set(False)
+    query_node._parms["stream"].set(True)
+    query_node._parms["cache_mode"].set(BYPASS)
+    backend = _backend(_config(stub_server))
+    with patch('core.query_node.get_llm_config') as get_llm_config:
+        get_llm_config.return_value.backend.return_value = backend
+        yield query_node
+    NodeEnvironment.flush_all_nodes()
+
+
+def test_query_node_publishes_chunks(streaming_query):
+    chunks = []
+    with listen(chunks.append):
+        output = streaming_query.eval()
+
+    assert output == ["alpha beta ", "gamma "]
+    assert [(c.item_index, c.text) for c in chunks] == [(0, "alpha "), (0, "beta "), (1, "gamma ")]
+    assert all(c.node_path == "/stream_query" for c in chunks)
+    assert "Total: 9" in streaming_query._parms["token_usage"].eval()
+
+
+def test_stream_eval_yields_chunks_then_result(streaming_query):
+    events = list(stream_eval(streaming_query))
+
+    assert all(isinstance(e, StreamChunk) for e in events[:-1])
+    assert isinstance(events[-1], StreamDone)
+    assert events[-1].output == ["alpha beta ", "gamma "]
+
+
+def test_execute_endpoint_stream_lines(streaming_query):
+    lines = [json.loads(line) for line in stream_execution_events(streaming_query)]
+
+    assert [line["type"] for line in lines] == ["chunk", "chunk", "chunk", "result"]
+    assert lines[-1]["success"] is True
+    assert lines[-1]["output_data"] == [["alpha beta ", "gamma "]]
@@ -0,0 +1,133 @@
+import sys
+import os
+import json
+import pytest
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(parent_dir)
+
+from core.base_classes import Node, NodeType, NodeEnvironment
+from core.loop_accumulator import LoopAccumulator
+from core.undo_manager import UndoManager
+
+
+@pytest.fixture
+def clean():
+    NodeEnvironment.flush_all_nodes()
+    UndoManager().flush_all_undos()
+    yield
+    NodeEnvironment.flush_all_nodes()
+    UndoManager().flush_all_undos()
+
+
+def test_accumulator_spills_past_budget_and_keeps_order():
+    accumulator = LoopAccumulator(budget_bytes=100)
+    accumulator.extend(["short"])
+    assert not accumulator.spilled
+
+    items = [f"line {i} ünïcode" for i in range(50)]
+    accumulator.extend(items)
+    spill_path = accumulator._spill.name
+    accumulator.extend(["tail"])
+
+    assert accumulator.spilled and accumulator.memory_bytes == 0
+    assert len(accumulator) == 52
+    assert list(accumulator) == ["short"] + items + ["tail"]
+    assert json.loads(accumulator.read("items")) == ["short"] + items + ["tail"]
+
+    accumulator.close()
+    assert not os.path.exists(spill_path)
+
+
+def build_loop(iterations, data_limit):
+    looper = Node.create_node(NodeType.LOOPER, node_name="acc_loop")
+    looper._parms["max"].set(iterations)
+    looper._parms["data_limit"].set(data_limit)
+    inner = Node.create_node(NodeType.TEXT, node_name="inner", parent_path="/acc_loop")
+    inner._parms["text_string"].set("result $$L " + "x" * 50)
+    looper._output_node.set_input(0, inner)
+    return looper
+
+
+def test_looper_collects_without_an_undo_entry_per_iteration(clean):
+    looper = build_loop(100, 200 * 1024 * 1024)
+    UndoManager().flush_all_undos()
+
+    looper.cook()
+
+    expected = [f"result {i} " + "x" * 50 for i in range(100)]
+    assert looper.get_output() == expected
+    assert looper._output_node._parms["out_data"].raw_value() == expected
+    assert len(UndoManager().undo_stack) < 10
+
+
+def test_looper_spills_past_data_limit(clean):
+    looper = build_loop(200, 1000)
+
+    looper.cook()
+
+    expected = [f"result {i} " + "x" * 50 for i in range(200)]
+    assert any("data_limit" in warning for warning in looper.warnings())
+    assert not looper._parms["staging_data"].is_loaded()
+    assert list(looper.iter_output()) == expected
+    assert not looper._parms["staging_data"].is_loaded()
+
+    downstream = Node.create_node(NodeType.STRING_TRANSFORM, node_name="acc_down")
+    downstream.set_input(0, looper)
+    assert downstream.eval() == expected
+
+    looper._parms["max"].set(2)
+    looper.cook()
+    assert looper.get_output() == expected[:2]
+
+
+def test_downstream_sees_a_changed_spilled_output(clean):
+    looper = build_loop(200, 1000)
+    downstream = Node.create_node(NodeType.STRING_TRANSFORM, node_name="acc_down")
+    downstream.set_input(0, looper)
+    sink = Node.create_node(NodeType.NULL, node_name="acc_sink")
+    sink.set_input(0, downstream)
+    sink.cook()
+    assert downstream.get_output()[0] == "result 0 " + "x" * 50
+    spilled_fingerprint = looper.output_fingerprint()
+
+    inner = NodeEnvironment.nodes["/acc_loop/inner"]
+    inner._parms["text_string"].set("changed $$L " + "x" * 50)
+    looper.cook()
+
+    assert not looper._parms["staging_data"].is_loaded()
+    assert looper.output_fingerprint() != spilled_fingerprint
+    assert downstream.needs_to_cook()
+    sink.cook()
+    assert downstream.get_output() == [f"changed {i} " + "x" * 50 for i in range(200)]
+
+
+
+def test_spilled_output_is_recorded_for_undo(clean):
+    looper = build_loop(200, 1000)
+    looper.cook()
+    UndoManager().flush_all_undos()
+
+    looper.cook()
+
+    staging = looper._parms["staging_data"]
+    recorded = [delta for entry in UndoManager().undo_stack for delta in entry.deltas
+                if getattr(delta, "parm", None) is staging]
+    assert recorded and not staging.is_loaded()
+
+
+def test_spilled_output_is_read_once_for_both_parms(clean, monkeypatch):
+    looper = build_loop(200, 1000)
+    looper.cook()
+    reads = []
+    monkeypatch.setattr(LoopAccumulator, "to_list", lambda self: reads.append(self) or list(self))
+    monkeypatch.setattr(LoopAccumulator, "read", lambda self, member: pytest.fail("read the whole file as one blob"))
+
+    out_data = looper._output_node._parms["out_data"]
+    staging = looper._parms["staging_data"]
+    assert not out_data.is_loaded() and not staging.is_loaded()
+
+    expected = [f"result {i} " + "x" * 50 for i in range(200)]
+    assert looper.get_output() == expected
+    assert out_data.raw_value() is staging.raw_value()
+    assert len(reads) == 1
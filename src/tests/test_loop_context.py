@@ -0,0 +1,63 @@
+import sys
+import os
+import threading
+import pytest
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(parent_dir)
+
+from core.base_classes import Node, NodeType, NodeEnvironment
+from core.loop_manager import loop_manager
+from core.undo_manager import UndoManager
+
+
+def test_threads_see_their_own_iteration():
+    seen = {}
+    ready = threading.Barrier(3, timeout=5)
+
+    def run(index):
+        with loop_manager.iteration("/looper", index):
+            ready.wait()
+            seen[index] = loop_manager.get_current_loop("/looper/inner")
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in (1, 2, 3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert seen == {1: 1, 2: 2, 3: 3}
+    assert loop_manager.get_current_loop("/looper/inner") == 0
+
+
+def test_nested_iterations_unwind_and_stay_quiet(capsys):
+    with loop_manager.iteration("/outer", 4):
+        with loop_manager.iteration("/outer/inner_loop", 2):
+            assert loop_manager.get_current_loop("/outer/inner_loop/node") == 2
+            assert loop_manager.get_current_loop("/outer/node") == 4
+        assert loop_manager.get_current_loop("/outer/inner_loop/node") == 0
+        loop_manager.set_loop("/other", 7)
+        loop_manager.clean_stale_loops("/other")
+    assert loop_manager.get_current_loop("/outer/node") == 0
+    assert capsys.readouterr().out == ""
+
+
+def test_looper_cook_leaves_no_loop_state():
+    NodeEnvironment.flush_all_nodes()
+    try:
+        text = Node.create_node(NodeType.TEXT, node_name="ctx_text")
+        text._parms["text_string"].set("item $$L")
+        looper = Node.create_node(NodeType.LOOPER, node_name="ctx_loop")
+        looper._parms["max"].set(3)
+        inner = Node.create_node(NodeType.TEXT, node_name="inner", parent_path="/ctx_loop")
+        inner._parms["text_string"].set("pass $$L")
+        looper._output_node.set_input(0, inner)
+
+        looper.cook()
+
+        assert looper._output_node._parms["out_data"].raw_value() == ["pass 0", "pass 1", "pass 2"]
+        assert loop_manager.get_current_loop("/ctx_loop/inner") == 0
+        assert text._parms["text_string"].eval() == "item -1"
+    finally:
+        NodeEnvironment.flush_all_nodes()
+        UndoManager().flush_all_undos()
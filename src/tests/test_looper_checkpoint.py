@@ -0,0 +1,113 @@
+import sys
+import os
+import sqlite3
+import pytest
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(parent_dir)
+
+from core.base_classes import Node, NodeType, NodeEnvironment, NodeState
+from core.loop_checkpoint import checkpoint_key, get_loop_checkpoints
+from core.undo_manager import UndoManager
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = get_loop_checkpoints()
+    original_dir = os.path.dirname(store.path())
+    store.configure(checkpoint_dir=str(tmp_path))
+    yield store
+    store.configure(checkpoint_dir=original_dir)
+
+
+@pytest.fixture
+def looper(store):
+    NodeEnvironment.flush_all_nodes()
+    looper = Node.create_node(NodeType.LOOPER, node_name="ckpt_loop")
+    looper._parms["max"].set(6)
+    looper._parms["checkpoint"].set(True)
+    inner = Node.create_node(NodeType.TEXT, node_name="inner", parent_path="/ckpt_loop")
+    inner._parms["text_string"].set("pass $$L")
+    looper._output_node.set_input(0, inner)
+    yield looper
+    NodeEnvironment.flush_all_nodes()
+    UndoManager().flush_all_undos()
+
+
+def stored_iterations(store):
+    with sqlite3.connect(store.path()) as conn:
+        return sorted(row[0] for row in conn.execute("SELECT iteration FROM checkpoints"))
+
+
+def test_resumes_from_the_first_missing_iteration(store, looper):
+    looper.cook()
+    expected = [f"pass {i}" for i in range(6)]
+    assert looper.get_output() == expected
+    assert stored_iterations(store) == [1, 2, 3, 4, 5, 6]
+
+    # A cook that died after iteration 3
+    with sqlite3.connect(store.path()) as conn:
+        conn.execute("DELETE FROM checkpoints WHERE iteration > 3")
+    inner = NodeEnvironment.nodes["/ckpt_loop/inner"]
+    cooks_before = inner.cook_count()
+
+    looper.set_state(NodeState.UNCOOKED)
+    looper.cook()
+
+    assert looper.get_output() == expected
+    assert inner.cook_count() - cooks_before == 3
+    assert stored_iterations(store) == [1, 2, 3, 4, 5, 6]
+
+
+def test_changed_inner_parm_starts_over(store, looper):
+    looper.cook()
+    old_key = checkpoint_key(looper)
+
+    NodeEnvironment.nodes["/ckpt_loop/inner"]._parms["text_string"].set("round $$L")
+    assert checkpoint_key(looper) != old_key
+    looper.cook()
+
+    assert looper.get_output() == [f"round {i}" for i in range(6)]
+    assert store.load(old_key, looper.path()) == {}
+
+
+def test_discard_and_toggle_off(store, looper):
+    looper.cook()
+    looper.discard_checkpoints()
+    assert stored_iterations(store) == []
+
+    looper._parms["checkpoint"].set(False)
+    looper.cook()
+    assert looper.get_output() == [f"pass {i}" for i in range(6)]
+    assert stored_iterations(store) == []
+
+
+KEY_SCRIPT = """
+import sys
+sys.path.insert(0, {src!r})
+from core.base_classes import Node, NodeType
+from core.loop_checkpoint import checkpoint_key
+source = Node.create_node(NodeType.TEXT, node_name="source")
+source._parms["text_string"].set("alpha")
+source.cook()
+looper = Node.create_node(NodeType.LOOPER, node_name="ckpt_loop")
+looper._parms["max"].set(6)
+looper.set_input(0, source)
+inner = Node.create_node(NodeType.TEXT, node_name="inner", parent_path="/ckpt_loop")
+inner._parms["text_string"].set("pass $$L")
+looper._output_node.set_input(0, inner)
+print("KEY=" + checkpoint_key(looper))
+"""
+
+
+def key_from_new_process(hash_seed):
+    import subprocess
+    env = dict(os.environ, PYTHONHASHSEED=str(hash_seed))
+    result = subprocess.run([sys.executable, "-c", KEY_SCRIPT.format(src=parent_dir)],
+                            capture_output=True, text=True, env=env, timeout=60, check=True)
+    return next(line[4:] for line in result.stdout.splitlines() if line.startswith("KEY="))
+
+
+def test_key_with_connected_input_is_stable_across_processes():
+    keys = {key_from_new_process(seed) for seed in (1, 2, 3)}
+    assert len(keys) == 1
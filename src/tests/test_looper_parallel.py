@@ -0,0 +1,73 @@
+import sys
+import os
+import threading
+import pytest
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(parent_dir)
+
+from core.base_classes import Node, NodeType, NodeEnvironment
+from core.loop_parallel import _IterationCopy
+from core.undo_manager import UndoManager
+
+
+@pytest.fixture
+def looper():
+    NodeEnvironment.flush_all_nodes()
+    source = Node.create_node(NodeType.TEXT, node_name="source")
+    source._parms["text_string"].set('["alpha", "beta", "gamma", "delta", "epsilon", "zeta"]')
+    looper = Node.create_node(NodeType.LOOPER, node_name="par_loop")
+    looper.set_input(0, source)
+    looper._parms["max_from_input"].set(True)
+    inner = Node.create_node(NodeType.TEXT, node_name="inner", parent_path="/par_loop")
+    inner._parms["text_string"].set("item $$L: $$N")
+    inner._parms["pass_through"].set(False)
+    inner.set_input(0, looper._input_node)
+    looper._output_node.set_input(0, inner)
+    yield looper
+    NodeEnvironment.flush_all_nodes()
+    UndoManager().flush_all_undos()
+
+
+def cook_both_ways(looper, workers):
+    looper._parms["parallel_iterations"].set(1)
+    looper.cook()
+    sequential = looper.get_output()
+    looper._parms["parallel_iterations"].set(workers)
+    looper.cook()
+    return sequential, looper.get_output()
+
+
+def test_parallel_matches_sequential_and_uses_several_threads(looper, monkeypatch):
+    threads = set()
+    cook = _IterationCopy.cook
+
+    def recording_cook(self, iteration, budget_bytes):
+        threads.add(threading.get_ident())
+        return cook(self, iteration, budget_bytes)
+
+    monkeypatch.setattr(_IterationCopy, "cook", recording_cook)
+    sequential, parallel = cook_both_ways(looper, 3)
+
+    assert len(sequential) == 6
+    assert parallel == sequential
+    assert len(threads) > 1
+    assert not looper.errors()
+
+
+def test_stop_when_ends_at_the_same_iteration(looper):
+    looper._parms["stop_when"].set("`matches('gamma', output)`")
+
+    sequential, parallel = cook_both_ways(looper, 4)
+
+    assert parallel == sequential == ["item 0: alpha", "item 1: beta", "item 2: gamma"]
+    assert looper.stopped_at() == 3
+
+
+def test_feedback_mode_stays_sequential(looper):
+    looper._parms["feedback_mode"].set(True)
+
+    sequential, parallel = cook_both_ways(looper, 4)
+
+    assert parallel == sequential
+    assert any("parallel_iterations ignored" in warning for warning in looper.warnings())
@@ -0,0 +1,62 @@
+import sys
+import os
+import pytest
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(parent_dir)
+
+from core.base_classes import Node, NodeType, NodeEnvironment
+from core.parm import similarity, matches
+from core.undo_manager import UndoManager
+
+
+@pytest.fixture
+def looper():
+    NodeEnvironment.flush_all_nodes()
+    looper = Node.create_node(NodeType.LOOPER, node_name="stop_loop")
+    looper._parms["max"].set(10)
+    inner = Node.create_node(NodeType.TEXT, node_name="inner", parent_path="/stop_loop")
+    looper._output_node.set_input(0, inner)
+    yield looper
+    NodeEnvironment.flush_all_nodes()
+    UndoManager().flush_all_undos()
+
+
+def inner_text(looper, text):
+    NodeEnvironment.nodes["/stop_loop/inner"]._parms["text_string"].set(text)
+
+
+def test_stops_once_output_stops_changing(looper):
+    inner_text(looper, "value `min($$L, 2)`")
+    looper._parms["stop_when"].set("`output == previous`")
+
+    looper.cook()
+
+    assert looper.stopped_at() == 4
+    assert looper.get_output() == ["value 0", "value 1", "value 2", "value 2"]
+
+
+def test_stops_on_a_regex_match(looper):
+    inner_text(looper, "pass $$L")
+    looper._parms["stop_when"].set("`matches(r'pass [2-9]', output) and iteration > 1`")
+
+    looper.cook()
+
+    assert looper.stopped_at() == 3
+    assert looper.get_output() == ["pass 0", "pass 1", "pass 2"]
+
+
+def test_runs_full_range_without_a_condition(looper):
+    inner_text(looper, "pass $$L")
+
+    looper.cook()
+
+    assert looper.stopped_at() == 0
+    assert len(looper.get_output()) == 10
+
+
+def test_helpers():
+    assert similarity("abcd", "abcd") == 1.0
+    assert 0.5 < similarity("draft one", "draft two") < 1.0
+    assert matches(r"\bDONE\b", "all DONE here")
+    assert not matches("DONE", None)
@@ -0,0 +1,61 @@
+import sys
+import os
+import gc
+import pytest
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(parent_dir)
+
+from core.base_classes import Node, NodeType, NodeEnvironment, MobileItem
+from core.undo_manager import UndoManager
+
+
+@pytest.fixture
+def clean():
+    NodeEnvironment.flush_all_nodes()
+    UndoManager().flush_all_undos()
+    gc.collect()
+    yield
+    NodeEnvironment.flush_all_nodes()
+    UndoManager().flush_all_undos()
+
+
+def test_destroyed_nodes_are_released(clean):
+    baseline = MobileItem.live_count()
+    for i in range(20):
+        Node.create_node(NodeType.TEXT, node_name=f"leak_{i}")
+    assert MobileItem.live_count() == baseline + 20
+
+    NodeEnvironment.flush_all_nodes()
+    assert MobileItem.live_count() == baseline + 20  # held by undo history
+
+    UndoManager().flush_all_undos()
+    gc.collect()
+    assert MobileItem.live_count() == baseline
+
+
+def test_session_ids_are_registered_and_removed_in_place(clean):
+    node = Node.create_node(NodeType.TEXT, node_name="registry_node")
+    session_id = node.session_id()
+    assert node in MobileItem.live_items()
+
+    node.delete()
+    assert session_id not in MobileItem._live_items
+
+    revived = MobileItem.recreate(node.__dict__.copy())
+    assert MobileItem._live_items[session_id] is revived
+
+
+def test_diagnostics_endpoint_counts_unregistered_nodes(clean):
+    pytest.importorskip("fastapi")
+    from api.routers.workspace import get_memory_diagnostics
+
+    baseline = get_memory_diagnostics(collect=True).unregistered_nodes
+    Node.create_node(NodeType.TEXT, node_name="diag_kept")
+    Node.create_node(NodeType.TEXT, node_name="diag_dropped").destroy()
+
+    report = get_memory_diagnostics(collect=True)
+
+    assert report.registered_nodes == len(NodeEnvironment.nodes)
+    assert report.unregistered_nodes == baseline + 1
+    assert report.undo_entries == 3
@@ -0,0 +1,66 @@
+import sys
+import os
+import pytest
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(parent_dir)
+
+from core.base_classes import Node, NodeType, NodeEnvironment
+from core.node_registry import NodeRegistry
+
+
+@pytest.fixture
+def env():
+    NodeEnvironment.flush_all_nodes()
+    yield NodeEnvironment
+    NodeEnvironment.flush_all_nodes()
+
+
+def test_remove_node_does_not_match_prefix_siblings(env):
+    Node.create_node(NodeType.TEXT, node_name="foo")
+    Node.create_node(NodeType.TEXT, node_name="foobar")
+    Node.create_node(NodeType.TEXT, node_name="child", parent_path="/foo")
+
+    env.remove_node("/foo")
+
+    assert "/foobar" in env.nodes
+    assert "/foo" not in env.nodes
+    assert "/foo/child" not in env.nodes
+
+
+def test_lookups_follow_rename_and_move(env):
+    folder = Node.create_node(NodeType.TEXT, node_name="folder")
+    node = Node.create_node(NodeType.TEXT, node_name="leaf")
+    session_id = node.session_id()
+
+    assert env.node_from_session_id(session_id) is node
+    assert env.node_from_name("leaf") is node
+
+    node.rename("renamed")
+    assert env.node_from_name("leaf") is None
+    assert env.node_from_name("renamed") is node
+
+    node.set_parent("/folder")
+    assert env.child_paths("/folder") == ["/folder/renamed"]
+    assert env.node_from_session_id(session_id) is node
+
+    node.destroy()
+    assert env.node_from_session_id(session_id) is None
+    assert env.child_paths("/folder") == []
+    assert env.node_from_name("folder") is folder
+
+
+def test_registry_trie_keeps_unregistered_ancestors_linked():
+    registry = NodeRegistry()
+    registry["/a/b/c"] = "c"
+    registry["/a"] = "a"
+    registry["/ab"] = "ab"
+
+    assert registry.subtree("/a") == ["/a", "/a/b/c"]
+
+    del registry["/a/b/c"]
+    assert registry.descendants("/a") == []
+    assert registry._children == {"/": {"/a": None, "/ab": None}}
+
+    registry.clear()
+    assert registry.first_named("ab") is None
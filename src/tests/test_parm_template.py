@@ -0,0 +1,88 @@
+import sys
+import os
+import pytest
+from unittest.mock import patch
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(parent_dir)
+
+from core.base_classes import Node, NodeType, NodeEnvironment
+from core.global_store import GlobalStore
+from core.loop_manager import loop_manager
+from core.parm_template import ParmTemplate
+
+
+@pytest.fixture
+def nodes():
+    NodeEnvironment.flush_all_nodes()
+    GlobalStore.flush_all_globals()
+    source = Node.create_node(NodeType.TEXT, node_name="tmpl_source")
+    source._parms["text_string"].set('["apple", "banana", "cherry"]')
+    source._parms["pass_through"].set(False)
+    target = Node.create_node(NodeType.TEXT, node_name="tmpl_target")
+    target.set_input(0, source)
+    GlobalStore.set("FRUIT", "kiwi")
+    GlobalStore.set("COUNT", "4")
+    loop_manager.set_loop("", 3)
+    yield source, target
+    loop_manager.set_loop("", None)
+    GlobalStore.flush_all_globals()
+    NodeEnvironment.flush_all_nodes()
+
+
+@pytest.mark.parametrize("value", [
+    "plain text",
+    "$FRUIT and $COUNT+2",
+    "loop $$L of $$N, first $$1",
+    "$$N*2 and $$N-1",
+    "`len('$FRUIT') + $$L`",
+    "`2 ** 10` then `sorted(['b', 'a'])`",
+    "`undefined_name` stays",
+    "$MISSING stays",
+    "costs $5",
+    "$$$L and $$$FRUIT",
+])
+def test_template_matches_regex_passes(nodes, value):
+    parm = nodes[1]._parms["text_string"]
+    parm.set(value)
+
+    assert parm.eval() == parm._expand_and_evaluate(value)
+
+
+def test_unsafe_code_still_raises(nodes):
+    parm = nodes[1]._parms["text_string"]
+    parm.set("`open('x')`")
+
+    with pytest.raises(ValueError):
+        parm.eval()
+
+
+def test_template_is_compiled_once_until_set(nodes):
+    parm = nodes[1]._parms["text_string"]
+    parm.set("$$N is `len('$$N')`")
+
+    with patch.object(ParmTemplate, "compile", wraps=ParmTemplate.compile) as compile_spy:
+        first = [parm.eval() for _ in range(5)]
+        assert compile_spy.call_count == 1
+
+        parm.set("$$1 only")
+        assert parm.eval() == "apple only"
+        assert compile_spy.call_count == 2
+
+    assert first == ["cherry is 6"] * 5
+
+
+def test_substituted_values_that_introduce_expressions_fall_back(nodes):
+    GlobalStore.set("TICK", "`1 + 1`")
+    parm = nodes[1]._parms["text_string"]
+    parm.set("$TICK")
+
+    assert parm.eval() == "2"
+
+
+def test_stringlist_items_are_templated(nodes):
+    query = Node.create_node(NodeType.QUERY, node_name="tmpl_query")
+    response = query._parms["response"]
+    response.set(["$FRUIT", "`3 * 3`", "plain"])
+
+    assert response.eval() == ["kiwi", "9", "plain"]
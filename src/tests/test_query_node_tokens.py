@@ -1,5 +1,7 @@
 import sys
 import os
+import threading
+import time
 import pytest
 from unittest.mock import Mock, patch
 
@@ -201,3 +203,38 @@ def test_query_node_handles_errors_gracefully(text_node, query_node):
         token_manager = get_token_manager()
         totals = token_manager.get_totals()
         assert totals["total_tokens"] == 0
+
+
+def test_query_node_concurrent_dispatch_preserves_order_and_error_slots(text_node, query_node):
+    text_node._parms["text_string"].set('["slow", "fail", "fast", "medium"]')
+    query_node.set_input(0, text_node)
+    query_node._parms["track_tokens"].set(True)
+    query_node._parms["limit"].set(False)
+    query_node._parms["max_concurrency"].set(4)
+
+    delays = {"slow": 0.2, "fail": 0.0, "fast": 0.0, "medium": 0.1}
+    in_flight = []
+    peak = []
+    lock = threading.Lock()
+
+    def fake_llm(prompt, cache_mode=None, backend=None):
+        with lock:
+            in_flight.append(prompt)
+            peak.append(len(in_flight))
+        time.sleep(delays[prompt])
+        with lock:
+            in_flight.remove(prompt)
+        if prompt == "fail":
+            raise Exception("backend down")
+        usage = TokenUsage(input_tokens=1, output_tokens=2, total_tokens=3)
+        return LLMResponse(content=f"re: {prompt}", token_usage=usage)
+
+    with patch('core.query_node.get_clean_llm_response_with_tokens', side_effect=fake_llm):
+        output = query_node.eval()
+
+    assert output == ["re: slow", "", "re: fast", "re: medium"]
+    assert max(peak) > 1
+    assert any("backend down" in error for error in query_node.errors())
+    assert "Total: 9" in query_node._parms["token_usage"].eval()
+    assert get_token_manager().get_totals()["total_tokens"] == 9
+    assert len(get_token_manager().get_history()) == 3
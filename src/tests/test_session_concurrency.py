@@ -0,0 +1,105 @@
+import sys
+import os
+import asyncio
+import threading
+import time
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(parent_dir)
+
+from core.base_classes import Node, NodeType, NodeEnvironment
+from core.workspace import current_workspace
+from tloom_mcp.session_manager import SessionManager
+
+
+def test_sessions_cook_concurrently_in_their_own_workspace():
+    manager = SessionManager(max_workers=2)
+    first, second = manager.create_session(), manager.create_session()
+    both_running = threading.Barrier(2, timeout=5)
+
+    def build(name):
+        Node.create_node(NodeType.TEXT, node_name=name)
+        both_running.wait()  # only passes if the two sessions overlap
+        return list(NodeEnvironment.nodes)
+
+    async def main():
+        return await asyncio.gather(manager.run(first, build, "a"), manager.run(second, build, "b"))
+
+    try:
+        assert asyncio.run(main()) == [["/a"], ["/b"]]
+    finally:
+        manager.shutdown()
+    assert "/a" not in NodeEnvironment.nodes
+    assert manager.session_metrics(first)["completed"] == 1
+
+
+def test_calls_for_one_session_queue_in_order():
+    manager = SessionManager(max_workers=4)
+    session_id = manager.create_session()
+    release = threading.Event()
+    order = []
+    depths = []
+
+    def step(index):
+        if index == 0:
+            release.wait(5)
+        order.append(index)
+        return current_workspace() is manager.get_session(session_id).workspace
+
+    async def main():
+        calls = [asyncio.ensure_future(manager.run(session_id, step, i)) for i in range(3)]
+        await asyncio.sleep(0.05)
+        depths.append(manager.session_metrics(session_id))
+        release.set()
+        return await asyncio.gather(*calls)
+
+    try:
+        assert asyncio.run(main()) == [True, True, True]
+    finally:
+        manager.shutdown()
+    assert order == [0, 1, 2]
+    assert depths[0]["running"] == 1 and depths[0]["queued"] == 2
+    metrics = manager.session_metrics(session_id)
+    assert (metrics["queued"], metrics["running"], metrics["completed"]) == (0, 0, 3)
+
+
+def test_event_loop_stays_free_during_a_cook():
+    manager = SessionManager()
+    session_id = manager.create_session()
+    ticks = []
+
+    async def ticker():
+        for _ in range(5):
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.01)
+
+    async def main():
+        await asyncio.gather(manager.run(session_id, time.sleep, 0.2), ticker())
+
+    try:
+        asyncio.run(main())
+    finally:
+        manager.shutdown()
+    assert len(ticks) == 5 and ticks[-1] - ticks[0] < 0.2
+
+
+def test_failed_calls_are_counted_and_release_the_session():
+    manager = SessionManager()
+    session_id = manager.create_session()
+
+    def fail():
+        raise RuntimeError("boom")
+
+    async def main():
+        try:
+            await manager.run(session_id, fail)
+        except RuntimeError:
+            pass
+        return await manager.run(session_id, lambda: "ok")
+
+    try:
+        assert asyncio.run(main()) == "ok"
+    finally:
+        manager.shutdown()
+    metrics = manager.session_metrics(session_id)
+    assert (metrics["failed"], metrics["completed"]) == (1, 1)
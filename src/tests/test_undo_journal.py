@@ -0,0 +1,119 @@
+import sys
+import os
+import pytest
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(parent_dir)
+
+from core.base_classes import Node, NodeType, NodeEnvironment
+from core.global_store import GlobalStore
+from core.undo_manager import UndoManager, UndoDelta, ParmDelta, MAX_UNDO_BYTES
+
+
+@pytest.fixture
+def undo():
+    NodeEnvironment.flush_all_nodes()
+    GlobalStore.flush_all_globals()
+    manager = UndoManager()
+    manager.flush_all_undos()
+    yield manager
+    manager.set_max_bytes(MAX_UNDO_BYTES)
+    manager.flush_all_undos()
+    NodeEnvironment.flush_all_nodes()
+    GlobalStore.flush_all_globals()
+
+
+def test_parm_edits_are_recorded_as_deltas(undo):
+    text = Node.create_node(NodeType.TEXT, node_name="undo_text")
+    big = [f"line {i}" for i in range(1000)]
+    query = Node.create_node(NodeType.QUERY, node_name="undo_query")
+    query._parms["response"].set(big)
+    stored = query._parms["response"].raw_value()
+    query._parms["response"].set(["short"])
+    text._parms["text_string"].set("hello")
+
+    assert undo.undo_stack[-1].operation.startswith("Set undo_text parm: text_string")
+    delta = undo.undo_stack[-2].deltas[0]
+    assert isinstance(delta, ParmDelta) and delta.old_value is stored
+
+    undo.undo()
+    undo.undo()
+    assert text._parms["text_string"].raw_value() == ""
+    assert query._parms["response"].raw_value() == big
+
+    undo.redo()
+    assert query._parms["response"].raw_value() == ["short"]
+
+
+def test_create_connect_and_delete_round_trip(undo):
+    source = Node.create_node(NodeType.TEXT, node_name="undo_source")
+    target = Node.create_node(NodeType.TEXT, node_name="undo_target")
+    target.set_input(0, source)
+    session_id = source.session_id()
+
+    source.destroy()
+    assert "/undo_source" not in NodeEnvironment.nodes
+    assert not target.inputs()
+
+    assert undo.undo().startswith("Delete node")
+    revived = NodeEnvironment.nodes["/undo_source"]
+    assert revived.session_id() == session_id
+    assert target.input_nodes() == [revived]
+
+    undo.undo()
+    assert not target.inputs()
+    undo.undo()
+    assert "/undo_target" not in NodeEnvironment.nodes
+
+    undo.redo()
+    undo.redo()
+    assert target.input_nodes() == [revived]
+
+
+def test_looper_children_are_restored_with_their_parent(undo):
+    looper = Node.create_node(NodeType.LOOPER, node_name="undo_loop")
+    children = sorted(path for path in NodeEnvironment.nodes if path.startswith("/undo_loop/"))
+    assert children
+
+    NodeEnvironment.remove_node("/undo_loop")
+    while "/undo_loop" not in NodeEnvironment.nodes:
+        undo.undo()
+
+    assert NodeEnvironment.nodes["/undo_loop"] is looper
+    assert sorted(path for path in NodeEnvironment.nodes if path.startswith("/undo_loop/")) == children
+
+
+def test_rename_and_globals_are_reverted(undo):
+    node = Node.create_node(NodeType.TEXT, node_name="undo_old")
+    undo.push_state("Rename")
+    node.rename("undo_new")
+    GlobalStore.set("UNDOKEY", "one")
+    GlobalStore.set("UNDOKEY", "two")
+
+    undo.undo()
+    assert GlobalStore.get("UNDOKEY") == "one"
+    undo.undo()
+    assert not GlobalStore.has("UNDOKEY")
+    undo.undo()
+    assert NodeEnvironment.nodes["/undo_old"] is node
+    assert "/undo_new" not in NodeEnvironment.nodes
+
+
+def test_history_is_bounded_by_bytes(undo):
+    query = Node.create_node(NodeType.QUERY, node_name="undo_bytes")
+    undo.set_max_bytes(200_000)
+    for i in range(50):
+        query._parms["response"].set([f"{i}:" + "x" * 10_000])
+
+    assert undo.memory_usage() <= 200_000
+    assert 1 < len(undo.undo_stack) < 50
+    assert undo.undo_stack[-1].operation.startswith("Set undo_bytes parm: response")
+
+
+def test_delta_missing_redo_fails_when_created():
+    class UndoOnlyDelta(UndoDelta):
+        def undo(self) -> None:
+            pass
+
+    with pytest.raises(TypeError):
+        UndoOnlyDelta()
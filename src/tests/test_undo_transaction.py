@@ -0,0 +1,76 @@
+import sys
+import os
+import pytest
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(parent_dir)
+
+from core.base_classes import Node, NodeType, NodeEnvironment
+from core.global_store import GlobalStore
+from core.flowstate_manager import save_flowstate, load_flowstate
+from core.undo_manager import UndoManager
+from repl.helpers import create
+
+
+@pytest.fixture
+def undo():
+    NodeEnvironment.flush_all_nodes()
+    GlobalStore.flush_all_globals()
+    manager = UndoManager()
+    manager.flush_all_undos()
+    yield manager
+    manager.flush_all_undos()
+    NodeEnvironment.flush_all_nodes()
+    GlobalStore.flush_all_globals()
+
+
+def test_transaction_coalesces_nested_pushes(undo):
+    with undo.transaction("Build chain"):
+        assert undo.in_transaction()
+        source = Node.create_node(NodeType.TEXT, node_name="tx_source")
+        source._parms["text_string"].set("hello")
+        with undo.transaction("Inner"):
+            target = Node.create_node(NodeType.TEXT, node_name="tx_target")
+            target.set_input(0, source)
+
+    assert not undo.in_transaction()
+    assert [entry.operation for entry in undo.undo_stack] == ["Build chain"]
+
+    undo.undo()
+    assert "/tx_source" not in NodeEnvironment.nodes
+    assert "/tx_target" not in NodeEnvironment.nodes
+
+    undo.redo()
+    assert NodeEnvironment.nodes["/tx_target"].input_nodes() == [source]
+    assert source._parms["text_string"].raw_value() == "hello"
+
+
+def test_flowstate_load_is_one_undo_step(undo, tmp_path):
+    for i in range(5):
+        create("text", name=f"tx_saved_{i}", text_string=f"saved {i}")
+    filepath = tmp_path / "tx.json"
+    save_flowstate(str(filepath))
+
+    NodeEnvironment.flush_all_nodes()
+    kept = create("text", name="tx_kept")
+    undo.flush_all_undos()
+
+    assert load_flowstate(str(filepath))
+    assert len(undo.undo_stack) == 1
+    assert undo.undo_stack[-1].operation == "Load flowstate: tx.json"
+    assert "/tx_kept" not in NodeEnvironment.nodes
+    assert NodeEnvironment.nodes["/tx_saved_3"]._parms["text_string"].raw_value() == "saved 3"
+
+    undo.undo()
+    assert NodeEnvironment.nodes["/tx_kept"] is kept
+    assert not any(path.startswith("/tx_saved") for path in NodeEnvironment.nodes)
+
+
+def test_repl_create_with_params_is_one_undo_step(undo):
+    node = create("text", name="tx_repl", text_string="one", pass_through=False)
+
+    assert len(undo.undo_stack) == 1
+    assert node._parms["pass_through"].raw_value() is False
+
+    undo.undo()
+    assert "/tx_repl" not in NodeEnvironment.nodes
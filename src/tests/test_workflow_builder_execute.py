@@ -0,0 +1,111 @@
+import sys
+import os
+import pytest
+from unittest.mock import Mock, patch
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(parent_dir)
+
+from core.base_classes import Node, NodeType, NodeEnvironment
+from core.global_store import GlobalStore
+from core.llm_cache import BYPASS
+from core.undo_manager import UndoManager
+from tloom_mcp.workflow_builder import WorkflowBuilder
+
+
+@pytest.fixture
+def clean():
+    NodeEnvironment.flush_all_nodes()
+    GlobalStore.flush_all_globals()
+    yield
+    NodeEnvironment.flush_all_nodes()
+    GlobalStore.flush_all_globals()
+    UndoManager().flush_all_undos()
+
+
+def test_chain_cooks_each_node_once(clean):
+    previous = Node.create_node(NodeType.TEXT, node_name="chain_0")
+    previous._parms["text_string"].set("seed")
+    for i in range(1, 50):
+        node = Node.create_node(NodeType.STRING_TRANSFORM, node_name=f"chain_{i}")
+        node.set_input(0, previous)
+        previous = node
+
+    builder = WorkflowBuilder()
+    assert builder.sink_nodes() == [previous]
+
+    result = builder.execute_all()
+
+    assert result["success"], result["errors"]
+    assert result["total_cooks"] == 50
+    assert list(result["timings"]) == [f"chain_{i}" for i in range(50)]
+    assert result["results"]["chain_49"]["output"] == ["seed"]
+
+
+def test_shared_upstream_and_looper_internals(clean):
+    text = Node.create_node(NodeType.TEXT, node_name="shared")
+    text._parms["text_string"].set('["a", "b"]')
+    left = Node.create_node(NodeType.STRING_TRANSFORM, node_name="left")
+    right = Node.create_node(NodeType.STRING_TRANSFORM, node_name="right")
+    left.set_input(0, text)
+    right.set_input(0, text)
+    looper = Node.create_node(NodeType.LOOPER, node_name="loop")
+    looper._parms["max"].set(2)
+    inner = Node.create_node(NodeType.STRING_TRANSFORM, node_name="inner", parent_path="/loop")
+    inner.set_input(0, looper._input_node)
+    looper._output_node.set_input(0, inner)
+
+    result = WorkflowBuilder().execute_all()
+
+    assert result["success"], result["errors"]
+    assert set(result["results"]) == {"shared", "left", "right", "loop"}
+    assert "inner" not in result["timings"]
+    assert text.cook_count() == 1
+
+
+def test_sinks_sharing_a_query_cook_it_once(clean):
+    text = Node.create_node(NodeType.TEXT, node_name="prompt")
+    text._parms["text_string"].set("hello")
+    query = Node.create_node(NodeType.QUERY, node_name="ask")
+    query.set_input(0, text)
+    query._parms["limit"].set(False)
+    query._parms["track_tokens"].set(False)
+    query._parms["cache_mode"].set(BYPASS)
+    sinks = []
+    for name in ("a", "b"):
+        sink = Node.create_node(NodeType.STRING_TRANSFORM, node_name=name)
+        sink.set_input(0, query)
+        sinks.append(sink)
+
+    response = Mock(status_code=200, text="answer")
+    response.json.return_value = {"response": "answer"}
+    with patch('requests.Session.post', return_value=response) as post:
+        result = WorkflowBuilder().execute_all()
+
+    assert result["success"], result["errors"]
+    assert post.call_count == 1
+    assert query.cook_count() == 1
+    assert result["total_cooks"] == 4
+    assert [result["results"][name]["output"] for name in ("a", "b")] == [["answer"], ["answer"]]
+
+
+def test_node_with_errors_is_not_a_success(clean):
+    text = Node.create_node(NodeType.TEXT, node_name="ok")
+    text._parms["text_string"].set("fine")
+    sink = Node.create_node(NodeType.STRING_TRANSFORM, node_name="flaky")
+    sink.set_input(0, text)
+
+    original = sink._internal_cook
+
+    def cook_with_error():
+        original()
+        sink.add_error("upstream service returned garbage")
+
+    sink._internal_cook = cook_with_error
+    result = WorkflowBuilder().execute_all()
+
+    assert sink.state().name == "UNCHANGED"
+    assert not result["success"]
+    assert not result["results"]["flaky"]["success"]
+    assert result["results"]["ok"]["success"]
+    assert "upstream service returned garbage" in result["errors"]
@@ -0,0 +1,90 @@
+import sys
+import os
+import pytest
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(parent_dir)
+
+from core.base_classes import Node, NodeType, NodeEnvironment
+from core.global_store import GlobalStore
+from core.token_manager import get_token_manager
+from core.models import TokenUsage
+from core.undo_manager import UndoManager
+from core.workspace import Workspace, use_workspace, current_workspace, DEFAULT_WORKSPACE
+import core.flowstate_manager as flowstate_manager
+from tloom_mcp.session_manager import SessionManager
+
+
+@pytest.fixture
+def clean():
+    NodeEnvironment.flush_all_nodes()
+    GlobalStore.flush_all_globals()
+    UndoManager().flush_all_undos()
+    yield
+    NodeEnvironment.flush_all_nodes()
+    GlobalStore.flush_all_globals()
+    UndoManager().flush_all_undos()
+
+
+def test_workspaces_do_not_share_state(clean):
+    Node.create_node(NodeType.TEXT, node_name="outside")
+    GlobalStore.set("SHARED", "default")
+    other = Workspace("other")
+
+    with use_workspace(other):
+        assert current_workspace() is other
+        assert list(NodeEnvironment.nodes) == []
+        assert not GlobalStore.has("SHARED")
+        Node.create_node(NodeType.TEXT, node_name="inside")
+        GlobalStore.set("SHARED", "other")
+        get_token_manager().add_usage("inside", TokenUsage(10, 5, 15))
+        assert UndoManager() is other.undo_manager
+        assert len(UndoManager().undo_stack) > 0
+
+    assert current_workspace() is DEFAULT_WORKSPACE
+    assert list(NodeEnvironment.nodes) == ["/outside"]
+    assert list(other.nodes) == ["/inside"]
+    assert GlobalStore.get("SHARED") == "default"
+    assert other.globals["SHARED"] == "other"
+    assert get_token_manager() is not other.token_manager
+    assert other.token_manager.get_totals()["total_tokens"] == 15
+
+
+def test_session_switch_does_no_flowstate_io(clean, monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("session switch touched a flowstate file")
+
+    monkeypatch.setattr(flowstate_manager, "_save_flowstate", fail)
+    monkeypatch.setattr(flowstate_manager, "_load_flowstate", fail)
+
+    manager = SessionManager()
+    first, second = manager.create_session(), manager.create_session()
+    with manager.use_session(first):
+        Node.create_node(NodeType.TEXT, node_name="first_text")
+    with manager.use_session(second):
+        assert "/first_text" not in NodeEnvironment.nodes
+        Node.create_node(NodeType.TEXT, node_name="second_text")
+    with manager.use_session(first):
+        assert list(NodeEnvironment.nodes) == ["/first_text"]
+
+    assert list(NodeEnvironment.nodes) == []
+    assert manager.delete_session(second)
+    assert not manager.delete_session(second)
+
+
+def test_export_and_import_round_trip(clean):
+    manager = SessionManager()
+    source, target = manager.create_session(), manager.create_session()
+    with manager.use_session(source):
+        node = Node.create_node(NodeType.TEXT, node_name="exported")
+        node._parms["text_string"].set("hello")
+        GlobalStore.set("EXPORTED", "yes")
+
+    flowstate = manager.export_session(source)
+    assert "/exported" in flowstate["nodes"]
+
+    manager.import_session(target, flowstate)
+    with manager.use_session(target):
+        assert NodeEnvironment.nodes["/exported"]._parms["text_string"].raw_value() == "hello"
+        assert GlobalStore.get("EXPORTED") == "yes"
+    assert list(NodeEnvironment.nodes) == []
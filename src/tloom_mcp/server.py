@@ -208,6 +208,20 @@ async def list_tools() -> List[Tool]:
                 }
             }
         ),
+        Tool(
+            name="get_session_metrics",
+            description="Queue depth and timing counters for a session: calls queued behind the running one, calls running, completed, failed and busy seconds",
+            inputSchema={
+                "type": "object",
+                "required": ["session_id"],
+                "properties": {
+                    "session_id": {
+                        "type": "string",
+                        "description": "Session ID"
+                    }
+                }
+            }
+        ),
         Tool(
             name="delete_session",
             description="Delete a session and clean up resources",
@@ -293,6 +307,8 @@ def _handle_execute_workflow(manager, arguments: Dict) -> List[TextContent]:
         return _json_response({
             "success": results["success"],
             "results": results["results"],
+            "timings": results["timings"],
+            "total_cooks": results["total_cooks"],
             "errors": results.get("errors", [])
         })
 
@@ -329,6 +345,13 @@ def _handle_set_global(manager, arguments: Dict) -> List[TextContent]:
         })
 
 
+def _handle_get_session_metrics(manager, arguments: Dict) -> List[TextContent]:
+    return _success_response({
+        "session_id": arguments["session_id"],
+        "metrics": manager.session_metrics(arguments["session_id"])
+    })
+
+
 def _handle_delete_session(manager, arguments: Dict) -> List[TextContent]:
     success = manager.delete_session(arguments["session_id"])
     return _success_response({
@@ -346,9 +369,14 @@ TOOL_HANDLERS = {
     "get_node_output": _handle_get_node_output,
     "export_workflow": _handle_export_workflow,
     "set_global": _handle_set_global,
+    "get_session_metrics": _handle_get_session_metrics,
     "delete_session": _handle_delete_session
 }
 
+# Handlers that only read session bookkeeping answer immediately instead of
+# queueing behind the session's running work
+IMMEDIATE_TOOLS = {"create_session", "list_node_types", "get_node_details", "get_session_metrics", "delete_session"}
+
 
 @app.call_tool()
 async def call_tool(name: str, arguments: Any) -> List[TextContent]:
@@ -357,21 +385,28 @@ async def call_tool(name: str, arguments: Any) -> List[TextContent]:
 
     try:
         handler = TOOL_HANDLERS.get(name)
-        if handler:
+        if not handler:
+            return _error_response(f"Unknown tool: {name}")
+        if name in IMMEDIATE_TOOLS:
             return handler(manager, arguments)
-        return _error_response(f"Unknown tool: {name}")
+        # Session work cooks on the manager's worker pool, so one session's
+        # long execute_workflow does not hold up the others
+        return await manager.run(arguments["session_id"], handler, manager, arguments)
     except Exception as e:
         return _error_response(str(e), tool=name)
 
 
 async def main():
     """Run the MCP server."""
-    async with stdio_server() as (read_stream, write_stream):
-        await app.run(
-            read_stream,
-            write_stream,
-            app.create_initialization_options()
-        )
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await app.run(
+                read_stream,
+                write_stream,
+                app.create_initialization_options()
+            )
+    finally:
+        get_session_manager().shutdown(wait=False)
 
 
 if __name__ == "__main__":
@@ -2,39 +2,73 @@
 Session Manager for MCP Server
 
 Provides workspace isolation for concurrent LLM operations.
-Each session has its own node environment and global store.
+Each session owns a core.workspace.Workspace holding its node environment,
+global store, token usage and undo history. Entering a session switches the
+current workspace by reference, so nothing is saved or loaded when an agent's
+tool calls move between sessions.
+
+SessionManager.run executes work for a session on a shared thread pool and
+can be awaited from the server's event loop. Work for one session runs one
+call at a time in submission order; different sessions cook side by side.
+Per-session queue depth and timings are available from session_metrics.
 """
 
+import asyncio
+import threading
+import time
 import uuid
 import tempfile
 import json
-from pathlib import Path
-from typing import Dict, Optional, Any, List
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Any, List
 from dataclasses import dataclass, field
 from datetime import datetime
 
-from core.base_classes import NodeEnvironment
-from core.global_store import GlobalStore
+from core.workspace import Workspace, use_workspace
 from core.flowstate_manager import save_flowstate, load_flowstate
 
+DEFAULT_MAX_WORKERS = 4
+
+
+@dataclass
+class SessionMetrics:
+    queued: int = 0
+    running: int = 0
+    completed: int = 0
+    failed: int = 0
+    busy_seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "queued": self.queued,
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed,
+            "busy_seconds": round(self.busy_seconds, 3)
+        }
+
 
 @dataclass
 class Session:
     session_id: str
     created_at: datetime = field(default_factory=datetime.now)
-    workspace_file: Optional[Path] = None
+    workspace: Optional[Workspace] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
+    metrics: SessionMetrics = field(default_factory=SessionMetrics)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
 
     def __post_init__(self):
-        if self.workspace_file is None:
-            temp_dir = Path(tempfile.gettempdir()) / "text_loom_sessions"
-            temp_dir.mkdir(exist_ok=True)
-            self.workspace_file = temp_dir / f"{self.session_id}.json"
+        if self.workspace is None:
+            self.workspace = Workspace(self.session_id)
 
 
 class SessionManager:
-    def __init__(self):
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS):
         self.sessions: Dict[str, Session] = {}
+        self._max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
 
     def create_session(self, metadata: Optional[Dict[str, Any]] = None) -> str:
         session_id = str(uuid.uuid4())
@@ -43,18 +77,8 @@ class SessionManager:
             metadata=metadata or {}
         )
         self.sessions[session_id] = session
-
-        with self.use_session(session_id):
-            NodeEnvironment.nodes.clear()
-            self._clear_globals()
-
         return session_id
 
-    def _clear_globals(self):
-        global_store = GlobalStore()
-        for key in list(global_store.list().keys()):
-            global_store.delete(key)
-
     def use_session(self, session_id: str):
         if session_id not in self.sessions:
             raise ValueError(f"Session {session_id} not found")
@@ -65,37 +89,113 @@ class SessionManager:
         return self.sessions.get(session_id)
 
     def delete_session(self, session_id: str) -> bool:
-        session = self.sessions.pop(session_id, None)
-        if session and session.workspace_file and session.workspace_file.exists():
-            session.workspace_file.unlink()
-            return True
-        return False
+        return self.sessions.pop(session_id, None) is not None
 
     def list_sessions(self) -> List[Dict[str, Any]]:
         return [
             {
                 "session_id": s.session_id,
                 "created_at": s.created_at.isoformat(),
-                "metadata": s.metadata
+                "metadata": s.metadata,
+                "metrics": self.session_metrics(s.session_id)
             }
             for s in self.sessions.values()
         ]
 
-    def export_session(self, session_id: str) -> Dict[str, Any]:
+    def session_metrics(self, session_id: str) -> Dict[str, Any]:
         session = self.sessions.get(session_id)
-        if not session or not session.workspace_file.exists():
-            return {}
+        if not session:
+            raise ValueError(f"Session {session_id} not found")
+        return session.metrics.to_dict()
 
-        with open(session.workspace_file) as f:
-            return json.load(f)
+    async def run(self, session_id: str, func: Callable[..., Any], *args: Any) -> Any:
+        """Runs func(*args) inside the session's workspace on the worker pool.
 
-    def import_session(self, session_id: str, flowstate: Dict[str, Any]) -> None:
+        The event loop stays free while the call waits for its session and
+        while it runs. Calls for the same session wait on the session's lock
+        without holding a worker thread; the queued metric counts them.
+        """
         session = self.sessions.get(session_id)
         if not session:
             raise ValueError(f"Session {session_id} not found")
 
-        with open(session.workspace_file, 'w') as f:
-            json.dump(flowstate, f, indent=2)
+        metrics = session.metrics
+        metrics.queued += 1
+        try:
+            await session.lock.acquire()
+        finally:
+            metrics.queued -= 1
+        metrics.running += 1
+        start = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        try:
+            future = loop.run_in_executor(self._get_executor(), self._run_in_workspace, session, func, args)
+        except BaseException:
+            metrics.running -= 1
+            session.lock.release()
+            raise
+        future.add_done_callback(lambda done: self._finish_run(session, done, start))
+        # A cancelled caller stops waiting, but the session stays locked until the cook returns
+        return await asyncio.shield(future)
+
+    @staticmethod
+    def _finish_run(session: Session, future: asyncio.Future, start: float) -> None:
+        metrics = session.metrics
+        metrics.running -= 1
+        metrics.busy_seconds += time.perf_counter() - start
+        if future.cancelled() or future.exception() is not None:
+            metrics.failed += 1
+        else:
+            metrics.completed += 1
+        session.lock.release()
+
+    @staticmethod
+    def _run_in_workspace(session: Session, func: Callable[..., Any], args: tuple) -> Any:
+        with use_workspace(session.workspace):
+            return func(*args)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers,
+                    thread_name_prefix="tloom-session",
+                )
+            return self._executor
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def export_session(self, session_id: str) -> Dict[str, Any]:
+        if session_id not in self.sessions:
+            return {}
+
+        fd, temp_path = tempfile.mkstemp(prefix="tl_export_", suffix=".json")
+        os.close(fd)
+        try:
+            with self.use_session(session_id):
+                if not save_flowstate(temp_path):
+                    return {}
+            with open(temp_path, encoding='utf-8') as f:
+                return json.load(f)
+        finally:
+            os.unlink(temp_path)
+
+    def import_session(self, session_id: str, flowstate: Dict[str, Any]) -> None:
+        if session_id not in self.sessions:
+            raise ValueError(f"Session {session_id} not found")
+
+        fd, temp_path = tempfile.mkstemp(prefix="tl_import_", suffix=".json")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(flowstate, f)
+            with self.use_session(session_id):
+                load_flowstate(temp_path)
+        finally:
+            os.unlink(temp_path)
 
 
 class SessionContext:
@@ -103,27 +203,16 @@ class SessionContext:
         self.manager = manager
         self.session_id = session_id
         self.session = manager.sessions[session_id]
-        self.saved_state_file = None
+        self._workspace_context = None
 
     def __enter__(self):
-        temp_save = Path(tempfile.gettempdir()) / f"tl_save_{uuid.uuid4()}.json"
-        save_flowstate(str(temp_save))
-        self.saved_state_file = temp_save
-
-        if self.session.workspace_file.exists():
-            load_flowstate(str(self.session.workspace_file))
-        else:
-            NodeEnvironment.nodes.clear()
-            self.manager._clear_globals()
-
+        self._workspace_context = use_workspace(self.session.workspace)
+        self._workspace_context.__enter__()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        save_flowstate(str(self.session.workspace_file))
-
-        if self.saved_state_file and self.saved_state_file.exists():
-            load_flowstate(str(self.saved_state_file))
-            self.saved_state_file.unlink()
+        context, self._workspace_context = self._workspace_context, None
+        return context.__exit__(exc_type, exc_val, exc_tb)
 
 
 _global_session_manager = SessionManager()
@@ -7,6 +7,7 @@ Simplifies node creation and connection for LLM agents.
 
 import importlib
 import inspect
+import os
 from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 from core.base_classes import Node, NodeEnvironment, NodeType
@@ -76,27 +77,56 @@ class WorkflowBuilder:
             "state": node.state().name
         }
 
+    def sink_nodes(self) -> List[Node]:
+        """Top-level nodes whose output feeds nothing; cooking these cooks the whole network."""
+        return [
+            node for path, node in NodeEnvironment.nodes.items()
+            if path != '/' and os.path.dirname(path) == '/' and not node.outputs()
+        ]
+
     def execute_all(self) -> Dict[str, Any]:
-        results = {}
+        """Cooks every sink node in one pass, so each upstream node cooks at most once.
+
+        Nodes inside loopers are left to their looper, which cooks them once
+        per iteration. Results and timings cover every node the sinks depend
+        on, in the order they were cooked. A node succeeded if it cooked
+        cleanly: it is up to date and reported no errors.
+        """
+        from core.base_classes import NodeState
+        from core.cook_scheduler import cook_scheduler
+
         errors = []
+        sinks = self.sink_nodes()
+        order: List[Node] = cook_scheduler.topological_order(*sinks)
+        cook_counts: Dict[str, int] = {}
 
-        for path in NodeEnvironment.list_nodes():
-            if path == '/':
-                continue
-            node = NodeEnvironment.nodes[path]
-            name = node.name()
+        if sinks:
             try:
-                result = self.execute_node(name)
-                results[name] = result
-
-                if not result["success"]:
-                    errors.extend(result["errors"])
+                cook_counts = cook_scheduler.cook(*sinks).cook_counts
             except Exception as e:
-                errors.append(f"Error executing {name}: {str(e)}")
+                errors.append(f"Error executing {', '.join(sink.name() for sink in sinks)}: {str(e)}")
+                cook_counts = cook_scheduler.last_stats().cook_counts
+
+        results = {}
+        timings = {}
+        for node in order:
+            name = node.name()
+            results[name] = {
+                "success": node.state() == NodeState.UNCHANGED and not node.errors(),
+                "output": node.get_output(),
+                "errors": node.errors(),
+                "warnings": node.warnings(),
+                "state": node.state().name
+            }
+            timings[name] = node.last_cook_time() if node.path() in cook_counts else 0.0
+            if not results[name]["success"]:
+                errors.extend(node.errors())
 
         return {
             "success": len(errors) == 0,
             "results": results,
+            "timings": timings,
+            "total_cooks": sum(cook_counts.values()),
             "errors": errors
         }
 